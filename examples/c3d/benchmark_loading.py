@@ -0,0 +1,36 @@
+"""
+Times the loading of Running_0002.c3d by the rrc3d helpers,
+parsing the file once with a shared C3dFile versus parsing it in every helper.
+"""
+
+from timeit import timeit
+
+import ezc3d
+
+from pyorerun import PyoMarkers
+from pyorerun.rrc3d import get_force_plates, get_force_vector, get_lowest_corner
+from pyorerun.utils.c3d_file import C3dFile
+
+C3D_FILE = "Running_0002.c3d"
+NB_REPEATS = 20
+
+
+def load_with_a_shared_c3d_file():
+    c3d = C3dFile(C3D_FILE)
+    markers = PyoMarkers.from_c3d(c3d)
+    get_force_plates(c3d, units=markers.units)
+    get_force_vector(c3d)
+    get_lowest_corner(c3d, units=markers.units)
+
+
+def load_in_every_helper():
+    markers = PyoMarkers.from_c3d(C3D_FILE)
+    for _ in range(4):
+        ezc3d.c3d(C3D_FILE, extract_forceplat_data=True)
+
+
+if __name__ == "__main__":
+    shared = timeit(load_with_a_shared_c3d_file, number=NB_REPEATS) / NB_REPEATS
+    repeated = timeit(load_in_every_helper, number=NB_REPEATS) / NB_REPEATS
+    print(f"Parsed once: {shared * 1000:.1f} ms")
+    print(f"Parsed in every helper: {repeated * 1000:.1f} ms ({repeated / shared:.1f}x)")
@@ -1,63 +1,74 @@
-from .live_animation import LiveModelAnimation
-from .model_components.model_display_options import DisplayModelOptions
-from .model_components.model_updapter import ModelUpdater
+from typing import TYPE_CHECKING
 
-# Opensim
-try:
-    from .model_interfaces import (
-        OsimModel,
-        OsimModelNoMesh,
-    )
-except ImportError:
-    # OpenSim is not installed, these classes will not be available
-    pass
+from .utils.lazy_imports import lazy_attributes
 
-# biobuddy
-try:
-    from .model_interfaces import (
-        BiobuddyModel,
-        BiobuddyModelNoMesh,
-    )
-except ImportError:
-    # BioBuddy is not installed, these classes will not be available
-    pass
+# The public classes and functions are imported on first access, so that `import pyorerun` stays fast for the
+# scripts that only need a part of it, e.g. PyoMarkers, without loading tkinter, trimesh, scipy or the model backends.
+# The optional backends (biorbd, OpenSim, BioBuddy, Pinocchio) are only available once installed.
+_LAZY_ATTRIBUTES = {
+    "LiveModelAnimation": (".live_animation", "LiveModelAnimation"),
+    "LiveStream": (".live_stream", "LiveStream"),
+    "DisplayModelOptions": (".model_components.model_display_options", "DisplayModelOptions"),
+    "ModelUpdater": (".model_components.model_updapter", "ModelUpdater"),
+    # Opensim
+    "OsimModel": (".model_interfaces", "OsimModel"),
+    "OsimModelNoMesh": (".model_interfaces", "OsimModelNoMesh"),
+    # biobuddy
+    "BiobuddyModel": (".model_interfaces", "BiobuddyModel"),
+    "BiobuddyModelNoMesh": (".model_interfaces", "BiobuddyModelNoMesh"),
+    # Pinocchio
+    "PinocchioModel": (".model_interfaces", "PinocchioModel"),
+    "PinocchioModelNoMesh": (".model_interfaces", "PinocchioModelNoMesh"),
+    # Biorbd (model interfaces and biorbd-specific utilities)
+    "BiorbdModel": (".model_interfaces", "BiorbdModel"),
+    "BiorbdModelNoMesh": (".model_interfaces", "BiorbdModelNoMesh"),
+    "LiveModelIntegration": (".live_integration", "LiveModelIntegration"),
+    "animate": (".rrbiomod", "rr_biorbd"),
+    # Abstract classes (always available)
+    "AbstractSegment": (".model_interfaces", "AbstractSegment"),
+    "AbstractModel": (".model_interfaces", "AbstractModel"),
+    "AbstractModelNoMesh": (".model_interfaces", "AbstractModelNoMesh"),
+    "MultiPhaseRerun": (".multi_phase_rerun", "MultiPhaseRerun"),
+    "PhaseRerun": (".phase_rerun", "PhaseRerun"),
+    "PyoMarkers": (".pyomarkers", "PyoMarkers"),
+    "PyoMuscles": (".pyoemg", "PyoMuscles"),
+    "EmgProcessing": (".utils.emg", "EmgProcessing"),
+    "c3d": (".rrc3d", "rrc3d"),
+    "c3d_async": (".rrc3d", "rrc3d_async"),
+    "trc": (".rrtrc", "rrtrc"),
+    "OsimTimeSeries": (".xp_components.timeseries_q", "OsimTimeSeries"),
+    "MotTimeSeries": (".xp_components.timeseries_q", "MotTimeSeries"),
+    "PersistentMarkerOptions": (".xp_components.persistent_marker_options", "PersistentMarkerOptions"),
+}
 
-# Pinocchio
-try:
-    from .model_interfaces import (
-        PinocchioModel,
-        PinocchioModelNoMesh,
-    )
-except ImportError:
-    # Pinocchio is not installed, these classes will not be available
-    pass
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES, globals())
 
-# Biorbd (model interfaces and biorbd-specific utilities)
-try:
+if TYPE_CHECKING:
+    from .live_animation import LiveModelAnimation
+    from .live_integration import LiveModelIntegration
+    from .live_stream import LiveStream
+    from .model_components.model_display_options import DisplayModelOptions
+    from .model_components.model_updapter import ModelUpdater
     from .model_interfaces import (
+        AbstractSegment,
+        AbstractModel,
+        AbstractModelNoMesh,
+        BiobuddyModel,
+        BiobuddyModelNoMesh,
         BiorbdModel,
         BiorbdModelNoMesh,
+        OsimModel,
+        OsimModelNoMesh,
+        PinocchioModel,
+        PinocchioModelNoMesh,
     )
-    from .live_integration import LiveModelIntegration
+    from .multi_phase_rerun import MultiPhaseRerun
+    from .phase_rerun import PhaseRerun
+    from .pyomarkers import PyoMarkers
+    from .pyoemg import PyoMuscles
     from .rrbiomod import rr_biorbd as animate
-except ImportError:
-    # biorbd is not installed, these classes will not be available
-    pass
-
-# Abstract classes (always available)
-from .model_interfaces import (
-    AbstractSegment,
-    AbstractModel,
-    AbstractModelNoMesh,
-)
-from .multi_phase_rerun import MultiPhaseRerun
-
-# from .biorbd_phase import rr_biorbd as rrbiorbd, RerunBiorbdPhase
-from .phase_rerun import PhaseRerun
-from .pyomarkers import PyoMarkers
-from .pyoemg import PyoMuscles
-
-from .rrc3d import rrc3d as c3d
-from .rrtrc import rrtrc as trc
-from .xp_components.timeseries_q import OsimTimeSeries
-from .xp_components.persistent_marker_options import PersistentMarkerOptions
+    from .rrc3d import rrc3d as c3d, rrc3d_async as c3d_async
+    from .rrtrc import rrtrc as trc
+    from .utils.emg import EmgProcessing
+    from .xp_components.timeseries_q import OsimTimeSeries, MotTimeSeries
+    from .xp_components.persistent_marker_options import PersistentMarkerOptions
@@ -23,7 +23,7 @@ class Component(ABC):
         pass
 
     @abstractmethod
-    def to_chunk(self, q: np.ndarray):
+    def to_chunk(self, q: np.ndarray, **kwargs):
         pass
 
 
@@ -37,7 +37,7 @@ class PersistentComponent(ABC):
         pass
 
     @abstractmethod
-    def to_chunk(self, q: np.ndarray):
+    def to_chunk(self, q: np.ndarray, **kwargs):
         pass
 
 
@@ -8,7 +8,7 @@ class EmptyUpdater:
     def to_rerun(self, q: np.ndarray) -> None:
         pass
 
-    def to_chunk(self, q: np.ndarray) -> dict[str, list]:
+    def to_chunk(self, q: np.ndarray, **kwargs) -> dict[str, list]:
         return {"empty": None}
 
     def initialize(self):
@@ -23,7 +23,8 @@ class LineStripProperties:
     radius : float
         the radius of the lines
     color : np.ndarray
-        the color of the lines, in RGB format from 0 to 255, e.g. [0, 0, 255] for blue
+        the color of the lines, in RGB format from 0 to 255, e.g. [0, 0, 255] for blue,
+        or a packed RGBA uint32 for each line at each frame (nb_strips, nb_frames)
     show_labels : bool | list[bool]
         whether to show the labels of the lines (this can be changed by checking the appropriate box in the GUI)
 
@@ -98,16 +99,18 @@ class LineStripProperties:
         Returns
         -------
         np.ndarray
-            A numpy array with the color of each line.
+            A numpy array with the color of each line at each frame, the lines of a frame being consecutive.
         """
         nb_strips = len(self.strip_names)
-        if len(self.color.shape) == 3:
-            colors = [self.color[s, f, :] for f in range(nb_frames) for s in range(nb_strips)]
-        elif len(self.color.shape) == 2:
-            colors = [self.color[s, :, :] for _ in range(nb_frames) for s in range(nb_strips)]
-        else:
-            colors = [self.color for _ in range(nb_frames * nb_strips)]
-        return colors
+        color = np.asarray(self.color)
+        if color.ndim == 2 and color.dtype == np.uint32:
+            # packed RGBA (nb_strips, nb_frames), e.g. the activation colors of the muscles
+            return color[:, :nb_frames].T.ravel()
+        if color.ndim == 3:
+            return color[:, :nb_frames, :].transpose(1, 0, 2).reshape(-1, color.shape[2])
+        if color.ndim == 2:
+            return np.tile(color, (nb_frames, 1))
+        return np.tile(color, (nb_frames * nb_strips, 1))
 
     def show_labels_to_rerun(self) -> list[bool]:
         """
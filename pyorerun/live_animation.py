@@ -5,7 +5,10 @@ import numpy as np
 import rerun as rr
 
 from .model_components.model_updapter import ModelUpdater
+from .abstract.q import QProperties
 from .model_components.model_display_options import DisplayModelOptions
+from .utils.recording import current_recording_id
+from .utils.coalescing_worker import CoalescingWorker
 
 
 class LiveModelAnimation:
@@ -30,9 +33,17 @@ class LiveModelAnimation:
         The functions for updating the model when a slider is moved.
     with_q_charts : bool
         Whether to plot q values when the joint angles are updated.
+    renderer : CoalescingWorker
+        The background thread rendering the latest q of the sliders, its latencies measure the event-to-logged time.
     """
 
-    def __init__(self, model_updater: ModelUpdater, with_q_charts: bool = False):
+    def __init__(
+        self,
+        model_updater: ModelUpdater,
+        with_q_charts: bool = False,
+        max_rate: float = 60.0,
+        latency_callback: callable = None,
+    ):
         """
         Parameters
         ----------
@@ -40,6 +51,10 @@ class LiveModelAnimation:
             An instance of ModelUpdater to handle model updates.
         with_q_charts
             If True, q values will be plotted when the joint angles are updated.
+        max_rate : float
+            The maximal number of updates per second sent to rerun, the slider events in between being coalesced.
+        latency_callback : callable
+            Called with the delay in seconds between a slider event and the end of its logging.
         """
 
         self.counter = 0
@@ -56,46 +71,75 @@ class LiveModelAnimation:
         self.update_functions = []
         self.with_q_charts = with_q_charts
         self.options = DisplayModelOptions()
+        self.renderer = CoalescingWorker(self._render, max_rate=max_rate, latency_callback=latency_callback)
+        self._q_properties = None
+        self._charts_recording_id = None
 
     @classmethod
-    def from_model(cls, model, with_q_charts: bool = False):
+    def from_model(cls, model, with_q_charts: bool = False, **kwargs):
         model_updater = ModelUpdater("live_model", model)
-        return cls(model_updater, with_q_charts)
+        return cls(model_updater, with_q_charts, **kwargs)
 
     @classmethod
-    def from_file(cls, model_path: str, with_q_charts: bool = False):
-        return cls(ModelUpdater.from_file(model_path), with_q_charts)
+    def from_file(cls, model_path: str, with_q_charts: bool = False, **kwargs):
+        return cls(ModelUpdater.from_file(model_path), with_q_charts, **kwargs)
 
     def update_viewer(self, event, dof_index: int):
+        """Called by the sliders on the Tk thread, which only hands the new q to the renderer."""
         the_dof_idx, the_value = self.fetch_and_update_slider_value(event, dof_index)
-        self.update_rerun_components(the_dof_idx, the_value)
-
-    def update_rerun_components(self, the_dof_idx: int, the_value: float):
         self.q[the_dof_idx] = the_value
-        # update counter
+        if self.renderer.is_running:
+            self.renderer.submit(self.q.copy(), changed=[the_dof_idx])
+        else:
+            self.update_rerun_components(the_dof_idx, the_value)
+
+    def _render(self, q: np.ndarray, changed_dofs: set[int] | None):
+        """Logs the latest q on the thread of the renderer."""
         self.counter += 1
         rr.set_time(timeline="step", sequence=self.counter)
-        # Update the model
-        self.update_model(self.q)
-        # Update the q trajectories
+        changed_dofs = None if changed_dofs is None else sorted(changed_dofs)
+        self.update_model(q, changed_dofs=changed_dofs)
         if self.with_q_charts:
-            self.update_trajectories(self.q)
+            self.update_trajectories(q, changed_dofs=changed_dofs)
+
+    def update_rerun_components(self, the_dof_idx: int, the_value: float):
+        self.q[the_dof_idx] = the_value
+        # Update the model, only the components moved by this dof, and the q trajectories
+        self._render(self.q, changed_dofs={the_dof_idx})
 
-    def update_model(self, q: np.ndarray):
-        self.model_updater.to_rerun(q)
+    def update_model(self, q: np.ndarray, changed_dofs: list[int] = None):
+        self.model_updater.to_rerun(q, changed_dofs=changed_dofs)
 
-    def update_trajectories(self, q: np.ndarray):
-        q_ranges = self.model.q_ranges
-        dof_names = self.model.dof_names
-        for joint_idx in range(self.model.nb_q):
-            name = f"q{joint_idx} - {dof_names[joint_idx]}"
-            rr.log(f"{name}/min", rr.SeriesLines(colors=[255, 0, 0], names="min", widths=0.5))
-            rr.log(f"{name}/max", rr.SeriesLines(colors=[255, 0, 0], names="max", widths=0.5))
-            rr.log(f"{name}/value", rr.SeriesLines(colors=[0, 255, 0], names="q", widths=0.5))
+    def update_trajectories(self, q: np.ndarray, changed_dofs: list[int] = None):
+        """
+        Logs the q charts, the static styles of the series once per recording, and then only the dofs changed.
 
+        Parameters
+        ----------
+        q : np.ndarray
+            The current joint angles.
+        changed_dofs : list[int]
+            The dofs changed since the previous update, None if all of them.
+        """
+        recording_id = current_recording_id()
+        if recording_id is None or recording_id != self._charts_recording_id:
+            self.q_properties.set_time_series(base_name=self.model.name)
+            self._charts_recording_id = recording_id
+            changed_dofs = None
+
+        q_ranges = self.model.q_ranges
+        for joint_idx in range(self.model.nb_q) if changed_dofs is None else changed_dofs:
+            name = self.q_properties.displayed_joint_names[joint_idx]
             q_range = q_ranges[joint_idx]
+            # the ranges are logged with the values, so that both lines extend to the last change
             self.to_serie_line(name=name, min=q_range[0], max=q_range[-1], val=q[joint_idx])
 
+    @property
+    def q_properties(self) -> QProperties:
+        if self._q_properties is None:
+            self._q_properties = QProperties(joint_names=self.model.dof_names, ranges=self.model.q_ranges)
+        return self._q_properties
+
     def to_serie_line(self, name: str, min: float, max: float, val: float):
         rr.log(f"{name}/min", rr.Scalars(min))
         rr.log(f"{name}/max", rr.Scalars(max))
@@ -105,7 +149,11 @@ class LiveModelAnimation:
         # update manually here
         rr.init(application_id=f"{self.model.name}" if name is None else name, spawn=True)
         self.update_rerun_components(the_dof_idx=0, the_value=0.0)
-        self.create_window_with_sliders()
+        self.renderer.start()
+        try:
+            self.create_window_with_sliders()
+        finally:
+            self.renderer.stop()
 
     def create_window_with_sliders(self):
         self.root = tk.Tk()
@@ -221,11 +269,10 @@ class LiveModelAnimation:
             self._update_value_label(i)
             s.configure(command=self.update_functions[i])
 
-        self.counter += 1
-        rr.set_time(timeline="step", sequence=self.counter)
-        self.update_model(self.q)
-        if self.with_q_charts:
-            self.update_trajectories(self.q)
+        if self.renderer.is_running:
+            self.renderer.submit(self.q.copy())
+        else:
+            self._render(self.q, changed_dofs=None)
 
     def fetch_and_update_slider_value(self, event, dof_index: int) -> tuple[int, float]:
         the_dof_idx = dof_index
@@ -1,18 +1,31 @@
 import biorbd
 import numpy as np
 import rerun as rr
-import time
 
 from .model_components.model_updapter import ModelUpdater
+from .phase_rerun import PhaseRerun
 from .timeless.floor import Floor
+from .utils.integrators import INTEGRATORS, Integrator
+from .utils.real_time_scheduler import RealTimeScheduler, SchedulerStats
 
 
 class LiveModelIntegration:
     """
     A class to animate a biorbd model in rerun by integrating the dynamics over time.
+    The integration runs in its own thread, paced on the simulated time, and the states are displayed at a fixed
+    display rate, so that the cost of rendering neither slows the simulation down nor makes it drift.
+    In offline mode, the whole horizon is integrated first and the trajectory is then sent at once as columns.
     """
 
-    def __init__(self, model_path: str, dt: float = 0.01, total_time: float = 5.0):
+    def __init__(
+        self,
+        model_path: str,
+        dt: float = 0.01,
+        total_time: float = 5.0,
+        real_time_factor: float | None = 1.0,
+        display_rate: float = 30.0,
+        integrator: str = "euler",
+    ):
         """
         Parameters
         ----------
@@ -22,7 +35,17 @@ class LiveModelIntegration:
             Time step for integration.
         total_time : float
             Total simulation time.
+        real_time_factor : float | None
+            The simulated time per second of wall-clock time, e.g. 0.5 for slow motion or 2 for fast forward,
+            None to integrate as fast as possible.
+        display_rate : float
+            The maximal number of states displayed per second, the other ones being skipped.
+        integrator : str
+            "euler", "semi_implicit_euler", "rk4" or "rk45" (adaptive sub-steps within each dt).
+            The higher order ones allow a larger dt, so fewer frames, for the same accuracy.
         """
+        if integrator not in INTEGRATORS:
+            raise ValueError(f"integrator={integrator} is not supported. Please use one of {INTEGRATORS}.")
         self.model_updater = ModelUpdater.from_file(model_path)
         self.model = self.model_updater.model
         self.biorbd_model = self.model.model
@@ -45,32 +68,97 @@ class LiveModelIntegration:
         # External forces (if any)
         self.tau = np.zeros(self.nb_q)  # Control torques (assuming zero for passive motion)
 
-    def simulate(self, q: np.ndarray, qdot: np.ndarray, tau: np.ndarray, force_set: biorbd.ExternalForceSet):
-        """
-        Simulate the model dynamics over time using RK1 integration.
-        """
-        rr.init(application_id=f"{self.model.name}_simulation", spawn=True)
-        Floor(name="floor", square_width=6, height_offset=0, subsquares=35).to_rerun()
+        self.real_time_factor = real_time_factor
+        self.display_rate = display_rate
+        self.integrator = integrator
+        self.stats = SchedulerStats()
+        self._integrator = None
+        self._nb_rendered = 0
+
+    def forward_dynamics(self, force_set: biorbd.ExternalForceSet) -> callable:
+        """The generalized accelerations from the generalized coordinates and velocities, under tau and force_set."""
+
+        def dynamics(q: np.ndarray, qdot: np.ndarray) -> np.ndarray:
+            return self.biorbd_model.ForwardDynamics(q, qdot, self.tau, force_set).to_array()
+
+        return dynamics
 
+    def _set_initial_state(self, q: np.ndarray, qdot: np.ndarray, tau: np.ndarray, force_set) -> None:
         self.q[:, 0] = q
         self.qdot[:, 0] = qdot
         self.tau = tau
+        self._integrator = Integrator(self.forward_dynamics(force_set), self.nb_q, method=self.integrator)
 
-        for i in range(0, len(self.time_vector) - 1):
-            # Compute joint accelerations
-            self.qddot[:, i] = self.biorbd_model.ForwardDynamics(
-                self.q[:, i], self.qdot[:, i], self.tau, force_set
-            ).to_array()
+    def simulate(
+        self, q: np.ndarray, qdot: np.ndarray, tau: np.ndarray, force_set: biorbd.ExternalForceSet
+    ) -> SchedulerStats:
+        """
+        Simulate the model dynamics over time with the integrator, while displaying it.
 
-            # Integrate using RK1 (Explicit Euler)
-            self.qdot[:, i + 1] = self.qdot[:, i] + self.qddot[:, i] * self.dt
-            self.q[:, i + 1] = self.q[:, i] + self.qdot[:, i] * self.dt
+        Returns
+        -------
+        SchedulerStats
+            The achieved simulation rate, display rate and real-time factor, also kept in stats.
+        """
+        rr.init(application_id=f"{self.model.name}_simulation", spawn=True)
+        Floor(name="floor", square_width=6, height_offset=0, subsquares=35).to_rerun()
 
-            # Update the model visualization
-            self.update_model(self.q[:, i + 1])
+        self._set_initial_state(q, qdot, tau, force_set)
+        self._nb_rendered = 0
+
+        steps = iter(range(0, len(self.time_vector) - 1))
+
+        def step() -> tuple[float, np.ndarray] | None:
+            i = next(steps, None)
+            if i is None:
+                return None
+            self.integrate_step(i)
+            return self.time_vector[i + 1], self.q[:, i + 1]
+
+        scheduler = RealTimeScheduler(
+            step,
+            self.render,
+            real_time_factor=self.real_time_factor,
+            display_rate=self.display_rate,
+            start_time=self.time_vector[0],
+        )
+        self.stats = scheduler.run()
+        return self.stats
+
+    def integrate_step(self, i: int) -> None:
+        """Integrates the state of the frame i into the frame i + 1, directly in the preallocated trajectories."""
+        self.qddot[:, i] = self._integrator.step(
+            self.q[:, i], self.qdot[:, i], self.dt, self.q[:, i + 1], self.qdot[:, i + 1]
+        )
+
+    def simulate_offline(
+        self, q: np.ndarray, qdot: np.ndarray, tau: np.ndarray, force_set: biorbd.ExternalForceSet
+    ) -> PhaseRerun:
+        """
+        Integrate the whole horizon first, then send the trajectory at once with the columns of PhaseRerun.rerun,
+        instead of logging each frame.
 
-            # Optional: Sleep to control the simulation speed (adjust as needed)
-            time.sleep(self.dt)
+        Returns
+        -------
+        PhaseRerun
+            The phase displaying the trajectory.
+        """
+        self._set_initial_state(q, qdot, tau, force_set)
+        self.q, self.qdot, self.qddot = self._integrator.integrate(q, qdot, self.time_vector)
+
+        phase_rerun = PhaseRerun(self.time_vector)
+        phase_rerun.add_animated_model(self.model, self.q)
+        phase_rerun.add_floor(square_width=6, height_offset=0, subsquares=35)
+        phase_rerun.rerun(f"{self.model.name}_simulation")
+        return phase_rerun
+
+    def render(self, t: float, q: np.ndarray) -> None:
+        """Displays a simulated state at its simulated time."""
+        rr.set_time("stable_time", duration=t)
+        self.update_model(q)
+        # the trails of the persistent markers only compute the markers of the rendered state
+        self.model_updater.to_rerun_persistent(q[:, np.newaxis], self._nb_rendered)
+        self._nb_rendered += 1
 
     def update_model(self, q: np.ndarray):
         """
@@ -83,9 +171,10 @@ class LiveModelIntegration:
         """
         self.model_updater.to_rerun(q)
 
-    def run(self, q=None, qdot=None, tau=None, force_set: biorbd.ExternalForceSet = None):
+    def run(self, q=None, qdot=None, tau=None, force_set: biorbd.ExternalForceSet = None, offline: bool = False):
         """
-        Run the simulation.
+        Run the simulation, and return the achieved rates as SchedulerStats,
+        or the PhaseRerun of the trajectory in offline mode.
         """
         if q is None:
             q = np.zeros(self.nb_q)
@@ -95,7 +184,9 @@ class LiveModelIntegration:
             tau = np.zeros(self.nb_q)
         if force_set is None:
             force_set = self.model.model.externalForceSet()
-        self.simulate(q, qdot, tau, force_set)
+        if offline:
+            return self.simulate_offline(q, qdot, tau, force_set)
+        return self.simulate(q, qdot, tau, force_set)
 
 
 # Usage example
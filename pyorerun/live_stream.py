@@ -0,0 +1,265 @@
+import queue
+import socket
+import threading
+import time
+from typing import BinaryIO
+
+import numpy as np
+import rerun as rr
+
+from .model_components.model_updapter import ModelUpdater
+from .utils.keyframes import send_chunks
+from .utils.ring_buffer import FrameRingBuffer
+
+
+def encode_frame(q: np.ndarray, t: float) -> bytes:
+    """
+    The binary frame read by LiveStream from a pipe or a socket: t and q as little-endian float64.
+
+    Parameters
+    ----------
+    q : np.ndarray
+        The generalized coordinates (nb_q,).
+    t : float
+        The time of the frame, in seconds.
+    """
+    return np.concatenate(([t], np.asarray(q, dtype=float).ravel())).astype("<f8").tobytes()
+
+
+class LiveStream:
+    """
+    Displays the q of a model streamed by another process, e.g. a running inverse kinematics at 100-500 Hz.
+    The frames are written in a preallocated ring buffer, by push or by reader threads of a queue, a pipe or a socket.
+    A render thread drains the buffer at the viewer rate and sends all the frames of a batch at once as columns,
+    at their own time on the "stable_time" timeline.
+
+    Attributes
+    ----------
+    model_updater : ModelUpdater
+        The model displayed.
+    buffer : FrameRingBuffer
+        The frames waiting to be displayed.
+    nb_received : int
+        The number of frames received.
+    nb_logged : int
+        The number of frames sent to rerun.
+    """
+
+    def __init__(
+        self,
+        model_updater: ModelUpdater,
+        viewer_rate: float = 30.0,
+        capacity: int = 1024,
+        policy: str = "drop_oldest",
+        latest_only: bool = False,
+    ):
+        """
+        Parameters
+        ----------
+        model_updater : ModelUpdater
+            The model to display.
+        viewer_rate : float
+            The number of batches sent per second.
+        capacity : int
+            The maximal number of frames waiting in the ring buffer, at least the rate of the producer / viewer_rate
+            for every frame to be displayed.
+        policy : str
+            When the producer outpaces the display and the buffer is full: "drop_oldest", "drop_newest",
+            or "block" to block the producer (backpressure), e.g. up to the process writing into a pipe.
+        latest_only : bool
+            If True, only the last frame of each batch is sent, the other ones being skipped.
+        """
+        if viewer_rate <= 0:
+            raise ValueError(f"The viewer rate must be positive, got {viewer_rate}.")
+        self.model_updater = model_updater
+        self.nb_q = model_updater.model.nb_q
+        self.viewer_period = 1 / viewer_rate
+        self.latest_only = latest_only
+        self.buffer = FrameRingBuffer(capacity, self.nb_q, policy=policy)
+        self.nb_received = 0
+        self.nb_logged = 0
+        # the frame number of the persistent markers, whose trails span the batches
+        self._nb_trail_frames = 0
+
+        self._start_time = time.perf_counter()
+        self._stopped = threading.Event()
+        self._render_thread = None
+        self._readers = []
+
+    @classmethod
+    def from_model(cls, model, **kwargs) -> "LiveStream":
+        return cls(ModelUpdater("live_stream", model), **kwargs)
+
+    @classmethod
+    def from_file(cls, model_path: str, **kwargs) -> "LiveStream":
+        return cls(ModelUpdater.from_file(model_path), **kwargs)
+
+    @property
+    def nb_dropped(self) -> int:
+        return self.buffer.nb_dropped
+
+    def push(self, q: np.ndarray, t: float = None) -> bool:
+        """
+        Adds a frame, from any thread.
+
+        Parameters
+        ----------
+        q : np.ndarray
+            The generalized coordinates (nb_q,).
+        t : float
+            The time of the frame in seconds, the time since the creation of the stream if None.
+
+        Returns
+        -------
+        bool
+            False if the frame was dropped.
+        """
+        if q.shape[0] != self.nb_q:
+            raise ValueError(f"The frame has {q.shape[0]} values, but the model has {self.nb_q} dofs.")
+        self.nb_received += 1
+        return self.buffer.push(time.perf_counter() - self._start_time if t is None else t, q)
+
+    def start(self) -> None:
+        """Logs the model and starts the render thread."""
+        if self._render_thread is not None:
+            raise RuntimeError("The stream is already started, stop it before starting it again.")
+        self.model_updater.initialize()
+        self._stopped.clear()
+        self.buffer.open()
+        self._render_thread = threading.Thread(target=self._render, name="pyorerun-live-stream", daemon=True)
+        self._render_thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stops reading the sources, sends the frames left in the buffer and stops the render thread."""
+        self._stopped.set()
+        self.buffer.close()
+        for reader in self._readers:
+            reader.join(timeout)
+        if self._render_thread is not None:
+            self._render_thread.join(timeout)
+            self._render_thread = None
+        self.send(*self.buffer.drain())
+
+    def join(self, timeout: float = None) -> None:
+        """Waits for the sources to end, e.g. the producer closing its pipe, and then stops."""
+        for reader in self._readers:
+            reader.join(timeout)
+        self.stop()
+
+    def send(self, times: np.ndarray, q: np.ndarray) -> None:
+        """
+        Sends a batch of frames (n, nb_q) as columns.
+        The trails of the persistent markers go on from the previous batches, and are logged at the last frame.
+        """
+        if times.shape[0] == 0:
+            return
+        if self.latest_only:
+            times, q = times[-1:], q[-1:]
+        send_chunks(self.model_updater.to_chunk(q.T, persistent=False), times)
+
+        for q_frame in q[:-1]:
+            self.model_updater.update_persistent(q_frame[:, np.newaxis], self._nb_trail_frames)
+            self._nb_trail_frames += 1
+        rr.set_time("stable_time", duration=times[-1])
+        self.model_updater.to_rerun_persistent(q[-1][:, np.newaxis], self._nb_trail_frames)
+        self._nb_trail_frames += 1
+        self.nb_logged += times.shape[0]
+
+    def _render(self) -> None:
+        next_batch = time.perf_counter()
+        while not self._stopped.is_set():
+            self._stopped.wait(max(0.0, next_batch - time.perf_counter()))
+            next_batch = max(next_batch + self.viewer_period, time.perf_counter())
+            if self._stopped.is_set():
+                break
+            self.send(*self.buffer.drain())
+
+    def _start_reader(self, target, *args) -> threading.Thread:
+        reader = threading.Thread(target=target, args=args, name="pyorerun-live-stream-reader", daemon=True)
+        self._readers.append(reader)
+        reader.start()
+        return reader
+
+    def read_queue(self, frames: queue.Queue) -> threading.Thread:
+        """
+        Reads the frames of a python queue in a thread, until a None item.
+
+        Parameters
+        ----------
+        frames : queue.Queue
+            The items are q, or tuples (t, q).
+        """
+
+        def read():
+            while not self._stopped.is_set():
+                try:
+                    item = frames.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is None:
+                    return
+                if isinstance(item, tuple):
+                    self.push(np.asarray(item[1], dtype=float), t=item[0])
+                else:
+                    self.push(np.asarray(item, dtype=float))
+
+        return self._start_reader(read)
+
+    def read_binary(self, stream: BinaryIO) -> threading.Thread:
+        """
+        Reads the frames of encode_frame from a binary stream in a thread, until its end.
+
+        Parameters
+        ----------
+        stream : BinaryIO
+            e.g. the stdout pipe of a subprocess.Popen, or a file opened on a named pipe.
+        """
+        return self._start_reader(self._read_binary, stream)
+
+    def _read_binary(self, stream: BinaryIO) -> None:
+        frame_bytes = (self.nb_q + 1) * 8
+        with stream:
+            while not self._stopped.is_set():
+                data = stream.read(frame_bytes)
+                if len(data) < frame_bytes:
+                    return
+                frame = np.frombuffer(data, dtype="<f8")
+                self.push(frame[1:], t=float(frame[0]))
+
+    def serve(self, port: int = 0, host: str = "127.0.0.1") -> int:
+        """
+        Listens on a local TCP socket, and reads the frames of encode_frame sent by the first client.
+
+        Parameters
+        ----------
+        port : int
+            The port to listen on, any free one if 0.
+        host : str
+            The interface to listen on, only the local one by default.
+
+        Returns
+        -------
+        int
+            The port to connect to.
+        """
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind((host, port))
+        server.listen(1)
+        server.settimeout(0.1)
+
+        def accept_and_read():
+            with server:
+                while not self._stopped.is_set():
+                    try:
+                        connection, _ = server.accept()
+                        break
+                    except socket.timeout:
+                        continue
+                else:
+                    return
+            with connection:
+                connection.settimeout(None)
+                self._read_binary(connection.makefile("rb"))
+
+        self._start_reader(accept_and_read)
+        return server.getsockname()[1]
@@ -47,7 +47,7 @@ class AxisUpdater(Component):
             colors=np.array(self.color),
         )
 
-    def to_chunk(self, q: np.ndarray) -> dict[str, list]:
+    def to_chunk(self, q: np.ndarray, **kwargs) -> dict[str, list]:
         homogenous_matrices = self.transform_callable(q)
 
         return {
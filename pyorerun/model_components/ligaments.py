@@ -9,6 +9,8 @@ class LineStripUpdater(LineStrips):
         self.name = name
         self.properties = properties
         self.update_callable = update_callable
+        # the strips last logged, for the updates of a subset of them
+        self._strips = None
 
     @property
     def nb_strips(self) -> int:
@@ -18,21 +20,34 @@ class LineStripUpdater(LineStrips):
     def nb_components(self) -> int:
         return 1
 
-    def to_rerun(self, q: np.ndarray) -> None:
+    def to_rerun(self, q: np.ndarray, indices: np.ndarray = None) -> None:
         rr.log(
             self.name,
-            self.to_component(q),
+            self.to_component(q, indices),
         )
 
-    def to_component(self, q: np.ndarray) -> rr.LineStrips3D:
+    def to_component(self, q: np.ndarray, indices: np.ndarray = None) -> rr.LineStrips3D:
+        self._strips = self.update_strips(q, indices)
         return rr.LineStrips3D(
-            strips=self.update_callable(q),
+            strips=self._strips,
             radii=self.properties.radius_to_rerun(),
             colors=self.properties.color_to_rerun(1),
             labels=self.properties.strip_names,
             show_labels=self.properties.show_labels_to_rerun(),
         )
 
+    def update_strips(self, q: np.ndarray, indices: np.ndarray = None) -> list[list[list[float]]]:
+        """
+        The strips, only the ones of indices being evaluated, e.g. update_callable(q, indices),
+        the other ones keeping the points last logged. All the strips are evaluated if indices is None.
+        """
+        if indices is None or self._strips is None:
+            return self.update_callable(q)
+        strips = list(self._strips)
+        for index, strip in zip(indices, self.update_callable(q, indices=indices) if len(indices) > 0 else []):
+            strips[index] = strip
+        return strips
+
     def compute_strips(self, q: np.ndarray) -> list[list[list[list[float]]]]:
         """
         Returns
@@ -43,15 +58,15 @@ class LineStripUpdater(LineStrips):
         nb_frames = q.shape[1]
         return [self.update_callable(q[:, f]) for f in range(nb_frames)]
 
-    def to_chunk(self, q: np.ndarray) -> dict[str, list]:
+    def to_chunk(self, q: np.ndarray, **kwargs) -> dict[str, list]:
         nb_frames = q.shape[1]
 
         strips_by_frame = self.compute_strips(q)
 
         colors = self.properties.color_to_rerun(nb_frames)
-        radii = [self.properties.radius for _ in range(nb_frames * self.nb_strips)]
-        labels = [self.properties.strip_names[s] for _ in range(nb_frames) for s in range(self.nb_strips)]
-        partition = [self.nb_strips for _ in range(nb_frames)]
+        radii = np.tile(self.properties.radius_to_rerun(), nb_frames)
+        labels = list(self.properties.strip_names) * nb_frames
+        partition = np.full(nb_frames, self.nb_strips)
 
         return {
             self.name: [
@@ -60,7 +75,7 @@ class LineStripUpdater(LineStrips):
                     colors=colors,
                     radii=radii,
                     labels=labels,
-                    show_labels=[False for _ in range(nb_frames * self.nb_strips)],
+                    show_labels=np.zeros(nb_frames * self.nb_strips, dtype=bool),
                 ).partition(partition)
             ]
         }
@@ -140,15 +155,20 @@ class ModelMarkerLinkUpdater(LineStripUpdater):
                     colors=colors,
                     radii=radii,
                     labels=labels,
-                    show_labels=[False for _ in range(nb_frames * self.nb_strips)],
+                    show_labels=np.zeros(nb_frames * self.nb_strips, dtype=bool),
                 ).partition(partition)
             ]
         }
 
 
 class LineStripUpdaterFromGlobalTransform(LineStripUpdater):
-    def __init__(self, name, properties: LineStripProperties, strips: np.ndarray, transform_callable: callable):
-        super(LineStripUpdaterFromGlobalTransform, self).__init__(name, properties, update_callable=transform_callable)
+    """
+    Line strips expressed in a segment frame, e.g. biorbd meshlines.
+    They are logged as a child of the segment entity, so they follow its global transform without their own one.
+    """
+
+    def __init__(self, name, properties: LineStripProperties, strips: np.ndarray):
+        super(LineStripUpdaterFromGlobalTransform, self).__init__(name, properties, update_callable=None)
         self.rerun_mesh = rr.LineStrips3D(
             strips=strips,
             radii=self.properties.radius_to_rerun(),
@@ -162,37 +182,9 @@ class LineStripUpdaterFromGlobalTransform(LineStripUpdater):
         )
 
     def to_rerun(self, q: np.ndarray) -> None:
-        homogenous_matrices = self.update_callable(q)
-        rr.log(
-            self.name,
-            rr.Transform3D(
-                translation=homogenous_matrices[:3, 3],
-                mat3x3=homogenous_matrices[:3, :3],
-            ),
-            rr.TransformAxes3D(1),
-        )
-        rr.log(
-            self.name,
-            self.rerun_mesh,
-        )
-
-    def compute_all_transforms(self, q: np.ndarray) -> np.ndarray:
-        nb_frames = q.shape[1]
-        homogenous_matrices = np.zeros((4, 4, nb_frames))
-        for f in range(nb_frames):
-            homogenous_matrices[:, :, f] = self.update_callable(q[:, f])
+        """The strips follow the transform of their parent segment entity, they are only logged in initialize."""
+        pass
 
-        return homogenous_matrices
-
-    def to_chunk(self, q: np.ndarray) -> dict[str, list]:
-        homogenous_matrices = self.compute_all_transforms(q)
-
-        return {
-            self.name: [
-                *rr.Transform3D.columns(
-                    translation=homogenous_matrices[:3, 3, :].T.tolist(),
-                    mat3x3=[homogenous_matrices[:3, :3, f] for f in range(homogenous_matrices.shape[2])],
-                    scale=[[1] * 3] * homogenous_matrices.shape[2],
-                )
-            ]
-        }
+    def to_chunk(self, q: np.ndarray, **kwargs) -> dict[str, list]:
+        """No time-varying column, the strips follow the transform of their parent segment entity."""
+        return {}
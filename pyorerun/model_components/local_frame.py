@@ -2,10 +2,17 @@ import numpy as np
 import rerun as rr
 
 from ..abstract.abstract_class import Component
+from ..utils.keyframes import KeyframeColumns, KeyframeTolerances, transform_keyframes
+from ..utils.transforms import rotation_matrices_to_quaternions
 
 
 class LocalFrameUpdater(Component):
-    def __init__(self, name, transform_callable: callable):
+    """
+    The time-varying transform of a segment entity, displayed with its axes.
+    The children entities of the segment, such as its meshes, follow this transform in rerun.
+    """
+
+    def __init__(self, name, transform_callable: callable, compact: bool = False):
         """
 
         ----------
@@ -13,10 +20,14 @@ class LocalFrameUpdater(Component):
             The name of the axis
         transform_callable : callable
             The function to transform the axis
+        compact : bool
+            If True, the transforms are sent as translation + unit quaternion in float32 (7 floats per frame),
+            instead of translation + 3x3 matrix (12 floats per frame).
         """
         self.name = name
         self.transform_callable = transform_callable
         self.scale = 0.1
+        self.compact = compact
 
     @property
     def nb_components(self):
@@ -29,7 +40,7 @@ class LocalFrameUpdater(Component):
                 translation=np.zeros(3),
                 mat3x3=np.eye(3),
             ),
-            rr.TransformAxes3D(1),
+            rr.TransformAxes3D(self.scale),
         )
 
     def to_rerun(self, q: np.ndarray) -> None:
@@ -41,6 +52,13 @@ class LocalFrameUpdater(Component):
 
     def to_component(self, q: np.ndarray) -> rr.Transform3D:
         homogenous_matrices = self.transform_callable(q)
+        if self.compact:
+            return rr.Transform3D(
+                translation=homogenous_matrices[:3, 3].astype(np.float32),
+                quaternion=rotation_matrices_to_quaternions(homogenous_matrices[np.newaxis, :3, :3])[0].astype(
+                    np.float32
+                ),
+            )
         return rr.Transform3D(
             translation=homogenous_matrices[:3, 3],
             mat3x3=homogenous_matrices[:3, :3],
@@ -54,15 +72,23 @@ class LocalFrameUpdater(Component):
 
         return homogenous_matrices
 
-    def to_chunk(self, q: np.ndarray) -> dict[str, list]:
+    def to_chunk(self, q: np.ndarray, tolerances: KeyframeTolerances = None, **kwargs) -> dict[str, KeyframeColumns]:
         homogenous_matrices = self.compute_all_transforms(q)
+        # a static segment, e.g. a fixed pelvis or a locked dof, is only sent once
+        frames = transform_keyframes(homogenous_matrices, tolerances)
+        homogenous_matrices = homogenous_matrices[:, :, frames]
+
+        if self.compact:
+            columns = rr.Transform3D.columns(
+                translation=homogenous_matrices[:3, 3, :].T.astype(np.float32),
+                quaternion=rotation_matrices_to_quaternions(homogenous_matrices[:3, :3, :].transpose(2, 0, 1)).astype(
+                    np.float32
+                ),
+            )
+        else:
+            columns = rr.Transform3D.columns(
+                translation=homogenous_matrices[:3, 3, :].T,
+                mat3x3=homogenous_matrices[:3, :3, :].transpose(2, 0, 1),
+            )
 
-        return {
-            self.name: [
-                *rr.Transform3D.columns(
-                    translation=homogenous_matrices[:3, 3, :].T.tolist(),
-                    mat3x3=[homogenous_matrices[:3, :3, f] for f in range(homogenous_matrices.shape[2])],
-                    scale=[[self.scale] * 3] * homogenous_matrices.shape[2],
-                )
-            ]
-        }
+        return {self.name: KeyframeColumns(frames=frames, columns=[*columns])}
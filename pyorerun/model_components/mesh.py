@@ -1,21 +1,28 @@
 import os
+from typing import TYPE_CHECKING
+
 import numpy as np
 import rerun as rr
-from trimesh import Trimesh, load
 
 from ..abstract.abstract_class import Component
 from ..utils.vtp_parser import read_vtp_file
 
+if TYPE_CHECKING:
+    from trimesh import Trimesh
+
 LOCAL_FRAME_SCALE = 0.1
 
 
 class TransformableMeshUpdater(Component):
     """
     A class to handle a trimesh object and its transformations
-    and always 'apply_transform' from its initial position
+    and always 'apply_transform' from its initial position.
+
+    The mesh is logged as a child of its segment entity, so that it follows the time-varying transform of the segment.
+    Only its constant offset in the segment frame, mesh_rt, is logged, once and as static.
     """
 
-    def __init__(self, name: str, mesh: Trimesh, transform_callable: callable):
+    def __init__(self, name: str, mesh: "Trimesh", mesh_rt: np.ndarray = None):
         filename = (
             mesh.metadata["file_name"] if "file_name" in mesh.metadata else mesh.metadata["header"].replace(" ", "")
         )
@@ -25,7 +32,7 @@ class TransformableMeshUpdater(Component):
         self.transformed_mesh = mesh.copy()
         self.__color = np.array([0, 0, 0])
         self.__transparency = False
-        self.transform_callable = transform_callable
+        self.mesh_rt = mesh_rt if mesh_rt is not None else np.eye(4)
         self.__rerun_mesh = None
 
     def set_transparency(self, transparency: bool) -> None:
@@ -61,13 +68,16 @@ class TransformableMeshUpdater(Component):
 
     @classmethod
     def from_file(
-        cls, name, file_path: str, transform_callable, scale_factor: list[float] = (1, 1, 1)
+        cls, name, file_path: str, mesh_rt: np.ndarray = None, scale_factor: list[float] = (1, 1, 1)
     ) -> "TransformableMeshUpdater":
+        # trimesh, and scipy with it, are imported with the first mesh instead of with pyorerun
+        from trimesh import Trimesh, load
+
         if file_path.endswith(".stl") or file_path.endswith(".STL"):
             mesh = load(file_path, file_type="stl")
             mesh.apply_scale(scale_factor)
             mesh.metadata["file_name"] = file_path
-            return cls(name, mesh, transform_callable)
+            return cls(name, mesh, mesh_rt)
         elif file_path.endswith(".vtp"):
             output = read_vtp_file(file_path)
             # Triangulation is now handled in read_vtp_file, so polygons are always triangles
@@ -78,7 +88,7 @@ class TransformableMeshUpdater(Component):
                 metadata={"file_name": file_path.split("/")[-1].split(".")[0]},
             )
             mesh.apply_scale(scale_factor)
-            return cls(name, mesh, transform_callable)
+            return cls(name, mesh, mesh_rt)
         elif file_path.lower().endswith((".dae", ".obj", ".ply", ".off", ".gltf", ".glb")):
             # Use trimesh's universal loader for other supported formats
             mesh = load(file_path)
@@ -100,13 +110,13 @@ class TransformableMeshUpdater(Component):
                 if "file_name" not in real_mesh.metadata:
                     real_mesh.metadata["file_name"] = file_path.split("/")[-1].split(".")[0]
 
-            return cls(name, real_mesh, transform_callable)
+            return cls(name, real_mesh, mesh_rt)
         else:
             raise ValueError(
                 f"The file {file_path} is not a valid mesh file. Supported formats: .stl, .vtp, .dae, .obj, .ply, .off, .gltf, .glb"
             )
 
-    def apply_transform(self, homogenous_matrix: np.ndarray) -> Trimesh:
+    def apply_transform(self, homogenous_matrix: np.ndarray) -> "Trimesh":
         """Apply a transform to the mesh from its initial position"""
         self.transformed_mesh = self.__mesh.copy()
         self.transformed_mesh.apply_transform(homogenous_matrix)
@@ -133,20 +143,18 @@ class TransformableMeshUpdater(Component):
             self.name,
             self.rerun_mesh,
         )
-
-    def to_rerun(self, q: np.ndarray) -> None:
-        homogenous_matrices = self.transform_callable(q)
         rr.log(
             self.name,
-            rr.Transform3D(
-                translation=homogenous_matrices[:3, 3],
-                mat3x3=homogenous_matrices[:3, :3],
-            ),
+            self.to_component(),
+            static=True,
         )
 
-    def to_component(self, q: np.ndarray) -> rr.Transform3D:
-        homogenous_matrices = self.transform_callable(q)
-        return self.to_component_from_homogenous_mat(homogenous_matrices)
+    def to_rerun(self, q: np.ndarray) -> None:
+        """The mesh follows the transform of its parent segment entity, there is nothing to update."""
+        pass
+
+    def to_component(self, q: np.ndarray = None) -> rr.Transform3D:
+        return self.to_component_from_homogenous_mat(self.mesh_rt)
 
     @staticmethod
     def to_component_from_homogenous_mat(mat: np.ndarray) -> rr.Transform3D:
@@ -159,23 +167,6 @@ class TransformableMeshUpdater(Component):
     def component_names(self):
         return [self.name]
 
-    def compute_all_transforms(self, q: np.ndarray) -> np.ndarray:
-        nb_frames = q.shape[1]
-        homogenous_matrices = np.zeros((4, 4, nb_frames))
-        for f in range(nb_frames):
-            homogenous_matrices[:, :, f] = self.transform_callable(q[:, f])
-
-        return homogenous_matrices
-
-    def to_chunk(self, q: np.ndarray) -> dict[str, list]:
-        homogenous_matrices = self.compute_all_transforms(q)
-
-        return {
-            self.name: [
-                *rr.Transform3D.columns(
-                    translation=homogenous_matrices[:3, 3, :].T.tolist(),
-                    mat3x3=[homogenous_matrices[:3, :3, f] for f in range(homogenous_matrices.shape[2])],
-                    # axis_length=[LOCAL_FRAME_SCALE] * homogenous_matrices.shape[2],
-                ),
-            ]
-        }
+    def to_chunk(self, q: np.ndarray, **kwargs) -> dict[str, list]:
+        """No time-varying column, the constant offset is logged as static in initialize."""
+        return {}
@@ -38,6 +38,9 @@ class DisplayModelOptions:
 
     _persistent_markers: PersistentMarkerOptions = None
 
+    # Send the segment transforms as translation + unit quaternion in float32 instead of a full 3x3 matrix
+    _compact_transforms: bool = False
+
     @property
     def markers_color(self) -> tuple[int, int, int]:
         return self._markers_color
@@ -238,6 +241,16 @@ class DisplayModelOptions:
             raise ValueError("persistent_markers must be a PersistentMarkerOptions object.")
         self._persistent_markers = value
 
+    @property
+    def compact_transforms(self) -> bool:
+        return self._compact_transforms
+
+    @compact_transforms.setter
+    def compact_transforms(self, value: bool):
+        if not isinstance(value, bool):
+            raise ValueError("compact_transforms must be a boolean.")
+        self._compact_transforms = value
+
     def set_all_labels(self, value: bool):
         if not isinstance(value, bool):
             raise ValueError("Value must be a boolean.")
@@ -3,6 +3,7 @@ import rerun as rr
 
 from ..abstract.abstract_class import Component, PersistentComponent
 from ..abstract.markers import MarkerProperties
+from ..utils.keyframes import KeyframeColumns, KeyframeTolerances, marker_keyframes
 from ..xp_components.persistent_marker_options import PersistentMarkerOptions
 
 
@@ -11,6 +12,8 @@ class MarkersUpdater(Component):
         self.name = name + "/model_markers"
         self.marker_properties = marker_properties
         self.callable_markers = callable_markers
+        # the markers last logged, for the updates of a subset of them
+        self._markers = None
 
     @property
     def nb_markers(self) -> int:
@@ -20,42 +23,60 @@ class MarkersUpdater(Component):
     def nb_components(self) -> int:
         return 1
 
-    def to_rerun(self, q: np.ndarray) -> None:
+    def to_rerun(self, q: np.ndarray, indices: np.ndarray = None) -> None:
         rr.log(
             self.name,
-            self.to_component(q),
+            self.to_component(q, indices),
         )
 
-    def to_component(self, q: np.ndarray) -> rr.Points3D:
+    def to_component(self, q: np.ndarray, indices: np.ndarray = None) -> rr.Points3D:
+        self._markers = self.update_markers(q, indices)
         return rr.Points3D(
-            positions=self.callable_markers(q),
+            positions=self._markers,
             radii=self.marker_properties.radius_to_rerun(),
             colors=self.marker_properties.color_to_rerun(),
             labels=self.marker_properties.marker_names,
             show_labels=self.marker_properties.show_labels_to_rerun(),
         )
 
+    def update_markers(self, q: np.ndarray, indices: np.ndarray = None) -> np.ndarray:
+        """
+        The positions of the markers, only the ones of indices being evaluated, e.g. callable_markers(q, indices),
+        the other ones keeping the positions last logged. All the markers are evaluated if indices is None.
+        """
+        if indices is None or self._markers is None:
+            return self.callable_markers(q)
+        markers = self._markers.copy()
+        if len(indices) > 0:
+            markers[indices] = self.callable_markers(q, indices=indices)
+        return markers
+
     def compute_markers(self, q: np.ndarray) -> np.ndarray:
         return compute_markers(q, self.nb_markers, self.callable_markers)
 
-    def to_chunk(self, q) -> dict[str, list]:
-        nb_frames = q.shape[1]
-        markers = self.compute_markers(q).transpose(2, 1, 0).reshape(-1, 3)
+    def to_chunk(self, q, tolerances: KeyframeTolerances = None, **kwargs) -> dict[str, KeyframeColumns]:
+        markers = self.compute_markers(q)
+        frames = marker_keyframes(markers, tolerances)
+        nb_frames = frames.shape[0]
+        markers = markers[:, :, frames].transpose(2, 1, 0).reshape(-1, 3)
         marker_names = [name for _ in range(nb_frames) for name in self.marker_properties.marker_names]
         partition = [self.nb_markers for _ in range(nb_frames)]
 
         return {
-            self.name: [
-                *rr.Points3D.columns(
-                    positions=markers,
-                    labels=marker_names,
-                ).partition(partition),
-                *rr.Points3D.columns(
-                    colors=[self.marker_properties.color for _ in range(nb_frames)],
-                    radii=[self.marker_properties.radius for _ in range(nb_frames)],
-                    show_labels=[self.marker_properties.show_labels for _ in range(nb_frames)],
-                ),
-            ]
+            self.name: KeyframeColumns(
+                frames=frames,
+                columns=[
+                    *rr.Points3D.columns(
+                        positions=markers,
+                        labels=marker_names,
+                    ).partition(partition),
+                    *rr.Points3D.columns(
+                        colors=[self.marker_properties.color for _ in range(nb_frames)],
+                        radii=[self.marker_properties.radius for _ in range(nb_frames)],
+                        show_labels=[self.marker_properties.show_labels for _ in range(nb_frames)],
+                    ),
+                ],
+            )
         }
 
 
@@ -70,6 +91,13 @@ class PersistentMarkersUpdater(PersistentComponent):
         self.callable_markers = callable_markers
         self.persistent_options = persistent_options
 
+        # the markers of the last displayed frames, so that a new frame only computes its own markers,
+        # growing when all the previous frames are displayed
+        self._trail = np.zeros((self.nb_frames or 64, self.nb_markers, 3))
+        self._trail_start = 0
+        self._trail_size = 0
+        self._last_frame = None
+
     @property
     def nb_components(self) -> int:
         return 1
@@ -89,6 +117,66 @@ class PersistentMarkersUpdater(PersistentComponent):
     def compute_markers(self, q: np.ndarray) -> np.ndarray:
         return compute_markers(q, self.nb_markers, self.callable_markers)
 
+    def reset_trail(self) -> None:
+        """Forgets the markers of the displayed frames, e.g. when the displayed frames are not consecutive."""
+        self._trail_start = 0
+        self._trail_size = 0
+        self._last_frame = None
+
+    def append_to_trail(self, q: np.ndarray) -> None:
+        """
+        Computes the markers of a single frame and writes them in place of the oldest ones of the trail.
+
+        Parameters
+        ----------
+        q: np.ndarray
+            The generalized coordinates of the frame (nb_q,)
+        """
+        capacity = self._trail.shape[0]
+        if self._trail_size == capacity and self.nb_frames is None:
+            self._trail = np.concatenate((self._trail_in_order(), np.zeros_like(self._trail)))
+            self._trail_start = 0
+            capacity *= 2
+
+        index = (self._trail_start + self._trail_size) % capacity
+        self._trail[index] = self.compute_markers(q[:, np.newaxis])[:, :, 0].T
+        if self._trail_size < capacity:
+            self._trail_size += 1
+        else:
+            self._trail_start = (self._trail_start + 1) % capacity
+
+    def update_trail(self, q: np.ndarray, frame: int) -> None:
+        """
+        Updates the trail to end at the given frame, only computing the markers of the new frame
+        when it follows the last displayed one, and the markers of the whole window otherwise.
+
+        Parameters
+        ----------
+        q: np.ndarray
+            The generalized coordinates of the frames up to the current one (nb_q x N_frames)
+        frame: int
+            The current frame number, the last column of q.
+        """
+        if frame == self._last_frame:
+            return
+        if self._last_frame is not None and frame == self._last_frame + 1:
+            self.append_to_trail(q[:, -1])
+        else:
+            self.reset_trail()
+            nb_frames_to_keep = len(self.persistent_options.frames_to_keep(frame))
+            for q_frame in q[:, -nb_frames_to_keep:].T:
+                self.append_to_trail(q_frame)
+        self._last_frame = frame
+
+    def _trail_in_order(self) -> np.ndarray:
+        indices = (self._trail_start + np.arange(self._trail_size)) % self._trail.shape[0]
+        return self._trail[indices]
+
+    @property
+    def trail(self) -> np.ndarray:
+        """The markers of the trail from the oldest frame to the newest one (N_frames * N_markers x 3)"""
+        return self._trail_in_order().reshape(-1, 3)
+
     def to_rerun(self, q: np.ndarray, frame: int) -> None:
         rr.log(
             self.name,
@@ -96,19 +184,17 @@ class PersistentMarkersUpdater(PersistentComponent):
         )
 
     def to_component(self, q: np.ndarray, frame: int) -> rr.Points3D:
-        frames_to_keep = self.persistent_options.frames_to_keep(frame)
-        markers = self.compute_markers(q)
-        markers = markers.transpose(2, 1, 0).reshape(-1, 3)
+        self.update_trail(q, frame)
 
         return rr.Points3D(
-            positions=markers,
+            positions=self.trail,
             radii=self.persistent_options.radius_to_rerun(),
             colors=self.persistent_options.color_to_rerun(),
-            labels=self.persistent_options.marker_names * len(frames_to_keep),
+            labels=self.persistent_options.marker_names * self._trail_size,
             show_labels=self.persistent_options.show_labels_to_rerun(),
         )
 
-    def to_chunk(self, q: np.ndarray) -> dict[str, list]:
+    def to_chunk(self, q: np.ndarray, **kwargs) -> dict[str, list]:
         """
         Parameters
         ----------
@@ -1,18 +1,27 @@
 from functools import partial
-from typing import Any
+from typing import Any, Sequence
 
 import numpy as np
 
 from .mesh import TransformableMeshUpdater
 from .model_display_options import DisplayModelOptions
+from .local_frame import LocalFrameUpdater
 from .model_markers import MarkersUpdater, PersistentMarkersUpdater
 from .segment import SegmentUpdater
 from ..abstract.abstract_class import Components
 from ..abstract.empty_updater import EmptyUpdater
 from ..abstract.linestrip import LineStripProperties
 from ..abstract.markers import MarkerProperties
-from ..model_components.ligaments import LigamentsUpdater, MusclesUpdater, LineStripUpdaterFromGlobalTransform
+from ..model_components.ligaments import (
+    LigamentsUpdater,
+    LineStripUpdater,
+    MusclesUpdater,
+    LineStripUpdaterFromGlobalTransform,
+)
 from ..model_interfaces import AbstractModel, model_from_file
+from ..utils.dof_dependencies import dof_dependencies
+from ..utils.keyframes import KeyframeTolerances
+from ..utils.recording import current_recording_id
 
 
 class ModelUpdater(Components):
@@ -37,6 +46,12 @@ class ModelUpdater(Components):
         # Persistent components
         self.persistent_markers = self.create_persistent_markers_updater()
 
+        # The dofs moving each component, from the kinematic tree of the model, for the first partial update
+        self._dof_dependencies = None
+        self._item_dependencies = None
+        self._segment_dofs = {}
+        self._updated_recording_id = None
+
     @classmethod
     def from_file(cls, model_path: str, options: DisplayModelOptions = None):
         """
@@ -159,12 +174,12 @@ class ModelUpdater(Components):
             if segment.has_mesh:
                 meshes = []
                 for m_idx, m in enumerate(segment.mesh_path):
-                    mesh_transform_callable = partial(
-                        self.model.mesh_homogenous_matrices_in_global, segment_index=segment.id, mesh_index=m_idx
-                    )
                     meshes.append(
                         TransformableMeshUpdater.from_file(
-                            segment_name, m, mesh_transform_callable, segment.mesh_scale_factor[m_idx]
+                            segment_name,
+                            m,
+                            self.model.mesh_homogenous_matrices_in_segment(segment_index=segment.id, mesh_index=m_idx),
+                            segment.mesh_scale_factor[m_idx],
                         )
                     )
                     meshes[-1].set_transparency(self.model.options.transparent_mesh)
@@ -180,13 +195,19 @@ class ModelUpdater(Components):
                             radius=0.001,
                         ),
                         strips=self.model.meshlines[i],
-                        transform_callable=transform_callable,
                     )
                 ]
             else:
                 meshes = [EmptyUpdater(segment_name + "/mesh")]
 
-            segments.append(SegmentUpdater(name=segment_name, transform_callable=transform_callable, meshes=meshes))
+            segments.append(
+                SegmentUpdater(
+                    name=segment_name,
+                    transform_callable=transform_callable,
+                    meshes=meshes,
+                    compact_transforms=self.model.options.compact_transforms,
+                )
+            )
         return segments
 
     def create_muscles_updater(self, muscle_colors: np.ndarray = None):
@@ -246,7 +267,7 @@ class ModelUpdater(Components):
     def component_names(self) -> list[str]:
         return [component.name for component in self.components]
 
-    def to_rerun(self, q: np.ndarray) -> None:
+    def to_rerun(self, q: np.ndarray, changed_dofs: list[int] = None) -> None:
         """
         This function logs the components to rerun.
 
@@ -254,12 +275,106 @@ class ModelUpdater(Components):
         ----------
         q: np.ndarray
             The generalized coordinates of the model one-dimensional array, i.e., q.shape = (n_q,).
+        changed_dofs: list[int]
+            The dofs changed since the previous call, e.g. the dof of a slider.
+            If given, only the components moved by these dofs are recomputed and logged,
+            e.g. the segments downstream of a wrist dof and the markers of the hand, only these markers being
+            evaluated when the model places them on its segments. All the components are logged if None.
+
+        Notes
+        -----
+        The meshes are only logged by the first call in a recording, the next calls only send the transforms of the
+        segments and the time-varying components, e.g. markers and muscles.
+        The first call in a recording logs all the components, whatever changed_dofs.
         """
         for segment in self.segments:
-            [mesh.initialize() for mesh in segment.meshes]
+            segment.log_meshes()
+
+        recording_id = current_recording_id()
+        if changed_dofs is None or recording_id is None or recording_id != self._updated_recording_id:
+            self._updated_recording_id = recording_id
+            for component in self.components:
+                component.to_rerun(q)
+            return
+
+        for component in self.components_moved_by(changed_dofs):
+            item_dependencies = self.item_dependencies.get(id(component))
+            if item_dependencies is None:
+                component.to_rerun(q)
+            else:
+                component.to_rerun(q, indices=np.flatnonzero(item_dependencies[:, list(changed_dofs)].any(axis=1)))
 
-        for component in self.components:
-            component.to_rerun(q)
+    @property
+    def dof_dependencies(self) -> list[np.ndarray | None]:
+        """
+        The dofs (nb_q,) moving each component, in the order of components,
+        None for the components that never change, e.g. meshes following their segment.
+        A segment only moves with the dofs of its kinematic chain, and the markers and muscle or ligament paths with
+        the ones of their segments, when the model tells them, the other components, e.g. the centers of mass,
+        moving with every dof.
+        """
+        if self._dof_dependencies is None:
+            moving = [component for component in self.components if component_function(component) is not None]
+            dependencies = iter(
+                dof_dependencies([self._component_dofs(component) for component in moving], self.model.nb_q)
+            )
+            self._dof_dependencies = [
+                None if component_function(component) is None else next(dependencies) for component in self.components
+            ]
+        return self._dof_dependencies
+
+    @property
+    def item_dependencies(self) -> dict[int, np.ndarray]:
+        """
+        The dofs (nb_items, nb_q) moving each marker, muscle or ligament of a component, by id of the component,
+        only for the components whose items the model places on its segments, e.g. to update the markers of a hand
+        without evaluating the other ones.
+        """
+        if self._item_dependencies is None:
+            self._item_dependencies = {}
+            for component, item_segments in (
+                (self.markers, lambda: [(segment,) for segment in self.model.marker_segments]),
+                (self.muscles, lambda: self.model.muscle_segments),
+                (self.ligaments, lambda: self.model.ligament_segments),
+            ):
+                if isinstance(component, EmptyUpdater):
+                    continue
+                try:
+                    item_dofs = [self._dofs_of_segments(segments) for segments in item_segments()]
+                except NotImplementedError:
+                    continue
+                self._item_dependencies[id(component)] = dof_dependencies(item_dofs, self.model.nb_q)
+        return self._item_dependencies
+
+    def _component_dofs(self, component: Any) -> tuple[int, ...] | None:
+        """The dofs moving a time-varying component, None if the model does not tell them."""
+        if id(component) in self.item_dependencies:
+            return tuple(np.flatnonzero(self.item_dependencies[id(component)].any(axis=0)))
+        for segment, updater in zip(self.model.segments, self.segments):
+            if component is updater.local_frame:
+                try:
+                    return self._dofs_of_segments((segment.id,))
+                except NotImplementedError:
+                    return None
+        return None
+
+    def _dofs_of_segments(self, segment_indices: Sequence[int]) -> tuple[int, ...]:
+        """The dofs moving any of the segments, as segment_index, e.g. the ones of the via points of a muscle."""
+        dofs = set()
+        for segment_index in segment_indices:
+            if segment_index not in self._segment_dofs:
+                self._segment_dofs[segment_index] = self.model.segment_dofs(segment_index)
+            dofs.update(self._segment_dofs[segment_index])
+        return tuple(sorted(dofs))
+
+    def components_moved_by(self, dofs: list[int]) -> list[Any]:
+        """The components to update when some dofs change, e.g. only the subtree of the segment of a dof."""
+        dofs = list(dofs)
+        return [
+            component
+            for component, moved_by in zip(self.components, self.dof_dependencies)
+            if moved_by is not None and moved_by[dofs].any()
+        ]
 
     def to_rerun_persistent(self, q: np.ndarray, frame: int) -> None:
         """
@@ -268,15 +383,33 @@ class ModelUpdater(Components):
         Parameters
         ----------
         q: np.ndarray
-            The generalized coordinates of the model two-dimensional array, i.e., q.shape = (n_q, N_frames).
+            The generalized coordinates of the model two-dimensional array, i.e., q.shape = (n_q, N_frames),
+            up to the current frame. Only its last column is evaluated when the previous frame was the last one logged.
+        frame: int
+            The current frame number.
+        """
+        for persistent_component in self.persistent_components:
+            if isinstance(persistent_component, EmptyUpdater):
+                continue
+            persistent_component.to_rerun(q, frame)
+
+    def update_persistent(self, q: np.ndarray, frame: int) -> None:
+        """
+        Updates the trails of the persistent components up to a frame, without logging them,
+        e.g. for the frames of a batch before the last one, which is logged by to_rerun_persistent.
+
+        Parameters
+        ----------
+        q: np.ndarray
+            The generalized coordinates of the model two-dimensional array, i.e., q.shape = (n_q, N_frames),
+            up to the current frame.
         frame: int
             The current frame number.
         """
         for persistent_component in self.persistent_components:
             if isinstance(persistent_component, EmptyUpdater):
                 continue
-            nb_frames = persistent_component.persistent_options.nb_frames
-            persistent_component.to_rerun(q[:, -nb_frames:], frame)
+            persistent_component.update_trail(q, frame)
 
     def to_component(self, q: np.ndarray) -> list:
         components = []
@@ -290,14 +423,40 @@ class ModelUpdater(Components):
         for segment in self.segments:
             segment.initialize()
 
-    def to_chunk(self, q: np.ndarray) -> dict[str, list]:
+    def to_chunk(
+        self, q: np.ndarray, tolerances: KeyframeTolerances = None, persistent: bool = True
+    ) -> dict[str, list]:
+        """
+        The columns of all the components over the frames of q.
+
+        Parameters
+        ----------
+        q: np.ndarray
+            The generalized coordinates of the model two-dimensional array, i.e., q.shape = (n_q, N_frames).
+        tolerances: KeyframeTolerances
+            If given, the transforms and markers are decimated to the keyframes needed to stay within tolerance.
+        persistent: bool
+            Whether to include the persistent components, whose trails start at the first frame of q,
+            e.g. False for the batches of a stream, whose trails span several batches.
+        """
         output = {}
         for component in self.components:
-            output.update(component.to_chunk(q))
+            output.update(component.to_chunk(q, tolerances=tolerances))
 
-        for persistent_component in self.persistent_components:
+        for persistent_component in self.persistent_components if persistent else []:
             output.update(persistent_component.to_chunk(q))
 
         # remove all empty components, this is the "empty" field
-        output.pop("empty")
+        output.pop("empty", None)
         return output
+
+
+def component_function(component: Any) -> callable:
+    """The function of q computing what a component logs, None if it logs nothing time-varying."""
+    if isinstance(component, LocalFrameUpdater):
+        return component.transform_callable
+    if isinstance(component, MarkersUpdater):
+        return component.callable_markers
+    if isinstance(component, LineStripUpdater) and not isinstance(component, LineStripUpdaterFromGlobalTransform):
+        return component.update_callable
+    return None
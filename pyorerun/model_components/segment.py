@@ -3,14 +3,29 @@ import numpy as np
 from pyorerun.abstract.abstract_class import Component
 from .local_frame import LocalFrameUpdater
 from .mesh import TransformableMeshUpdater
+from ..utils.recording import current_recording_id
 
 
 class SegmentUpdater(Component):
-    def __init__(self, name, transform_callable: callable, meshes: list[TransformableMeshUpdater]):
+    """
+    A segment entity holds the only time-varying transform of the segment, through its local frame.
+    Its meshes are children entities, with a constant offset, so they don't need their own transform column.
+    When updated frame by frame, the meshes are logged once for each recording and then only the transform is sent,
+    so that an update does not depend on the size of the meshes.
+    """
+
+    def __init__(
+        self,
+        name,
+        transform_callable: callable,
+        meshes: list[TransformableMeshUpdater],
+        compact_transforms: bool = False,
+    ):
         self.name = name
         self.transform_callable = transform_callable
         self.meshes = meshes
-        self.local_frame = LocalFrameUpdater(name + "/frame", transform_callable)
+        self.local_frame = LocalFrameUpdater(name, transform_callable, compact=compact_transforms)
+        self._meshes_recording_id = None
 
     @property
     def nb_components(self):
@@ -23,9 +38,18 @@ class SegmentUpdater(Component):
         return [*self.meshes, self.local_frame]
 
     def to_rerun(self, q: np.ndarray) -> None:
+        self.log_meshes()
         for component in self.components:
             component.to_rerun(q)
 
+    def log_meshes(self) -> None:
+        """Logs the meshes, unless they are already logged in the current recording, identified by its recording id."""
+        recording_id = current_recording_id()
+        if recording_id is not None and recording_id == self._meshes_recording_id:
+            return
+        [mesh.initialize() for mesh in self.meshes]
+        self._meshes_recording_id = recording_id
+
     @property
     def component_names(self) -> list[str]:
         return [component.name for component in self.components]
@@ -33,6 +57,10 @@ class SegmentUpdater(Component):
     def initialize(self):
         self.local_frame.initialize()
         [mesh.initialize() for mesh in self.meshes]
+        self._meshes_recording_id = current_recording_id()
 
-    def to_chunk(self, q: np.ndarray) -> dict[str, list]:
-        return {component.name: component.to_chunk(q) for component in self.components}
+    def to_chunk(self, q: np.ndarray, **kwargs) -> dict[str, list]:
+        output = {}
+        for component in self.components:
+            output.update(component.to_chunk(q, **kwargs))
+        return output
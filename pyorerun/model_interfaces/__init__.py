@@ -1,32 +1,31 @@
-from .abstract_model_interface import AbstractSegment, AbstractModel, AbstractModelNoMesh
+from typing import TYPE_CHECKING
 
-# Biorbd
-try:
-    from .biorbd_model_interface import BiorbdModelNoMesh, BiorbdModel
-except ImportError:
-    # biorbd is not installed, these classes will not be available
-    pass
+from .abstract_model_interface import AbstractSegment, AbstractModel, AbstractModelNoMesh
+from ..utils.lazy_imports import lazy_attributes
 
+# The backends are imported on first access, e.g. OpenSim takes seconds to import,
+# and are not available if not installed.
+_LAZY_ATTRIBUTES = {
+    # Biorbd
+    "BiorbdModel": (".biorbd_model_interface", "BiorbdModel"),
+    "BiorbdModelNoMesh": (".biorbd_model_interface", "BiorbdModelNoMesh"),
+    # Opensim
+    "OsimModel": (".osim_model_interface", "OsimModel"),
+    "OsimModelNoMesh": (".osim_model_interface", "OsimModelNoMesh"),
+    # Biobuddy
+    "BiobuddyModel": (".biobuddy_model_interface", "BiobuddyModel"),
+    "BiobuddyModelNoMesh": (".biobuddy_model_interface", "BiobuddyModelNoMesh"),
+    # Pinocchio
+    "PinocchioModel": (".pinocchio_model_interface", "PinocchioModel"),
+    "PinocchioModelNoMesh": (".pinocchio_model_interface", "PinocchioModelNoMesh"),
+    "model_from_file": (".available_interfaces", "model_from_file"),
+}
 
-# Opensim
-try:
-    from .osim_model_interface import OsimModelNoMesh, OsimModel
-except ImportError:
-    # OpenSim is not installed, these classes will not be available
-    pass
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES, globals())
 
-# Biobuddy
-try:
+if TYPE_CHECKING:
+    from .available_interfaces import model_from_file
     from .biobuddy_model_interface import BiobuddyModelNoMesh, BiobuddyModel
-except ImportError:
-    # BioBuddy is not installed, these classes will not be available
-    pass
-
-# Pinocchio
-try:
+    from .biorbd_model_interface import BiorbdModelNoMesh, BiorbdModel
+    from .osim_model_interface import OsimModelNoMesh, OsimModel
     from .pinocchio_model_interface import PinocchioModelNoMesh, PinocchioModel
-except ImportError:
-    # Pinocchio is not installed, these classes will not be available
-    pass
-
-from .available_interfaces import model_from_file
@@ -180,6 +180,42 @@ class AbstractModelNoMesh(ABC):
         """The ranges (min, max) for each generalized coordinate."""
         pass
 
+    @property
+    def dof_is_translation(self) -> Tuple[bool, ...]:
+        """Whether each degree of freedom is a translation (meters), otherwise it is a rotation (radians)."""
+        raise NotImplementedError(f"{type(self).__name__} does not tell which degrees of freedom are translations.")
+
+    def segment_dofs(self, segment_index: int) -> Tuple[int, ...]:
+        """
+        The degrees of freedom moving a segment, i.e. its own and the ones of its parents in the kinematic tree.
+        A model which does not tell them, e.g. with coupled coordinates, is entirely updated whatever dof changes.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not tell the degrees of freedom moving its segments.")
+
+    @property
+    def marker_segments(self) -> Tuple[int, ...]:
+        """
+        The segment_index, as in segment_dofs, of the segment each marker is attached to.
+        A model telling them evaluates a subset of its markers with markers(q, indices=...).
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not tell the segments of its markers.")
+
+    @property
+    def muscle_segments(self) -> Tuple[Tuple[int, ...], ...]:
+        """
+        The segment_index of the segments each muscle path goes through, i.e. of its origin, via points and insertion.
+        A model telling them evaluates a subset of its muscles with muscle_strips(q, indices=...).
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not tell the segments of its muscles.")
+
+    @property
+    def ligament_segments(self) -> Tuple[Tuple[int, ...], ...]:
+        """
+        The segment_index of the segments each ligament path goes through, i.e. of its origin, via points and insertion.
+        A model telling them evaluates a subset of its ligaments with ligament_strips(q, indices=...).
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not tell the segments of its ligaments.")
+
     @property
     @abstractmethod
     def gravity(self) -> np.ndarray:
@@ -255,3 +291,8 @@ class AbstractModel(AbstractModelNoMesh):
     def mesh_homogenous_matrices_in_global(self, q: np.ndarray, segment_index: int, **kwargs) -> np.ndarray:
         """Get the 4x4 homogeneous transformation matrix of a mesh in the global frame."""
         pass
+
+    @abstractmethod
+    def mesh_homogenous_matrices_in_segment(self, segment_index: int, **kwargs) -> np.ndarray:
+        """Get the constant 4x4 homogeneous transformation matrix of a mesh in its segment frame."""
+        pass
@@ -1,32 +1,51 @@
+from importlib import import_module
+
 from .abstract_model_interface import AbstractModel, AbstractModelNoMesh
 from ..model_components.model_display_options import DisplayModelOptions
+from ..utils.lazy_imports import is_missing_backend
 
-AVAILABLE_INTERFACES = {}
+# The module and the model classes of each backend, imported when a model of its format is loaded
+INTERFACE_MODULES = {
+    "biorbd": ("biorbd_model_interface", "BiorbdModel", "BiorbdModelNoMesh"),
+    "opensim": ("osim_model_interface", "OsimModel", "OsimModelNoMesh"),
+    "pinocchio": ("pinocchio_model_interface", "PinocchioModel", "PinocchioModelNoMesh"),
+}
+_AVAILABLE_INTERFACES = {}
 
-# Biorbd
-try:
-    from .biorbd_model_interface import BiorbdModelNoMesh, BiorbdModel
 
-    AVAILABLE_INTERFACES["biorbd"] = (BiorbdModel, BiorbdModelNoMesh)
-except ImportError:
-    # biorbd is not installed, these classes will not be available
-    pass
+def available_interface(name: str) -> tuple[type[AbstractModel], type[AbstractModelNoMesh]] | None:
+    """
+    The model classes of a backend, imported on the first call.
 
-try:
-    from .osim_model_interface import OsimModelNoMesh, OsimModel
+    Parameters
+    ----------
+    name : str
+        The backend, one of INTERFACE_MODULES.
 
-    AVAILABLE_INTERFACES["opensim"] = (OsimModel, OsimModelNoMesh)
-except ImportError:
-    # OpenSim n'est pas installé, ces classes ne seront pas disponibles
-    pass
+    Returns
+    -------
+    tuple[type[AbstractModel], type[AbstractModelNoMesh]] | None
+        The model classes with and without meshes, None if the backend is not installed.
+    """
+    if name not in _AVAILABLE_INTERFACES:
+        module_name, model, model_no_mesh = INTERFACE_MODULES[name]
+        try:
+            module = import_module(f".{module_name}", __package__)
+            _AVAILABLE_INTERFACES[name] = getattr(module, model), getattr(module, model_no_mesh)
+        except ImportError as error:
+            if not is_missing_backend(error):
+                raise
+            # the backend is not installed, its models will not be available
+            _AVAILABLE_INTERFACES[name] = None
+    return _AVAILABLE_INTERFACES[name]
 
-try:
-    from .pinocchio_model_interface import PinocchioModelNoMesh, PinocchioModel
 
-    AVAILABLE_INTERFACES["pinocchio"] = (PinocchioModel, PinocchioModelNoMesh)
-except ImportError:
-    # Pinocchio is not installed, these classes will not be available
-    pass
+def __getattr__(name: str):
+    if name == "AVAILABLE_INTERFACES":
+        # resolved on access, which imports all the backends
+        interfaces = {interface: available_interface(interface) for interface in INTERFACE_MODULES}
+        return {interface: classes for interface, classes in interfaces.items() if classes is not None}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def model_from_file(model_path: str, options: DisplayModelOptions = None) -> tuple[AbstractModel, AbstractModelNoMesh]:
@@ -47,29 +66,32 @@ def model_from_file(model_path: str, options: DisplayModelOptions = None) -> tup
     """
 
     if model_path.endswith(".osim"):
-        if "opensim" not in AVAILABLE_INTERFACES:
+        interface = available_interface("opensim")
+        if interface is None:
             raise ImportError(
                 f"OpenSim is not installed. Please install it to use OpenSim models."
                 f"Use: conda install opensim-org::opensim"
             )
-        model = AVAILABLE_INTERFACES["opensim"][0](model_path, options=options)
-        no_instance_mesh = AVAILABLE_INTERFACES["opensim"][1]
+        model = interface[0](model_path, options=options)
+        no_instance_mesh = interface[1]
     elif model_path.endswith(".bioMod"):
-        if "biorbd" not in AVAILABLE_INTERFACES:
+        interface = available_interface("biorbd")
+        if interface is None:
             raise ImportError(
                 f"biorbd is not installed. Please install it to use biorbd models."
                 f"Use: conda install -c conda-forge biorbd"
             )
-        model = AVAILABLE_INTERFACES["biorbd"][0](model_path, options=options)
-        no_instance_mesh = AVAILABLE_INTERFACES["biorbd"][1]
+        model = interface[0](model_path, options=options)
+        no_instance_mesh = interface[1]
     elif model_path.endswith(".urdf"):
-        if "pinocchio" not in AVAILABLE_INTERFACES:
+        interface = available_interface("pinocchio")
+        if interface is None:
             raise ImportError(
                 f"Pinocchio is not installed. Please install it to use URDF models."
                 f"Use: pip install pin (or conda install pinocchio)"
             )
-        model = AVAILABLE_INTERFACES["pinocchio"][0](model_path, options=options)
-        no_instance_mesh = AVAILABLE_INTERFACES["pinocchio"][1]
+        model = interface[0](model_path, options=options)
+        no_instance_mesh = interface[1]
     else:
         raise ValueError("The model must be in biorbd (.bioMod), opensim (.osim), or pinocchio (.urdf) format.")
 
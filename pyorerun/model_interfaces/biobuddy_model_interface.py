@@ -1,9 +1,11 @@
 from functools import cached_property
+from typing import Sequence
 
 import numpy as np
 
 # Import the abstract classes
 from .abstract_model_interface import AbstractModel, AbstractModelNoMesh, AbstractSegment
+from ..utils.dof_dependencies import kinematic_chain_dofs
 
 MINIMAL_SEGMENT_MASS = 1e-08
 
@@ -132,11 +134,18 @@ class BiobuddyModelNoMesh(AbstractModelNoMesh):  # Inherits from AbstractModelNo
             rt_matrix = self.model.forward_kinematics(q)[segment_name][0].rt_matrix
         return rt_matrix
 
-    def markers(self, q: np.ndarray) -> np.ndarray:
+    def markers(self, q: np.ndarray, indices: Sequence[int] = None) -> np.ndarray:
         """
-        Returns a [N_markers x 3] array containing the position of each marker in the global reference frame
+        Returns a [N_markers x 3] array containing the position of each marker in the global reference frame,
+        only the markers of indices if given
         """
-        return self.model.markers_in_global(q)[:3, :, 0].T
+        markers = self.model.markers_in_global(q)[:3, :, 0].T
+        return markers if indices is None else markers[list(indices)]
+
+    @cached_property
+    def marker_segments(self) -> tuple[int, ...]:
+        # the markers are the ones of the segments, in their order
+        return tuple(i for i, segment in enumerate(self.model.segments) for _ in segment.markers)
 
     def centers_of_mass(self, q: np.ndarray) -> np.ndarray:
         """
@@ -185,21 +194,35 @@ class BiobuddyModelNoMesh(AbstractModelNoMesh):  # Inherits from AbstractModelNo
         """
         return self.model.muscle_names
 
-    def muscle_strips(self, q: np.ndarray) -> list[list[np.ndarray]]:
+    @cached_property
+    def _muscles(self) -> tuple:
+        """The muscles of the muscle groups, in their order"""
+        return tuple(muscle for muscle_group in self.model.muscle_groups for muscle in muscle_group.muscles)
+
+    def muscle_strips(self, q: np.ndarray, indices: Sequence[int] = None) -> list[list[np.ndarray]]:
         """
-        Returns the position of the muscles in the global reference frame
+        Returns the position of the muscles in the global reference frame, only the muscles of indices if given
         """
         muscles = []
-        for muscle_group in self.model.muscle_groups:
-            for muscle in muscle_group.muscles:
-                muscle_strip = []
-                muscle_strip += [self.model.muscle_origin_in_global(muscle.name, q)[:3, 0].tolist()]
-                if muscle.nb_via_points > 0:
-                    muscle_strip += self.model.via_points_in_global(muscle.name, q)[:3, 0].T.tolist()
-                muscle_strip += [self.model.muscle_insertion_in_global(muscle.name, q)[:3, 0].tolist()]
-                muscles += [muscle_strip]
+        for idx in range(len(self._muscles)) if indices is None else indices:
+            muscle = self._muscles[idx]
+            muscle_strip = []
+            muscle_strip += [self.model.muscle_origin_in_global(muscle.name, q)[:3, 0].tolist()]
+            if muscle.nb_via_points > 0:
+                muscle_strip += self.model.via_points_in_global(muscle.name, q)[:3, 0].T.tolist()
+            muscle_strip += [self.model.muscle_insertion_in_global(muscle.name, q)[:3, 0].tolist()]
+            muscles += [muscle_strip]
         return muscles
 
+    @cached_property
+    def muscle_segments(self) -> tuple[tuple[int, ...], ...]:
+        indices = {name: i for i, name in enumerate(self.model.segment_names)}
+        segments = []
+        for muscle in self._muscles:
+            points = (muscle.origin_position, *muscle.via_points, muscle.insertion_position)
+            segments.append(tuple(sorted({indices[p.parent_name] for p in points if p.parent_name in indices})))
+        return tuple(segments)
+
     @cached_property
     def nb_q(self) -> int:
         return self.model.nb_q
@@ -208,6 +231,27 @@ class BiobuddyModelNoMesh(AbstractModelNoMesh):  # Inherits from AbstractModelNo
     def dof_names(self) -> tuple[str, ...]:
         return tuple(s.dof_names for s in self.model.segments)
 
+    @cached_property
+    def dof_is_translation(self) -> tuple[bool, ...]:
+        # the translations of a segment come before its rotations
+        return tuple(
+            is_translation
+            for segment in self.model.segments
+            for is_translation in [True] * len(segment.translations.value)
+            + [False] * (segment.nb_q - len(segment.translations.value))
+        )
+
+    @cached_property
+    def segment_parents(self) -> tuple[int | None, ...]:
+        """The index of the parent of each segment, None for the segments attached to the ground."""
+        indices = {name: i for i, name in enumerate(self.model.segment_names)}
+        return tuple(indices.get(segment.parent_name) for segment in self.model.segments)
+
+    def segment_dofs(self, segment_index: int) -> tuple[int, ...]:
+        # the dofs of q are the ones of the segments, in their order
+        nb_dofs = [segment.nb_q for segment in self.model.segments]
+        return kinematic_chain_dofs(segment_index, self.segment_parents, nb_dofs)
+
     @cached_property
     def q_ranges(self) -> tuple[tuple[float, float], ...]:
         q_ranges = [q_range for segment in self.model.segments for q_range in segment.q_ranges]
@@ -310,8 +354,12 @@ class BiobuddyModel(BiobuddyModelNoMesh, AbstractModel):  # Inherits from Biobud
             # If q contains NaN, return an identity matrix as biorbd will throw an error otherwise
             return np.identity(4)
         else:
-            mesh_rt = super(BiobuddyModel, self).segments[segment_index].mesh_file.mesh_rt.rt_matrix
-
-            # mesh_rt = self.segments[segment_index].segment.characteristics().mesh().getRotation().to_array()
+            mesh_rt = self.mesh_homogenous_matrices_in_segment(segment_index)
             segment_rt = self.segment_homogeneous_matrices_in_global(q, segment_index=segment_index)
             return segment_rt @ mesh_rt
+
+    def mesh_homogenous_matrices_in_segment(self, segment_index: int, **kwargs) -> np.ndarray:
+        """
+        Returns the homogeneous matrix of the mesh in the segment reference frame, it does not depend on q
+        """
+        return super(BiobuddyModel, self).segments[segment_index].mesh_file.mesh_rt.rt_matrix
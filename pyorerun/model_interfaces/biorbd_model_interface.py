@@ -1,4 +1,5 @@
 from functools import cached_property
+from typing import Sequence
 
 import biorbd
 import numpy as np
@@ -6,6 +7,7 @@ from biorbd import GeneralizedCoordinates
 
 # Import the abstract classes
 from .abstract_model_interface import AbstractModel, AbstractModelNoMesh, AbstractSegment
+from ..utils.dof_dependencies import kinematic_chain_dofs
 
 MINIMAL_SEGMENT_MASS = 1e-08
 
@@ -114,11 +116,19 @@ class BiorbdModelNoMesh(AbstractModelNoMesh):  # Inherits from AbstractModelNoMe
             rt_matrix = self.model.globalJCS(GeneralizedCoordinates(q), segment_index).to_array()
         return rt_matrix
 
-    def markers(self, q: np.ndarray) -> np.ndarray:
+    def markers(self, q: np.ndarray, indices: Sequence[int] = None) -> np.ndarray:
         """
-        Returns a [N_markers x 3] array containing the position of each marker in the global reference frame
+        Returns a [N_markers x 3] array containing the position of each marker in the global reference frame,
+        only the markers of indices if given
         """
-        return np.array([self.model.markers(GeneralizedCoordinates(q))[i].to_array() for i in range(self.nb_markers)])
+        markers = self.model.markers(GeneralizedCoordinates(q))
+        return np.array([markers[i].to_array() for i in (range(self.nb_markers) if indices is None else indices)])
+
+    @cached_property
+    def marker_segments(self) -> tuple[int, ...]:
+        return tuple(
+            self.segment_names.index(self.model.marker(i).parent().to_string()) for i in range(self.nb_markers)
+        )
 
     def centers_of_mass(self, q: np.ndarray) -> np.ndarray:
         """
@@ -145,13 +155,13 @@ class BiorbdModelNoMesh(AbstractModelNoMesh):  # Inherits from AbstractModelNoMe
         """
         return tuple([s.to_string() for s in self.model.ligamentNames()])
 
-    def ligament_strips(self, q: np.ndarray) -> list[list[np.ndarray]]:
+    def ligament_strips(self, q: np.ndarray, indices: Sequence[int] = None) -> list[list[np.ndarray]]:
         """
-        Returns the position of the ligaments in the global reference frame
+        Returns the position of the ligaments in the global reference frame, only the ligaments of indices if given
         """
         ligaments = []
         self.model.updateLigaments(q, True)
-        for ligament_idx in range(self.nb_ligaments):
+        for ligament_idx in range(self.nb_ligaments) if indices is None else indices:
             ligament = self.model.ligament(ligament_idx)
             ligament_strip = []
             for pts in ligament.position().pointsInGlobal():
@@ -159,6 +169,10 @@ class BiorbdModelNoMesh(AbstractModelNoMesh):  # Inherits from AbstractModelNoMe
             ligaments.append(ligament_strip)
         return ligaments
 
+    @cached_property
+    def ligament_segments(self) -> tuple[tuple[int, ...], ...]:
+        return tuple(self._path_segments(self.model.ligament(i)) for i in range(self.nb_ligaments))
+
     @cached_property
     def nb_muscles(self) -> int:
         """
@@ -173,13 +187,13 @@ class BiorbdModelNoMesh(AbstractModelNoMesh):  # Inherits from AbstractModelNoMe
         """
         return tuple([s.to_string() for s in self.model.muscleNames()])
 
-    def muscle_strips(self, q: np.ndarray) -> list[list[np.ndarray]]:
+    def muscle_strips(self, q: np.ndarray, indices: Sequence[int] = None) -> list[list[np.ndarray]]:
         """
-        Returns the position of the muscles in the global reference frame
+        Returns the position of the muscles in the global reference frame, only the muscles of indices if given
         """
         muscles = []
         self.model.updateMuscles(q, True)
-        for idx in range(self.nb_muscles):
+        for idx in range(self.nb_muscles) if indices is None else indices:
             muscle = self.model.muscle(idx)
             muscle_strip = []
             for pts in muscle.position().pointsInGlobal():
@@ -187,6 +201,18 @@ class BiorbdModelNoMesh(AbstractModelNoMesh):  # Inherits from AbstractModelNoMe
             muscles.append(muscle_strip)
         return muscles
 
+    @cached_property
+    def muscle_segments(self) -> tuple[tuple[int, ...], ...]:
+        return tuple(self._path_segments(self.model.muscle(i)) for i in range(self.nb_muscles))
+
+    def _path_segments(self, path) -> tuple[int, ...]:
+        """The segments of the origin, insertion, via points and wrapping objects of a muscle or ligament."""
+        points = [path.position().originInLocal(), path.position().insertionInLocal()]
+        points += [path.pathModifier().object(i) for i in range(path.pathModifier().nbObjects())]
+        # the points attached to the ground are not on a segment
+        parents = {point.parent().to_string() for point in points}
+        return tuple(sorted(self.segment_names.index(name) for name in parents if name in self.segment_names))
+
     @cached_property
     def nb_q(self) -> int:
         return self.model.nbQ()
@@ -195,6 +221,26 @@ class BiorbdModelNoMesh(AbstractModelNoMesh):  # Inherits from AbstractModelNoMe
     def dof_names(self) -> tuple[str, ...]:
         return tuple(s.to_string() for s in self.model.nameDof())
 
+    @cached_property
+    def dof_is_translation(self) -> tuple[bool, ...]:
+        # the translations of a segment come before its rotations
+        return tuple(
+            is_translation
+            for segment in self.model.segments()
+            for is_translation in [True] * segment.nbDofTrans() + [False] * (segment.nbQ() - segment.nbDofTrans())
+        )
+
+    @cached_property
+    def segment_parents(self) -> tuple[int | None, ...]:
+        """The index of the parent of each segment, None for the segments attached to the ground."""
+        indices = {name: i for i, name in enumerate(self.segment_names)}
+        return tuple(indices.get(segment.parent().to_string()) for segment in self.model.segments())
+
+    def segment_dofs(self, segment_index: int) -> tuple[int, ...]:
+        # the dofs of q are the ones of the segments, in their order
+        nb_dofs = [segment.nbQ() for segment in self.model.segments()]
+        return kinematic_chain_dofs(segment_index, self.segment_parents, nb_dofs)
+
     @cached_property
     def q_ranges(self) -> tuple[tuple[float, float], ...]:
         q_ranges = [q_range for segment in self.model.segments() for q_range in segment.QRanges()]
@@ -293,14 +339,14 @@ class BiorbdModel(BiorbdModelNoMesh, AbstractModel):  # Inherits from BiorbdMode
             # If q contains NaN, return an identity matrix as biorbd will throw an error otherwise
             return np.identity(4)
         else:
-            mesh_rt = (
-                super(BiorbdModel, self)
-                .segments[segment_index]
-                .segment.characteristics()
-                .mesh()
-                .getRotation()
-                .to_array()
-            )
-            # mesh_rt = self.segments[segment_index].segment.characteristics().mesh().getRotation().to_array()
+            mesh_rt = self.mesh_homogenous_matrices_in_segment(segment_index)
             segment_rt = self.segment_homogeneous_matrices_in_global(q, segment_index=segment_index)
             return segment_rt @ mesh_rt
+
+    def mesh_homogenous_matrices_in_segment(self, segment_index: int, **kwargs) -> np.ndarray:
+        """
+        Returns the homogeneous matrix of the mesh in the segment reference frame, it does not depend on q
+        """
+        return (
+            super(BiorbdModel, self).segments[segment_index].segment.characteristics().mesh().getRotation().to_array()
+        )
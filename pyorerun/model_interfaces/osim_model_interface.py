@@ -110,34 +110,47 @@ class OsimSegment(AbstractSegment):  # Inherits from AbstractSegment
     @cached_property
     def mesh_rt(self) -> list[np.ndarray]:
         """
-        Returns the mesh rotation and translation matrix of the segment
+        Returns the mesh rotation and translation matrix of the segment.
+        A mesh attached to a PhysicalOffsetFrame of the body is offset by this frame, otherwise it is the identity.
         """
         if self.__mesh_rt is None:
             self.__mesh_rt = []
-            meshes = self.body_from_xml.getElementsByTagName("Mesh")
-            physical_offset = self.body_from_xml.getElementsByTagName("PhysicalOffsetFrame")
-            path_meshes = [mesh.getElementsByTagName("mesh_file")[0].firstChild.nodeValue for mesh in meshes]
-            path_physical_offset = [
-                offset.getElementsByTagName("mesh_file")[0].firstChild.nodeValue for offset in physical_offset
-            ]
-            mesh_with_offset = [mesh for mesh in path_meshes if mesh in path_physical_offset]
-            count = 0
-            for i in range(len(path_meshes)):
-                if not path_meshes[i] in mesh_with_offset:
-                    self.__mesh_rt.extend(np.eye(4))
-                elif len(physical_offset) != 0:
-                    rt_matrix = np.eye(4)
-                    translations = physical_offset[count].getElementsByTagName("translation")[0].firstChild.nodeValue
-                    translations = np.array(translations.split(" ")).astype(float)
-                    orientations = physical_offset[count].getElementsByTagName("orientation")[0].firstChild.nodeValue
-                    orientations = np.array(orientations.split(" ")).astype(float)
-                    rotation_matrix = R.from_euler("xyz", orientations).as_matrix()
-                    rt_matrix[:3, :3] = rotation_matrix
-                    rt_matrix[:3, 3] = translations
-                    self.__mesh_rt.extend([rt_matrix])
-                    count += 1
+            for mesh in self.body_from_xml.getElementsByTagName("Mesh"):
+                offset_frame = self._parent_physical_offset_frame(mesh)
+                if offset_frame is None:
+                    self.__mesh_rt.append(np.eye(4))
+                    continue
+
+                translations = self._child_value(offset_frame, "translation")
+                orientations = self._child_value(offset_frame, "orientation")
+                rt_matrix = np.eye(4)
+                # OpenSim orientations are expressed as a frame-fixed (intrinsic) x-y-z rotation sequence
+                rt_matrix[:3, :3] = R.from_euler("XYZ", orientations).as_matrix()
+                rt_matrix[:3, 3] = translations
+                self.__mesh_rt.append(rt_matrix)
         return self.__mesh_rt
 
+    def _parent_physical_offset_frame(self, mesh) -> any:
+        """
+        Returns the closest PhysicalOffsetFrame containing the mesh inside the body, None if there is none.
+        """
+        node = mesh.parentNode
+        while node is not None and node is not self.body_from_xml:
+            if node.nodeName == "PhysicalOffsetFrame":
+                return node
+            node = node.parentNode
+        return None
+
+    @staticmethod
+    def _child_value(node, tag: str) -> np.ndarray:
+        """
+        Returns the values of a direct child of a xml node as an array, zeros if the child is not declared.
+        """
+        for child in node.childNodes:
+            if child.nodeName == tag:
+                return np.array(child.firstChild.nodeValue.split()).astype(float)
+        return np.zeros(3)
+
 
 class OsimModelNoMesh(AbstractModelNoMesh):  # Inherits from AbstractModelNoMesh
     """
@@ -287,6 +300,10 @@ class OsimModelNoMesh(AbstractModelNoMesh):  # Inherits from AbstractModelNoMesh
     def q_ranges(self) -> tuple[tuple[float, float], ...]:
         return tuple((c.getRangeMin(), c.getRangeMax()) for c in self.coordinate_set)
 
+    @cached_property
+    def dof_is_translation(self) -> tuple[bool, ...]:
+        return tuple(c.getMotionType() == osim.Coordinate.Translational for c in self.coordinate_set)
+
     @cached_property
     def gravity(self) -> np.ndarray:
         return self.model.getGravity().to_numpy()
@@ -355,13 +372,15 @@ class OsimModel(OsimModelNoMesh, AbstractModel):  # Inherits from OsimModelNoMes
     def meshlines(self) -> list[np.ndarray]:
         return []
 
-    def mesh_homogenous_matrices_in_global(
-        self, q: np.ndarray, segment_index: int, mesh_index: int = None
-    ) -> np.ndarray:
+    def mesh_homogenous_matrices_in_global(self, q: np.ndarray, segment_index: int, mesh_index: int = 0) -> np.ndarray:
         """
         Returns a list of homogeneous matrices of the mesh in the global reference frame
         """
         segment_rt = self.segment_homogeneous_matrices_in_global(q, segment_index=segment_index)
-        # In this implementation, mesh_index from kwargs is ignored.
-        # mesh_index = kwargs.get("mesh_index")
-        return segment_rt @ np.eye(4)  # self.segments[segment_index].mesh_rt[mesh_index]
+        return segment_rt @ self.mesh_homogenous_matrices_in_segment(segment_index, mesh_index=mesh_index)
+
+    def mesh_homogenous_matrices_in_segment(self, segment_index: int, mesh_index: int = 0) -> np.ndarray:
+        """
+        Returns the homogeneous matrix of the mesh in the segment reference frame, i.e. its PhysicalOffsetFrame
+        """
+        return super(OsimModel, self).segments[segment_index].mesh_rt[mesh_index]
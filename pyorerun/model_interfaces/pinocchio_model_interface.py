@@ -1,6 +1,7 @@
 import os
 from functools import cached_property
 from pathlib import Path
+from typing import Sequence
 
 import numpy as np
 import pinocchio as pin
@@ -172,6 +173,13 @@ class PinocchioModelNoMesh(AbstractModelNoMesh):
     def nb_markers(self) -> int:
         return len(self.marker_names)
 
+    @cached_property
+    def marker_segments(self) -> tuple[int, ...]:
+        """
+        The markers being frames, each one is its own segment_index.
+        """
+        return tuple(self.model.getFrameId(frame_name) for frame_name in self.marker_names)
+
     @cached_property
     def segment_names(self) -> tuple[str, ...]:
         """
@@ -229,17 +237,30 @@ class PinocchioModelNoMesh(AbstractModelNoMesh):
 
         return oMf.homogeneous
 
-    def markers(self, q: np.ndarray) -> np.ndarray:
+    def segment_dofs(self, segment_index: int) -> tuple[int, ...]:
+        """
+        Returns the dofs of the joint of the frame and of its parent joints, the universe joint 0 having none.
         """
-        Returns a [N_markers x 3] array containing the position of each marker in the global reference frame.
+        dofs = []
+        joint_id = self.model.frames[segment_index].parentJoint
+        while joint_id > 0:
+            joint = self.model.joints[joint_id]
+            dofs.extend(range(joint.idx_q, joint.idx_q + joint.nq))
+            joint_id = self.model.parents[joint_id]
+        return tuple(sorted(dofs))
+
+    def markers(self, q: np.ndarray, indices: Sequence[int] = None) -> np.ndarray:
+        """
+        Returns a [N_markers x 3] array containing the position of each marker in the global reference frame,
+        only the markers of indices if given.
         """
         # Update kinematics
         pin.forwardKinematics(self.model, self.data, q)
         pin.updateFramePlacements(self.model, self.data)
 
         markers = []
-        for frame_name in self.marker_names:
-            frame_id = self.model.getFrameId(frame_name)
+        for idx in range(self.nb_markers) if indices is None else indices:
+            frame_id = self.marker_segments[idx]
             position = self.data.oMf[frame_id].translation
             markers.append(position)
 
@@ -294,6 +315,28 @@ class PinocchioModelNoMesh(AbstractModelNoMesh):
 
         return tuple(dof_names)
 
+    @cached_property
+    def dof_is_translation(self) -> tuple[bool, ...]:
+        """
+        Returns whether each DoF is a translation.
+
+        Notes
+        -----
+        A free-flyer joint is a translation followed by a quaternion, a planar joint a translation followed by
+        the cosine and sine of its angle.
+        """
+        nb_translations_by_joint_type = {"JointModelFreeFlyer": 3, "JointModelPlanar": 2, "JointModelTranslation": 3}
+        dof_is_translation = []
+        for joint in self.model.joints[1:]:
+            joint_type = joint.shortname()
+            nb_translations = nb_translations_by_joint_type.get(joint_type, 0)
+            if joint_type.startswith("JointModelP") and joint_type != "JointModelPlanar":
+                # prismatic joints, e.g. JointModelPX or JointModelPrismaticUnaligned
+                nb_translations = joint.nq
+            dof_is_translation += [True] * nb_translations + [False] * (joint.nq - nb_translations)
+
+        return tuple(dof_is_translation)
+
     @cached_property
     def q_ranges(self) -> tuple[tuple[float, float], ...]:
         """
@@ -370,7 +413,7 @@ class PinocchioModelNoMesh(AbstractModelNoMesh):
         """
         return tuple(self.muscles_names)
 
-    def muscle_strips(self, q: np.ndarray) -> list[list[np.ndarray]]:
+    def muscle_strips(self, q: np.ndarray, indices: Sequence[int] = None) -> list[list[np.ndarray]]:
         """
         Pinocchio doesn't have native muscle support.
         """
@@ -378,7 +421,7 @@ class PinocchioModelNoMesh(AbstractModelNoMesh):
         pin.updateFramePlacements(self.model, self.data)
 
         muscles = []
-        for idx in range(self.nb_muscles):
+        for idx in range(self.nb_muscles) if indices is None else indices:
             muscle_name = self.muscle_names[idx]
             muscle_frames = [
                 f_name for f_name in self._frame_list_names if muscle_name == f_name.split("-")[0]
@@ -392,6 +435,16 @@ class PinocchioModelNoMesh(AbstractModelNoMesh):
             muscles.append(muscle_strip)
         return muscles
 
+    @cached_property
+    def muscle_segments(self) -> tuple[tuple[int, ...], ...]:
+        """
+        The frames of the points of each muscle, named like "muscleName-1", "muscleName-2", etc.
+        """
+        return tuple(
+            tuple(i for i, f_name in enumerate(self._frame_list_names) if muscle_name == f_name.split("-")[0])
+            for muscle_name in self.muscle_names
+        )
+
     @cached_property
     def gravity(self) -> np.ndarray:
         """
@@ -514,3 +567,9 @@ class PinocchioModel(PinocchioModelNoMesh, AbstractModel):
         Get the 4x4 homogeneous transformation matrix of a mesh in the global frame.
         """
         return self.segment_homogeneous_matrices_in_global(q, segment_index)
+
+    def mesh_homogenous_matrices_in_segment(self, segment_index: int, **kwargs) -> np.ndarray:
+        """
+        Get the constant 4x4 homogeneous transformation matrix of a mesh in its segment frame.
+        """
+        return np.eye(4)
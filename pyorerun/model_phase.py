@@ -3,6 +3,7 @@ import numpy as np
 from .model_components.model_marker_link_updapter import ModelMarkerLinksUpdater
 from .model_components.model_updapter import ModelUpdater
 from .model_interfaces import AbstractModel
+from .utils.keyframes import KeyframeTolerances
 
 
 class ModelRerunPhase:
@@ -90,10 +91,10 @@ class ModelRerunPhase:
         for link in self._rerun_links_without_none:
             link.initialize()
 
-    def to_chunk(self) -> dict[str, list]:
+    def to_chunk(self, tolerances: KeyframeTolerances = None) -> dict[str, list]:
         all_chunks = {}
         for i, model in enumerate(self.rerun_models):
-            all_chunks.update(model.to_chunk(self.q[i]))
+            all_chunks.update(model.to_chunk(self.q[i], tolerances=tolerances))
         for i, rr_link in zip(self._model_links_index_without_none, self._rerun_links_without_none):
             all_chunks.update(rr_link.to_chunk(self.q[i], self.tracked_markers[i]))
         return all_chunks
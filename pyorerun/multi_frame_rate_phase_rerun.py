@@ -1,10 +1,14 @@
 import os
+from concurrent.futures import Executor
 
 import numpy as np
 import rerun as rr
 import rerun.blueprint as rrb
 
 from .phase_rerun import PhaseRerun
+from .utils.async_utils import run_in_executor, send_chunks_async
+from .utils.keyframes import send_chunks
+from .utils.recording import active_recording
 
 
 class MultiFrameRatePhaseRerun:
@@ -15,16 +19,21 @@ class MultiFrameRatePhaseRerun:
     ----------
     phase_reruns : list[PhaseRerun]
         The phases to animate.
+    recording : rr.RecordingStream
+        The recording of the phases, the global one if None.
     """
 
-    def __init__(self, phase_reruns: list[PhaseRerun]):
+    def __init__(self, phase_reruns: list[PhaseRerun], recording: rr.RecordingStream = None):
         """
         Parameters
         ----------
         phase_reruns: list[PhaseRerun]
             The phases to animate.
+        recording: rr.RecordingStream
+            The recording of the phases, created with the same recording, the global recording of rr.init by default.
         """
         self.phase_reruns = phase_reruns
+        self.recording = recording
 
     @property
     def nb_phases(self) -> int:
@@ -83,33 +92,34 @@ class MultiFrameRatePhaseRerun:
             self.phase_reruns[0].rerun_by_frame(name, init, clear_last_node, notebook)
             return
 
-        if init:
+        if init and self.recording is None:
             spawn = not notebook and os.environ.get("PYORERUN_HEADLESS", "0").lower() not in ("1", "true", "yes")
             rr.init(f"{name}_{0}", spawn=spawn)
 
-        for phase_rerun in self.phase_reruns:
-            frame = 0
-            rr.set_time("stable_time", duration=phase_rerun.t_span[frame])
-            phase_rerun.timeless_components.to_rerun()
-            phase_rerun.biorbd_models.to_rerun(frame)
-            phase_rerun.xp_data.to_rerun(frame)
-
-        cumulative_frames_in_merged_t_span = self.cumulative_frames_in_merged_t_span
-        for frame, (t, idx) in enumerate(zip(self.merged_t_span[1:], self.frame_t_span_idx[1:])):
-            rr.set_time("stable_time", duration=t)
-            for i in idx:
-                frame_i = cumulative_frames_in_merged_t_span[i][frame + 1]
-                self.phase_reruns[i].biorbd_models.to_rerun(frame_i)
-                self.phase_reruns[i].xp_data.to_rerun(frame_i)
-
-        if clear_last_node:
+        with active_recording(self.recording):
             for phase_rerun in self.phase_reruns:
-                for component in [
-                    *phase_rerun.biorbd_models.component_names,
-                    *phase_rerun.xp_data.component_names,
-                    *phase_rerun.timeless_components.component_names,
-                ]:
-                    rr.log(component, rr.Clear(recursive=False))
+                frame = 0
+                rr.set_time("stable_time", duration=phase_rerun.t_span[frame])
+                phase_rerun.timeless_components.to_rerun()
+                phase_rerun.biorbd_models.to_rerun(frame)
+                phase_rerun.xp_data.to_rerun(frame)
+
+            cumulative_frames_in_merged_t_span = self.cumulative_frames_in_merged_t_span
+            for frame, (t, idx) in enumerate(zip(self.merged_t_span[1:], self.frame_t_span_idx[1:])):
+                rr.set_time("stable_time", duration=t)
+                for i in idx:
+                    frame_i = cumulative_frames_in_merged_t_span[i][frame + 1]
+                    self.phase_reruns[i].biorbd_models.to_rerun(frame_i)
+                    self.phase_reruns[i].xp_data.to_rerun(frame_i)
+
+            if clear_last_node:
+                for phase_rerun in self.phase_reruns:
+                    for component in [
+                        *phase_rerun.biorbd_models.component_names,
+                        *phase_rerun.xp_data.component_names,
+                        *phase_rerun.timeless_components.component_names,
+                    ]:
+                        rr.log(component, rr.Clear(recursive=False))
 
     def rerun(
         self, name: str = "animation_phase", init: bool = True, clear_last_node: bool = False, notebook: bool = False
@@ -119,41 +129,46 @@ class MultiFrameRatePhaseRerun:
             return
 
         if init:
-            spawn = not notebook and os.environ.get("PYORERUN_HEADLESS", "0").lower() not in ("1", "true", "yes")
-            rr.init(f"{name}_{0}", spawn=spawn)
-            rr.log("/", rr.ViewCoordinates.RIGHT_HAND_Y_UP, static=True)
-            rr.send_blueprint(
-                rrb.Blueprint(
-                    rrb.Spatial3DView(
-                        name="",
-                        origin=f"/",
-                        eye_controls=rrb.archetypes.EyeControls3D(eye_up=[0, 1, 0]),  # Y-axis as up
-                    )
-                )
-            )
+            self.initialize_recording(name, notebook)
 
         for phase_rerun in self.phase_reruns:
-            frame = 0
-            rr.set_time("stable_time", duration=phase_rerun.t_span[frame])
-            phase_rerun.timeless_components.to_rerun()
-            phase_rerun.models.initialize()
-            phase_rerun.xp_data.initialize()
-
-            times = [rr.TimeColumn("stable_time", duration=phase_rerun.t_span)]
-
-            for name, chunk in phase_rerun.xp_data.to_chunk().items():
-                rr.send_columns(
-                    name,
-                    indexes=times,
-                    columns=chunk,
-                )
+            send_chunks(phase_rerun.prepare_chunks(), phase_rerun.t_span, phase_rerun.recording)
+
+    async def rerun_async(
+        self,
+        name: str = "animation_phase",
+        init: bool = True,
+        clear_last_node: bool = False,
+        notebook: bool = False,
+        executor: Executor = None,
+    ) -> None:
+        """The awaitable rerun, the phases being computed and sent in an executor as in PhaseRerun.rerun_async."""
+        if self.nb_phases == 1:
+            await self.phase_reruns[0].rerun_async(name, init, clear_last_node, notebook, executor=executor)
+            return
+
+        if init:
+            await run_in_executor(self.initialize_recording, name, notebook, executor=executor)
 
-            for name, chunk in phase_rerun.models.to_chunk().items():
-                rr.send_columns(
-                    name,
-                    indexes=times,
-                    columns=chunk,
+        for phase_rerun in self.phase_reruns:
+            chunks = await run_in_executor(phase_rerun.prepare_chunks, executor=executor)
+            await send_chunks_async(chunks, phase_rerun.t_span, executor=executor, recording=phase_rerun.recording)
+
+    def initialize_recording(self, name: str, notebook: bool = False) -> None:
+        if self.recording is None:
+            spawn = not notebook and os.environ.get("PYORERUN_HEADLESS", "0").lower() not in ("1", "true", "yes")
+            rr.init(f"{name}_{0}", spawn=spawn)
+        rr.log("/", rr.ViewCoordinates.RIGHT_HAND_Y_UP, static=True, recording=self.recording)
+        rr.send_blueprint(
+            rrb.Blueprint(
+                rrb.Spatial3DView(
+                    name="",
+                    origin=f"/",
+                    eye_controls=rrb.archetypes.EyeControls3D(eye_up=[0, 1, 0]),  # Y-axis as up
                 )
+            ),
+            recording=self.recording,
+        )
 
         # cumulative_frames_in_merged_t_span = self.cumulative_frames_in_merged_t_span
         # for frame, (t, idx) in enumerate(zip(self.merged_t_span[1:], self.frame_t_span_idx[1:])):
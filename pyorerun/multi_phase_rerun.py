@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import Executor
 
 import numpy as np
 import rerun as rr  # NOTE: `rerun`, not `rerun-sdk`!
@@ -7,6 +8,7 @@ from .pyomarkers import PyoMarkers
 
 from .model_interfaces import AbstractModel
 from .phase_rerun import PhaseRerun
+from .utils.async_utils import run_in_executor
 
 
 class MultiPhaseRerun:
@@ -14,7 +16,14 @@ class MultiPhaseRerun:
     A class to animate a biorbd model in rerun with multiple phases.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, recording: rr.RecordingStream = None) -> None:
+        """
+        Parameters
+        ----------
+        recording: rr.RecordingStream
+            The recording all the phases are sent to, the global recording of rr.init by default.
+        """
+        self.recording = recording
         self.rerun_biorbd_phases: list[dict[str, PhaseRerun], ...] = []
 
     def add_phase(self, t_span: np.ndarray, phase: int = 0, window: str = "animation") -> None:
@@ -27,7 +36,7 @@ class MultiPhaseRerun:
         if self.nb_phase - phase == 0:
             self.rerun_biorbd_phases.append(dict())
 
-        self.rerun_biorbd_phases[phase][window] = PhaseRerun(t_span, phase, window)
+        self.rerun_biorbd_phases[phase][window] = PhaseRerun(t_span, phase, window, recording=self.recording)
 
     def add_animated_model(
         self,
@@ -84,18 +93,7 @@ class MultiPhaseRerun:
         return [windows for phase in self.rerun_biorbd_phases for windows in phase.keys()]
 
     def rerun_by_frame(self, server_name: str = "multi_phase_animation", notebook=False) -> None:
-        spawn = not notebook and os.environ.get("PYORERUN_HEADLESS", "0").lower() not in ("1", "true", "yes")
-        rr.init(server_name, spawn=spawn)
-        rr.log("/", rr.ViewCoordinates.RIGHT_HAND_Y_UP, static=True)
-        rr.send_blueprint(
-            rrb.Blueprint(
-                rrb.Spatial3DView(
-                    name="",
-                    origin=f"/",
-                    eye_controls=rrb.archetypes.EyeControls3D(eye_up=[0, 1, 0]),  # Y-axis as up
-                )
-            )
-        )
+        self.initialize_recording(server_name, notebook)
 
         for i, phase in enumerate(self.rerun_biorbd_phases):
             for j, (window, rr_phase) in enumerate(phase.items()):
@@ -109,18 +107,7 @@ class MultiPhaseRerun:
                 rr_phase.rerun_by_frame(init=False, clear_last_node=more_phases_after_this_one)
 
     def rerun(self, server_name: str = "multi_phase_animation", notebook=False) -> None:
-        spawn = not notebook and os.environ.get("PYORERUN_HEADLESS", "0").lower() not in ("1", "true", "yes")
-        rr.init(server_name, spawn=spawn)
-        rr.log("/", rr.ViewCoordinates.RIGHT_HAND_Y_UP, static=True)
-        rr.send_blueprint(
-            rrb.Blueprint(
-                rrb.Spatial3DView(
-                    name="",
-                    origin=f"/",
-                    eye_controls=rrb.archetypes.EyeControls3D(eye_up=[0, 1, 0]),  # Y-axis as up
-                )
-            )
-        )
+        self.initialize_recording(server_name, notebook)
 
         for i, phase in enumerate(self.rerun_biorbd_phases):
             for j, (window, rr_phase) in enumerate(phase.items()):
@@ -132,3 +119,30 @@ class MultiPhaseRerun:
 
                 more_phases_after_this_one = i < self.nb_phase - 1
                 rr_phase.rerun(init=False, clear_last_node=more_phases_after_this_one)
+
+    async def rerun_async(
+        self, server_name: str = "multi_phase_animation", notebook=False, executor: Executor = None
+    ) -> None:
+        """The awaitable rerun, each phase being computed and sent in an executor with PhaseRerun.rerun_async."""
+        await run_in_executor(self.initialize_recording, server_name, notebook, executor=executor)
+
+        for i, phase in enumerate(self.rerun_biorbd_phases):
+            for rr_phase in phase.values():
+                more_phases_after_this_one = i < self.nb_phase - 1
+                await rr_phase.rerun_async(init=False, clear_last_node=more_phases_after_this_one, executor=executor)
+
+    def initialize_recording(self, server_name: str, notebook: bool = False) -> None:
+        if self.recording is None:
+            spawn = not notebook and os.environ.get("PYORERUN_HEADLESS", "0").lower() not in ("1", "true", "yes")
+            rr.init(server_name, spawn=spawn)
+        rr.log("/", rr.ViewCoordinates.RIGHT_HAND_Y_UP, static=True, recording=self.recording)
+        rr.send_blueprint(
+            rrb.Blueprint(
+                rrb.Spatial3DView(
+                    name="",
+                    origin=f"/",
+                    eye_controls=rrb.archetypes.EyeControls3D(eye_up=[0, 1, 0]),  # Y-axis as up
+                )
+            ),
+            recording=self.recording,
+        )
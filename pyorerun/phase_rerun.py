@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import Executor
 
 import numpy as np
 import rerun as rr
@@ -12,9 +13,13 @@ from .model_interfaces import AbstractModel
 from .model_phase import ModelRerunPhase
 from .timeless import Gravity, Floor, ForcePlate
 from .timeless_components import TimelessRerunPhase
-from .xp_components import MarkersXp, TimeSeriesQ, ForceVector, Video, VectorXp
+from .xp_components import MarkersXp, TimeSeriesQ, ForceVector, Video, VideoFile, VectorXp, MotTimeSeries
 from .xp_phase import XpRerunPhase
+from .utils.async_utils import run_in_executor, send_chunks_async
+from .utils.keyframes import KeyframeTolerances, send_chunks
+from .utils.recording import active_recording
 from .utils.markers_utils import check_and_adjust_markers
+from .utils.resampling import resample
 
 
 class PhaseRerun:
@@ -36,9 +41,11 @@ class PhaseRerun:
     timeless_components : list
         The components to display at the begin of the phase but stay until the end of this phase.
         This not a true timeless in the sens of rerun, as if a new phase is created, the timeless components will be cleared.
+    recording : rr.RecordingStream
+        The recording the components log to, the global one if None.
     """
 
-    def __init__(self, t_span: np.ndarray, phase: int = 0, window: str = None):
+    def __init__(self, t_span: np.ndarray, phase: int = 0, window: str = None, recording: rr.RecordingStream = None):
         """
         Parameters
         ----------
@@ -46,8 +53,12 @@ class PhaseRerun:
             The time span of the animation, such as the time instant of each frame.
         phase: int
             The phase number of the animation, zero by default.
+        recording: rr.RecordingStream
+            The recording the phase is sent to, e.g. to build several recordings at once in threads and save them
+            independently. The global recording of rr.init by default.
         """
         self.phase = phase
+        self.recording = recording
         self.name = f"animation_phase_{self.phase}"
         if window:
             self.name = f"{window}/{self.name}"
@@ -62,7 +73,7 @@ class PhaseRerun:
     def add_animated_model(
         self,
         model: AbstractModel,
-        q: np.ndarray,
+        q: np.ndarray | MotTimeSeries,
         tracked_markers: PyoMarkers | np.ndarray = None,
         muscle_activations_intensity: PyoMuscles | np.ndarray = None,
         display_q: bool = False,
@@ -74,8 +85,8 @@ class PhaseRerun:
         ----------
         model: AbstractModel
             The msk model to display.
-        q: np.ndarray
-            The generalized coordinates of the model.
+        q: np.ndarray | MotTimeSeries
+            The generalized coordinates of the model, or a .mot file mapped to the degrees of freedom of the model.
         tracked_markers: PyoMarkers
             The markers to display, and sets a link between the model markers and the tracked markers.
         muscle_activations_intensity: PyoMuscles
@@ -83,6 +94,9 @@ class PhaseRerun:
         display_q: bool
             Whether to display the generalized coordinates q in charts.
         """
+        if isinstance(q, MotTimeSeries):
+            q = q.to_q(model)
+
         shape_is_not_consistent = q.shape[1] != self.t_span.shape[0]
         if shape_is_not_consistent:
             raise ValueError(
@@ -103,7 +117,7 @@ class PhaseRerun:
         if tracked_markers is not None:
             tracked_markers = check_and_adjust_markers(model, tracked_markers)
             self.__add_tracked_markers(model, tracked_markers)
-            tracked_markers = tracked_markers.to_numpy()[:3, :, :]
+            tracked_markers = tracked_markers.to_numpy(homogeneous=False)
         self.models.add_animated_model(model, q, tracked_markers, muscle_colors)
 
         if display_q:
@@ -178,8 +192,8 @@ class PhaseRerun:
     def add_q(
         self,
         name: str,
-        q: np.ndarray,
-        dof_names: tuple[str, ...],
+        q: np.ndarray | MotTimeSeries,
+        dof_names: tuple[str, ...] = None,
         ranges: tuple[tuple[float, float], ...] = None,
     ) -> None:
         """
@@ -189,13 +203,22 @@ class PhaseRerun:
         ----------
         name: str
             The name of the q set.
-        q: np.ndarray
-            The generalized coordinates to display of shape (nb_q, nb_frames).
+        q: np.ndarray | MotTimeSeries
+            The generalized coordinates to display of shape (nb_q, nb_frames), or a .mot file,
+            mapped to the degrees of freedom of its model if it has one.
         dof_names: tuple[str, ...]
-            The names of the degrees of freedom.
+            The names of the degrees of freedom, those of the .mot file (or of its model) if None.
         ranges: tuple[tuple[float, float], ...]
             The ranges of the q values, min and max.
         """
+        if isinstance(q, MotTimeSeries) and q.model is not None:
+            dof_names = q.model.dof_names if dof_names is None else dof_names
+            q = q.to_q(q.model)
+        elif isinstance(q, MotTimeSeries):
+            # without model, the rotations can not be told from the translations, the units of the file are kept
+            dof_names = q.coordinate_names if dof_names is None else dof_names
+            q = q.q
+
         if q.shape[1] != self.t_span.shape[0]:
             raise ValueError(
                 f"The shapes of q and tspan are inconsistent. "
@@ -217,8 +240,41 @@ class PhaseRerun:
         """Add a force plate to the phase."""
         self.timeless_components.add_component(ForcePlate(name=f"{self.name}", num=num, corners=corners))
 
-    def add_force_data(self, num: int, force_origin: np.ndarray, force_vector: np.ndarray) -> None:
-        """Add a force data to the phase."""
+    def add_force_data(
+        self,
+        num: int,
+        force_origin: np.ndarray,
+        force_vector: np.ndarray,
+        time: np.ndarray = None,
+        resampling: str = "interpolate",
+    ) -> None:
+        """
+        Add a force data to the phase.
+
+        Parameters
+        ----------
+        num: int
+            The number of the force.
+        force_origin: np.ndarray
+            The origin of the force (3, nb_samples), e.g. the center of pressure, NaN when there is no contact.
+        force_vector: np.ndarray
+            The force (3, nb_samples).
+        time: np.ndarray
+            The time of the samples, if they are not those of the phase, e.g. for 1-2 kHz analog data.
+            The force is then resampled to the time span of the phase.
+        resampling: str
+            "interpolate" to linearly interpolate the samples, or "peak" to keep the largest force around each frame.
+        """
+        if time is not None:
+            force_origin = resample(
+                force_origin,
+                time,
+                self.t_span,
+                mode=resampling,
+                peak_magnitude=np.linalg.norm(force_vector, axis=0),
+            )
+            force_vector = resample(force_vector, time, self.t_span, mode=resampling)
+
         if force_origin.shape[1] != self.t_span.shape[0] or force_vector.shape[1] != self.t_span.shape[0]:
             raise ValueError(
                 f"The shapes of force_origin/force_vector and tspan are inconsistent. "
@@ -230,93 +286,186 @@ class PhaseRerun:
             ForceVector(name=f"{self.name}", num=num, vector_origins=force_origin, vector_magnitudes=force_vector)
         )
 
-    def add_video(self, name, video_array: np.ndarray) -> None:
-        """Add a video to the phase."""
-        if video_array.shape[0] != self.t_span.shape[0]:
+    def add_video(
+        self, name, video_array: np.ndarray | str | VideoFile, max_resolution: tuple[int, int] = None
+    ) -> None:
+        """
+        Add a video to the phase.
+
+        Parameters
+        ----------
+        name: str
+            The name of the video.
+        video_array: np.ndarray | str | VideoFile
+            The uint8 frames (nb_frames, nb_vertical_pixels, nb_horizontal_pixels, 3),
+            or the path to a video file streamed instead of being loaded in memory. The frames of a video file
+            are resampled to the time span of the phase, counted from the beginning of the video.
+        max_resolution: tuple[int, int]
+            The maximal (width, height) of a video file, downscaled while decoding.
+        """
+        if isinstance(video_array, np.ndarray):
+            video = Video(name=f"{self.name}/{name}", video_array=video_array)
+        elif isinstance(video_array, VideoFile):
+            video = video_array
+            video.name = f"{self.name}/{name}"
+        else:
+            video = VideoFile(name=f"{self.name}/{name}", path=video_array, max_resolution=max_resolution)
+            video.align(self.t_span)
+
+        if video.nb_frames != self.t_span.shape[0]:
             raise ValueError("The video array and tspan are inconsistent. They must have the same length.")
 
-        self.xp_data.add_data(Video(name=f"{self.name}/{name}", video_array=video_array))
+        self.xp_data.add_data(video)
 
     def rerun_by_frame(
         self, name: str = "animation_phase", init: bool = True, clear_last_node: bool = False, notebook: bool = False
     ) -> None:
         if init:
-            spawn = not notebook and os.environ.get("PYORERUN_HEADLESS", "0").lower() not in ("1", "true", "yes")
-            rr.init(f"{name}_{self.phase}", spawn=spawn)
-            rr.log("/", rr.ViewCoordinates.RIGHT_HAND_Y_UP, static=True)
-            rr.send_blueprint(
-                rrb.Blueprint(
-                    rrb.Spatial3DView(
-                        name="",
-                        origin=f"/",
-                        eye_controls=rrb.archetypes.EyeControls3D(eye_up=[0, 1, 0]),  # Y-axis as up
-                    )
-                )
-            )
+            self.initialize_recording(name, notebook)
 
-        frame = 0
-        rr.set_time("stable_time", duration=self.t_span[frame])
-        self.timeless_components.to_rerun()
-        self.models.to_rerun(frame)
-        self.xp_data.to_rerun(frame)
+        with active_recording(self.recording):
+            frame = 0
+            rr.set_time("stable_time", duration=self.t_span[frame])
+            self.timeless_components.to_rerun()
+            self.models.to_rerun(frame)
+            self.xp_data.to_rerun(frame)
 
-        for frame, t in enumerate(self.t_span[1:]):
-            rr.set_time("stable_time", duration=t)
-            self.models.to_rerun(frame + 1)
-            self.xp_data.to_rerun(frame + 1)
+            for frame, t in enumerate(self.t_span[1:]):
+                rr.set_time("stable_time", duration=t)
+                self.models.to_rerun(frame + 1)
+                self.xp_data.to_rerun(frame + 1)
 
         if clear_last_node:
-            for component in [
-                *self.models.component_names,
-                *self.xp_data.component_names,
-                *self.timeless_components.component_names,
-            ]:
-                rr.log(component, rr.Clear(recursive=False))
+            self.clear_last_node()
 
     def rerun(
-        self, name: str = "animation_phase", init: bool = True, clear_last_node: bool = False, notebook: bool = False
+        self,
+        name: str = "animation_phase",
+        init: bool = True,
+        clear_last_node: bool = False,
+        notebook: bool = False,
+        position_tolerance: float = None,
+        angle_tolerance: float = None,
     ) -> None:
+        """
+        Send the whole phase to rerun as columns.
+
+        Parameters
+        ----------
+        name: str
+            The name of the recording.
+        init: bool
+            Whether to initialize a new recording.
+        clear_last_node: bool
+            Whether to clear the entities at the end of the phase.
+        notebook: bool
+            Whether the recording is displayed in a notebook.
+        position_tolerance: float
+            Lossy mode, the maximal error in meters on the displayed positions of the segments and markers.
+            Only the keyframes needed to stay within tolerance are sent, e.g. 1e-4 for oversampled simulations.
+            If None while angle_tolerance is given, angle_tolerance * 1 m.
+        angle_tolerance: float
+            Lossy mode, the maximal error in radians on the displayed orientations of the segments.
+            If None while position_tolerance is given, position_tolerance / 1 m, i.e. the points at 1 m of a segment
+            origin move by at most position_tolerance, e.g. 1e-4 rad for position_tolerance=1e-4.
+        """
+        tolerances = None
+        if position_tolerance is not None or angle_tolerance is not None:
+            tolerances = KeyframeTolerances(position=position_tolerance, angle=angle_tolerance)
+
         if init:
-            spawn = not notebook and os.environ.get("PYORERUN_HEADLESS", "0").lower() not in ("1", "true", "yes")
-            rr.init(f"{name}_{self.phase}", spawn=spawn)
-            rr.log("/", rr.ViewCoordinates.RIGHT_HAND_Y_UP, static=True)
-            rr.send_blueprint(
-                rrb.Blueprint(
-                    rrb.Spatial3DView(
-                        name="",
-                        origin=f"/",
-                        eye_controls=rrb.archetypes.EyeControls3D(eye_up=[0, 1, 0]),  # Y-axis as up
-                    )
-                )
-            )
+            self.initialize_recording(name, notebook)
 
-        frame = 0
-        rr.set_time("stable_time", duration=self.t_span[frame])
-        self.timeless_components.to_rerun()
-        self.models.initialize()
-        self.xp_data.initialize()
+        send_chunks(self.prepare_chunks(tolerances), self.t_span, self.recording)
 
-        times = [rr.TimeColumn("stable_time", duration=self.t_span)]
+        if clear_last_node:
+            self.clear_last_node()
 
-        for name, chunk in self.xp_data.to_chunk().items():
-            rr.send_columns(
-                name,
-                indexes=times,
-                columns=chunk,
-            )
+    async def rerun_async(
+        self,
+        name: str = "animation_phase",
+        init: bool = True,
+        clear_last_node: bool = False,
+        notebook: bool = False,
+        position_tolerance: float = None,
+        angle_tolerance: float = None,
+        executor: Executor = None,
+    ) -> None:
+        """
+        The awaitable rerun, e.g. within an async web service. The kinematics and the columns are computed
+        and sent in an executor, the event loop running between the sends of each entity.
+        Cancelling the task stops the sending before the next entity.
 
-        for name, chunk in self.models.to_chunk().items():
-            rr.send_columns(
-                name,
-                indexes=times,
-                columns=chunk,
-            )
+        Parameters
+        ----------
+        name: str
+            The name of the recording.
+        init: bool
+            Whether to initialize a new recording.
+        clear_last_node: bool
+            Whether to clear the entities at the end of the phase.
+        notebook: bool
+            Whether the recording is displayed in a notebook.
+        position_tolerance: float
+            Lossy mode, the maximal error in meters on the displayed positions of the segments and markers.
+            If None while angle_tolerance is given, angle_tolerance * 1 m.
+        angle_tolerance: float
+            Lossy mode, the maximal error in radians on the displayed orientations of the segments.
+            If None while position_tolerance is given, position_tolerance / 1 m.
+        executor: Executor
+            The executor computing and sending the columns, the default thread pool of the event loop if None.
+        """
+        tolerances = None
+        if position_tolerance is not None or angle_tolerance is not None:
+            tolerances = KeyframeTolerances(position=position_tolerance, angle=angle_tolerance)
+
+        if init:
+            await run_in_executor(self.initialize_recording, name, notebook, executor=executor)
+        chunks = await run_in_executor(self.prepare_chunks, tolerances, executor=executor)
+        await send_chunks_async(chunks, self.t_span, executor=executor, recording=self.recording)
 
         if clear_last_node:
-            rr.set_time("stable_time", duration=self.t_span[-1])
-            for component in [
-                *self.models.component_names,
-                *self.xp_data.component_names,
-                *self.timeless_components.component_names,
-            ]:
-                rr.log(component, rr.Clear(recursive=False))
+            await run_in_executor(self.clear_last_node, executor=executor)
+
+    def initialize_recording(self, name: str, notebook: bool = False) -> None:
+        """
+        Creates the global recording of the phase, spawning the viewer unless in a notebook or headless,
+        or sets up the recording given to the phase, whose sinks are left to the caller, e.g. recording.save(path).
+        """
+        if self.recording is None:
+            spawn = not notebook and os.environ.get("PYORERUN_HEADLESS", "0").lower() not in ("1", "true", "yes")
+            rr.init(f"{name}_{self.phase}", spawn=spawn)
+        rr.log("/", rr.ViewCoordinates.RIGHT_HAND_Y_UP, static=True, recording=self.recording)
+        rr.send_blueprint(
+            rrb.Blueprint(
+                rrb.Spatial3DView(
+                    name="",
+                    origin=f"/",
+                    eye_controls=rrb.archetypes.EyeControls3D(eye_up=[0, 1, 0]),  # Y-axis as up
+                )
+            ),
+            recording=self.recording,
+        )
+
+    def prepare_chunks(self, tolerances: KeyframeTolerances = None) -> dict[str, list]:
+        """
+        Logs the timeless components and the initial state of the phase,
+        and returns the columns of the experimental data and of the models, to be sent on the phase t_span.
+        """
+        with active_recording(self.recording):
+            rr.set_time("stable_time", duration=self.t_span[0])
+            self.timeless_components.to_rerun()
+            self.models.initialize()
+            self.xp_data.initialize()
+
+            return {**self.xp_data.to_chunk(tolerances=tolerances), **self.models.to_chunk(tolerances=tolerances)}
+
+    def clear_last_node(self) -> None:
+        """Clears the entities of the phase at its last frame, e.g. before the next phase."""
+        rr.set_time("stable_time", duration=self.t_span[-1], recording=self.recording)
+        for component in [
+            *self.models.component_names,
+            *self.xp_data.component_names,
+            *self.timeless_components.component_names,
+        ]:
+            rr.log(component, rr.Clear(recursive=False), recording=self.recording)
@@ -5,8 +5,11 @@ Custom PyoMuscles class to display muscle activation.
 from typing import Optional, List
 
 import numpy as np
-from matplotlib.cm import get_cmap
-from matplotlib.colors import ListedColormap
+
+from .utils.c3d_file import C3dPointsReader
+from .utils.colormaps import apply_lut, colormap_lut
+from .utils.emg import EmgEnvelopeStream, EmgProcessing, emg_envelope
+from .utils.resampling import resample
 
 
 class PyoMuscles:
@@ -20,7 +23,7 @@ class PyoMuscles:
         time: Optional[np.ndarray] = None,
         muscle_names: Optional[List[str]] = None,
         mvc: Optional[np.ndarray] = None,
-        colormap: Optional[ListedColormap] | str = get_cmap("magma"),
+        colormap: Optional[object | np.ndarray] | str = "magma",
         attrs: Optional[dict] = None,
     ):
         """
@@ -37,8 +40,9 @@ class PyoMuscles:
             Names/labels of the emg/muscles
         mvc : np.ndarray
             The maximal voluntary contraction values for each muscle. If None, the default is the maximal value across all frames for each muscle independently.
-        colormap: matplotlib.cm.get_cmap() instance, optional
-            The colormap to use when displaying the emg data. If None, the default is "magma".
+        colormap: str | matplotlib.colors.Colormap | np.ndarray, optional
+            The colormap to use when displaying the emg data, its name, a matplotlib colormap or its colors (n, 3)
+            in 0-255. If None, the default is "magma". It is sampled once into a 256-color lookup table.
         attrs : dict
             Metadata attributes (e.g., units)
         """
@@ -46,7 +50,8 @@ class PyoMuscles:
         self.time = self.initialize_time_vector(time)
         self.muscle_names = self.initialize_muscle_names(muscle_names)
         self.mvc = self.initialize_mvc(mvc)
-        self.colormap = self.initialize_colormap(colormap)
+        self.colormap = "magma" if colormap is None else colormap
+        self.lut = self.initialize_colormap(self.colormap)
         self.check_dimensions()
         self.attrs = attrs if attrs is not None else {}
 
@@ -96,14 +101,13 @@ class PyoMuscles:
         return mvc
 
     @staticmethod
-    def initialize_colormap(colormap: Optional[ListedColormap | str] = None) -> ListedColormap:
-        """Check that the colormap provided is correct"""
-        if colormap is not None:
-            if isinstance(colormap, str):
-                colormap = get_cmap(colormap)
-            if not isinstance(colormap, ListedColormap):
-                raise TypeError("colormap must be a matplotlib.cm.get_cmap instance or the name of the colormap (str).")
-        return colormap
+    def initialize_colormap(colormap: object | np.ndarray | str) -> np.ndarray:
+        """Check that the colormap provided is correct, and return its lookup table of packed RGBA uint32"""
+        if not isinstance(colormap, (str, np.ndarray, list)) and not callable(colormap):
+            raise TypeError(
+                "colormap must be a matplotlib colormap, the name of the colormap (str) or its colors (np.ndarray)."
+            )
+        return colormap_lut(colormap)
 
     def check_dimensions(self):
         """Validate that the dimensions match."""
@@ -139,15 +143,11 @@ class PyoMuscles:
 
     def to_numpy(self) -> np.ndarray:
         """Return the data as a numpy array and normalize by MVC."""
-        data = self.data.copy()
-        for i_muscle in range(self.data.shape[0]):
-            data[i_muscle, :] /= self.mvc[i_muscle]
-        return data
+        return self.data / self.mvc[:, np.newaxis]
 
     def to_colors(self) -> np.ndarray:
-        """Return a np.array of RGB values for each muscle."""
-        data = self.to_numpy()
-        return self.colormap(data)[:, :, :3]
+        """Return the packed RGBA uint32 color of each muscle at each frame (n_emg, n_frames), from the lookup table."""
+        return apply_lut(self.to_numpy(), self.lut)
 
     def __truediv__(self, other):
         """Support division for unit conversion."""
@@ -157,7 +157,7 @@ class PyoMuscles:
             time=self.time.copy(),
             muscle_names=self.muscle_names.copy(),
             mvc=self.mvc.copy(),
-            colormap=self.colormap.copy(),
+            colormap=self.colormap,
             attrs=self.attrs.copy(),
         )
 
@@ -167,5 +167,103 @@ class PyoMuscles:
         return self
 
     @classmethod
-    def from_c3d(cls, filename: str) -> "PyoMarkers":
-        raise NotImplementedError("Defining muscle activation from a c3d file is not implmented yet.")
+    def from_c3d(
+        cls,
+        filename: str,
+        channels: Optional[List[str]] = None,
+        muscle_names: Optional[List[str]] = None,
+        mvc: Optional[np.ndarray] = None,
+        processing: Optional[EmgProcessing] = None,
+        time: Optional[np.ndarray] = None,
+        block_size: Optional[int] = None,
+        colormap: Optional[object | np.ndarray] | str = "magma",
+    ) -> "PyoMuscles":
+        """
+        Create PyoMuscles from the raw EMG analog channels of a C3D file, processed into activation envelopes.
+
+        Parameters
+        ----------
+        filename : str
+            Path to the C3D file
+        channels : list of str, optional
+            The labels of the EMG analog channels, all the analog channels if None
+        muscle_names : list of str, optional
+            The names of the muscles of the channels, e.g. those of the model, the channel labels if None
+        mvc : np.ndarray, optional
+            The envelope at maximal voluntary contraction of each channel, their maximal envelope if None
+        processing : EmgProcessing, optional
+            The band-pass, rectification and envelope steps, the default EmgProcessing if None
+        time : np.ndarray, optional
+            The time base to resample the envelopes to, e.g. the time of the markers or of q from the first frame
+            of the file, the analog time if None
+        block_size : int, optional
+            If given, the EMG is read and processed by blocks of about this number of samples with causal filters,
+            so that the memory does not grow with the trial length, otherwise with zero-phase filters at once.
+
+        Returns
+        -------
+        PyoMuscles
+            A new PyoMuscles instance
+        """
+        reader = C3dPointsReader(filename)
+        channels = reader.analog_names if channels is None else list(channels)
+        rate = reader.analog_rate
+
+        if block_size is None:
+            envelopes = emg_envelope(reader.read_analogs(channels), rate, processing)
+            analog_time = np.arange(envelopes.shape[1]) / rate
+            envelopes = envelopes if time is None else resample(envelopes, analog_time, time)
+        else:
+            envelopes = cls._stream_envelopes(reader, channels, processing, time, block_size)
+
+        attrs = {
+            "units": "a.u.",
+            "rate": rate if time is None else None,
+            "filename": str(filename),
+            "channels": channels,
+        }
+        return cls(
+            data=envelopes,
+            time=np.arange(envelopes.shape[1]) / rate if time is None else np.asarray(time),
+            muscle_names=channels if muscle_names is None else muscle_names,
+            mvc=mvc,
+            colormap=colormap,
+            attrs=attrs,
+        )
+
+    @staticmethod
+    def _stream_envelopes(
+        reader: C3dPointsReader,
+        channels: List[str],
+        processing: Optional[EmgProcessing],
+        time: Optional[np.ndarray],
+        block_size: int,
+    ) -> np.ndarray:
+        """Processes the EMG by blocks of point frames, each block being resampled before the next one is read."""
+        rate = reader.analog_rate
+        samples_by_frame = reader.nb_analogs_by_frame // reader.nb_analog_channels
+        frames_by_block = max(1, block_size // samples_by_frame)
+        stream = EmgEnvelopeStream(len(channels), rate, processing)
+
+        blocks = []
+        previous_envelope, previous_time = np.zeros((len(channels), 0)), np.zeros(0)
+        target_index = 0
+        for start in range(0, reader.nb_frames, frames_by_block):
+            frames = slice(start, min(start + frames_by_block, reader.nb_frames))
+            envelope = stream.process(reader.read_analogs(channels, frames))
+            if time is None:
+                blocks.append(envelope)
+                continue
+
+            # the last sample of the previous block is kept to interpolate across the boundary between blocks
+            block_time = np.concatenate(
+                (previous_time, (start * samples_by_frame + np.arange(envelope.shape[1])) / rate)
+            )
+            envelope = np.concatenate((previous_envelope, envelope), axis=1)
+            is_last_block = frames.stop == reader.nb_frames
+            stop_index = time.shape[0] if is_last_block else np.searchsorted(time, block_time[-1], side="right")
+            blocks.append(resample(envelope, block_time, time[target_index:stop_index]))
+            target_index = stop_index
+            previous_envelope, previous_time = envelope[:, -1:], block_time[-1:]
+
+        return np.concatenate(blocks, axis=1)
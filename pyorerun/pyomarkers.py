@@ -2,12 +2,14 @@
 Custom PyoMarkers class to replace pyomeca dependency.
 """
 
+import warnings
 from typing import Optional, List
 
-import ezc3d
-from trc import TRCData
 import numpy as np
 
+from .utils.c3d_file import C3dFile, C3dPointsReader, c3d_frames_selection
+from .utils.trc_file import read_trc
+
 
 class PyoMarkers:
     """
@@ -18,9 +20,8 @@ class PyoMarkers:
 
     Attributes
     ----------
-    data : np.ndarray
-        The marker data with shape (4, n_markers, n_frames) where the 4th dimension
-        includes homogeneous coordinates (x, y, z, 1)
+    positions : np.ndarray
+        The marker positions with shape (3, n_markers, n_frames), a view of the given data whenever possible
     time : np.ndarray
         Time vector for each frame
     marker_names : list of str
@@ -39,6 +40,7 @@ class PyoMarkers:
         channels: Optional[List[str]] = None,  # Alternative name for marker_names for compatibility
         show_labels: bool = True,
         attrs: Optional[dict] = None,
+        dtype: np.dtype = None,
     ):
         """
         Initialize PyoMarkers instance.
@@ -57,42 +59,55 @@ class PyoMarkers:
             Whether to show marker labels
         attrs : dict, optional
             Metadata attributes
+        dtype : np.dtype, optional
+            The floating type of the positions, e.g. np.float32 to halve their memory.
+            If None, floating data keep their type and the other ones are converted to float64.
+
+        Notes
+        -----
+        The data are not copied when they already have the requested floating type, the positions being a view of them.
+        An in-place operation, such as a unit conversion, then replaces the positions instead of modifying the data.
+        The homogeneous row (w=1) is never stored, it is only built by to_numpy.
         """
         if data is None:
             raise ValueError("Data must be provided")
 
-        # Handle data shape - ensure we have 4D (homogeneous coordinates)
+        # Handle data shape - the homogeneous coordinates are only built on demand
+        given_data = data
+        data = np.asarray(data)
         if data.ndim != 3:
             raise ValueError("Data must be 3D array with shape (3 or 4, n_markers, n_frames)")
-
-        if data.shape[0] == 3:
-            # Add homogeneous coordinate (w=1)
-            ones = np.ones((1, data.shape[1], data.shape[2]))
-            self.data = np.vstack([data, ones])
-        elif data.shape[0] == 4:
-            self.data = data.copy()
-        else:
+        if data.shape[0] not in (3, 4):
             raise ValueError("First dimension must be 3 or 4 (x,y,z or x,y,z,w)")
 
+        if dtype is None:
+            dtype = data.dtype if np.issubdtype(data.dtype, np.floating) else np.float64
+        data = data.astype(dtype, copy=False)
+        self.positions = data[:3]
+        # the in-place operations copy the positions first, instead of writing into the data of the caller
+        self._shares_data = data is given_data
+        # the w row of 4D data is kept as a view, to give it back unchanged
+        self._homogeneous = data[3] if data.shape[0] == 4 else None
+
         # Set up time vector
         if time is None:
-            self.time = np.arange(self.data.shape[2], dtype=float)
+            self.time = np.arange(self.positions.shape[2], dtype=float)
         else:
-            self.time = np.array(time)
+            self.time = np.asarray(time)
 
         # Set up marker names - handle both marker_names and channels parameters
         if channels is not None:
             marker_names = channels  # Use channels if provided (for compatibility)
 
         if marker_names is None:
-            self.marker_names = [f"marker_{i}" for i in range(self.data.shape[1])]
+            self.marker_names = [f"marker_{i}" for i in range(self.positions.shape[1])]
         else:
             self.marker_names = list(marker_names)
 
         # Validate dimensions
-        if len(self.marker_names) != self.data.shape[1]:
+        if len(self.marker_names) != self.positions.shape[1]:
             raise ValueError("Number of marker names must match number of markers")
-        if len(self.time) != self.data.shape[2]:
+        if len(self.time) != self.positions.shape[2]:
             raise ValueError("Time vector length must match number of frames")
 
         # Set attributes
@@ -104,8 +119,31 @@ class PyoMarkers:
 
     @property
     def shape(self) -> tuple:
-        """Return the shape of the data."""
-        return self.data.shape
+        """Return the shape of the data, with its homogeneous row."""
+        return (4, *self.positions.shape[1:])
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Return the floating type of the positions."""
+        return self.positions.dtype
+
+    @property
+    def data(self) -> np.ndarray:
+        """
+        Deprecated, use positions or to_numpy() instead.
+
+        Return a read-only copy of the data with homogeneous coordinates (4, n_markers, n_frames), built on each call,
+        so that writing into it raises instead of being lost. The positions are the array to modify.
+        """
+        warnings.warn(
+            "PyoMarkers.data is deprecated and read-only, use PyoMarkers.positions to modify the markers, "
+            "or PyoMarkers.to_numpy() for the homogeneous coordinates.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        data = self.to_numpy()
+        data.flags.writeable = False
+        return data
 
     @property
     def units(self) -> str:
@@ -127,82 +165,216 @@ class PyoMarkers:
         """Return the index of the last frame."""
         return self.attrs.get("last_frame")
 
-    def to_numpy(self) -> np.ndarray:
-        """Return the data as a numpy array."""
-        return self.data.copy()
+    def to_numpy(self, homogeneous: bool = True) -> np.ndarray:
+        """
+        Return the data as a numpy array.
+
+        Parameters
+        ----------
+        homogeneous : bool, default True
+            If True, a new array (4, n_markers, n_frames) with the homogeneous row.
+            If False, the positions (3, n_markers, n_frames) themselves, without any copy.
+        """
+        if not homogeneous:
+            return self.positions
+        data = np.empty(self.shape, dtype=self.dtype)
+        data[:3] = self.positions
+        data[3] = 1 if self._homogeneous is None else self._homogeneous
+        return data
+
+    def reordered(self, marker_names: List[str]) -> "PyoMarkers":
+        """
+        Return the markers in another order, or a subset of them.
+
+        Parameters
+        ----------
+        marker_names : list of str
+            The names of the markers to keep, in their new order
+
+        Returns
+        -------
+        PyoMarkers
+            The same markers when the order is unchanged, otherwise new markers sharing the time,
+            with a copy of the attributes, their positions being gathered once with an index array.
+        """
+        missing = [name for name in marker_names if name not in self.marker_names]
+        if missing:
+            raise ValueError(f"The markers {missing} are not in {self.marker_names}.")
+        if list(marker_names) == self.marker_names:
+            return self
+
+        indices = np.array([self.marker_names.index(name) for name in marker_names], dtype=int)
+        reordered = PyoMarkers(
+            data=np.take(self.positions, indices, axis=1),
+            time=self.time,
+            marker_names=marker_names,
+            show_labels=self.show_labels,
+            attrs=dict(self.attrs),
+        )
+        reordered._shares_data = False
+        if self._homogeneous is not None:
+            reordered._homogeneous = np.take(self._homogeneous, indices, axis=0)
+        return reordered
 
     def __truediv__(self, other):
         """Support division for unit conversion."""
-        new_data = self.data / other
-        return PyoMarkers(
-            data=new_data,
+        divided = PyoMarkers(
+            data=self.positions / other,
             time=self.time.copy(),
             marker_names=self.marker_names.copy(),
             show_labels=self.show_labels,
             attrs=self.attrs.copy(),
         )
+        divided._shares_data = False
+        return divided
 
     def __itruediv__(self, other):
         """Support in-place division for unit conversion."""
-        self.data /= other
+        if self._shares_data:
+            self.positions = self.positions / other
+            self._shares_data = False
+        else:
+            self.positions /= other
         return self
 
     @classmethod
     def from_c3d(
-        cls, filename: str, prefix_delimiter: str = ":", suffix_delimiter: str = None, show_labels: bool = True
+        cls,
+        filename: "str | C3dFile",
+        prefix_delimiter: str = ":",
+        suffix_delimiter: str = None,
+        show_labels: bool = True,
+        marker_names: list[str] = None,
+        frame_range: tuple[int, int] = None,
+        time_range: tuple[float, float] = None,
+        dtype: np.dtype = None,
     ) -> "PyoMarkers":
         """
         Create PyoMarkers from a C3D file.
 
         Parameters
         ----------
-        filename : str
-            Path to the C3D file
+        filename : str | C3dFile
+            Path to the C3D file, or an already parsed C3dFile to avoid reading it again
         prefix_delimiter : str, default ":"
             Delimiter for prefix in marker names
         suffix_delimiter : str, optional
             Delimiter for suffix in marker names
         show_labels : bool, default True
             Whether to show marker labels
+        marker_names : list of str, optional
+            The markers to load, all of them if None
+        frame_range : tuple of int, optional
+            The frames to load as (start, stop), stop excluded, counted from the first frame of the file
+        time_range : tuple of float, optional
+            The time window to load as (start, end) in seconds from the first frame of the file,
+            it can not be combined with frame_range
+        dtype : np.dtype, optional
+            The floating type of the positions, e.g. np.float32 to halve their memory
 
         Returns
         -------
         PyoMarkers
             A new PyoMarkers instance
+
+        Notes
+        -----
+        When a selection is given with a path, only the selected points are read from the disk,
+        without decoding the rest of the file.
         """
-        c3d = ezc3d.c3d(filename)
+        selection = marker_names is not None or frame_range is not None or time_range is not None
+        if selection and not isinstance(filename, C3dFile):
+            return cls._from_c3d_selection(filename, show_labels, marker_names, frame_range, time_range, dtype)
+
+        is_parsed = isinstance(filename, C3dFile)
+        c3d = filename if is_parsed else C3dFile(filename)
 
         # Get marker data
         points = c3d["data"]["points"]  # Shape: (4, n_markers, n_frames)
 
         # Get marker names
-        marker_names = c3d["parameters"]["POINT"]["LABELS"]["value"]
+        all_marker_names = c3d["parameters"]["POINT"]["LABELS"]["value"]
 
         # Clean up marker names (remove empty strings and strip whitespace)
-        marker_names = [name.strip() for name in marker_names if name.strip()]
+        all_marker_names = [name.strip() for name in all_marker_names if name.strip()]
 
         # Get time vector
         point_rate = c3d["parameters"]["POINT"]["RATE"]["value"][0]
+        frames = c3d_frames_selection(points.shape[2], point_rate, frame_range, time_range)
+        first_frame = frames.indices(points.shape[2])[0]
+        points = points[:, :, frames]
         n_frames = points.shape[2]
-        time = np.arange(n_frames) / point_rate
+        time = (first_frame + np.arange(n_frames)) / point_rate
+
+        if marker_names is not None:
+            missing = [name for name in marker_names if name not in all_marker_names]
+            if missing:
+                raise ValueError(f"The markers {missing} are not in {c3d.path}.")
+            points = points[:, [all_marker_names.index(name) for name in marker_names], :]
+        else:
+            marker_names = all_marker_names
 
         # Get units
         units = "mm"  # Default C3D unit
-        if "UNITS" in c3d["parameters"]["POINT"]:
+        if "UNITS" in c3d["parameters"]["POINT"] and len(c3d["parameters"]["POINT"]["UNITS"]["value"]):
             units = c3d["parameters"]["POINT"]["UNITS"]["value"][0].strip()
 
         attrs = {
             "units": units,
             "rate": point_rate,
-            "filename": filename,
-            "first_frame": c3d.c3d_swig.header().firstFrame(),
-            "last_frame": c3d.c3d_swig.header().lastFrame(),
+            # the argument as given, e.g. an ezc3d.c3d without path, the path of a C3dFile otherwise
+            "filename": c3d.path if is_parsed else filename,
+            "first_frame": c3d.first_frame + first_frame,
+            "last_frame": c3d.first_frame + first_frame + n_frames - 1,
+        }
+
+        markers = cls(
+            data=points, time=time, marker_names=marker_names, show_labels=show_labels, attrs=attrs, dtype=dtype
+        )
+        # the points of a C3dFile given by the caller are not modified in place
+        markers._shares_data = markers._shares_data and is_parsed
+        return markers
+
+    @classmethod
+    def _from_c3d_selection(
+        cls,
+        filename: str,
+        show_labels: bool,
+        marker_names: list[str] = None,
+        frame_range: tuple[int, int] = None,
+        time_range: tuple[float, float] = None,
+        dtype: np.dtype = None,
+    ) -> "PyoMarkers":
+        """Read only the selected markers and frames of the point block of a C3D file."""
+        reader = C3dPointsReader(filename)
+        frames = c3d_frames_selection(reader.nb_frames, reader.rate, frame_range, time_range)
+        first_frame = frames.indices(reader.nb_frames)[0]
+        points = reader.read_points(marker_names, frames)
+        n_frames = points.shape[2]
+
+        attrs = {
+            "units": reader.units,
+            "rate": reader.rate,
+            "filename": reader.path,
+            "first_frame": reader.first_frame + first_frame,
+            "last_frame": reader.first_frame + first_frame + n_frames - 1,
         }
 
-        return cls(data=points, time=time, marker_names=marker_names, show_labels=show_labels, attrs=attrs)
+        markers = cls(
+            data=points,
+            time=(first_frame + np.arange(n_frames)) / reader.rate,
+            marker_names=reader.marker_names if marker_names is None else marker_names,
+            show_labels=show_labels,
+            attrs=attrs,
+            dtype=dtype,
+        )
+        markers._shares_data = False
+        return markers
 
     @classmethod
-    def from_trc(cls, filename: str, show_labels: bool = True) -> "PyoMarkers":
+    def from_trc(
+        cls, filename: str, show_labels: bool = True, frame_range: tuple[int, int] = None, dtype: np.dtype = None
+    ) -> "PyoMarkers":
         """
         Create PyoMarkers from a TRC file.
 
@@ -212,46 +384,37 @@ class PyoMarkers:
             Path to the TRC file
         show_labels : bool, default True
             Whether to show marker labels
+        frame_range : tuple of int, optional
+            The rows to load as (start, stop), stop excluded, all of them if None
+        dtype : np.dtype, optional
+            The floating type of the positions, e.g. np.float32 to halve their memory
 
         Returns
         -------
         PyoMarkers
             A new PyoMarkers instance
         """
-        trc_data = TRCData()
-        trc_data.load(filename)
-
-        # Get marker names
-        marker_names = trc_data["Markers"]
-        n_markers = len(marker_names)
-        n_frames = int(trc_data["NumFrames"])
-
-        # Initialize data array (3, n_markers, n_frames)
-        data = np.zeros((3, n_markers, n_frames))
-
-        # Fill data array with marker coordinates
-        for frame_idx, frame_num in enumerate(trc_data["Frame#"]):
-            _, frame_data = trc_data[frame_num]
-            for marker_idx, marker_coords in enumerate(frame_data):
-                # marker_coords is [X, Y, Z]
-                data[:, marker_idx, frame_idx] = marker_coords
-
-        # Get time vector
-        time = np.array(trc_data["Time"])
-
-        # Get units and rate
-        units = trc_data.get("Units", "mm")
-        rate = trc_data.get("DataRate", None)
+        trc_data = read_trc(filename, frame_range=frame_range)
+        frames = trc_data["frames"]
 
         attrs = {
-            "units": units,
-            "rate": rate,
+            "units": trc_data["units"],
+            "rate": trc_data["rate"],
             "filename": filename,
-            "first_frame": trc_data["Frame#"][0] if trc_data["Frame#"] else 0,
-            "last_frame": trc_data["Frame#"][-1] if trc_data["Frame#"] else n_frames - 1,
+            "first_frame": int(frames[0]) if frames.size else 0,
+            "last_frame": int(frames[-1]) if frames.size else 0,
         }
 
-        return cls(data=data, time=time, marker_names=marker_names, show_labels=show_labels, attrs=attrs)
+        markers = cls(
+            data=trc_data["markers"],
+            time=trc_data["time"],
+            marker_names=trc_data["marker_names"],
+            show_labels=show_labels,
+            attrs=attrs,
+            dtype=dtype,
+        )
+        markers._shares_data = False
+        return markers
 
 
 class MockChannel:
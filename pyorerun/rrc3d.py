@@ -1,14 +1,20 @@
+import warnings
+from concurrent.futures import Executor
 from pathlib import Path
 from typing import Any
 
 import ezc3d
-import imageio
 import numpy as np
 import rerun as rr
 
 from .multi_frame_rate_phase_rerun import MultiFrameRatePhaseRerun
 from .phase_rerun import PhaseRerun
 from .pyomarkers import PyoMarkers
+from .utils.async_utils import run_in_executor
+from .utils.c3d_file import C3dFile
+from .utils.recording import active_recording
+from .utils.resampling import resample
+from .xp_components import VideoFile
 
 
 def rrc3d(
@@ -19,10 +25,17 @@ def rrc3d(
     show_events: bool = True,
     show_marker_labels: bool = True,
     down_sampled_forces: bool = False,
+    force_resampling: str = "interpolate",
     video: str | tuple[str, ...] = None,
     video_crop_mode: str = "from_c3d",
+    video_mode: str = "auto",
+    video_frame_rate: float = None,
+    video_max_resolution: tuple[int, int] = None,
     marker_trajectories: bool = False,
     notebook: bool = False,
+    marker_names: list[str] = None,
+    time_range: tuple[float, float] = None,
+    recording: rr.RecordingStream = None,
 ) -> None:
     """
     Display a c3d file in rerun.
@@ -44,19 +57,124 @@ def rrc3d(
     down_sampled_forces: bool
         If True, down sample the force data to align with the marker data.
         If False, the force data will be displayed at their original frame rate, It may get slower when loading the data.
+    force_resampling: str
+        How the force data are down sampled, "interpolate" for a linear interpolation at the marker frames,
+        "peak" to keep the largest force around each marker frame so that impact peaks are not missed.
     video: str or tuple
         If str, the path to the video to display.
         If tuple, the first element is the path to the video and the second element is the path to the time data of the video.
     video_crop_mode: str
         The mode to crop the video. If 'from_c3d', the video will be cropped to the same time span as the c3d file.
+    video_mode: str
+        How the video is streamed, "asset" to log the encoded file (mp4), "decode" to decode and send its frames by
+        windows, "auto" to log the encoded file when rerun supports its format. The video is never loaded in memory.
+    video_frame_rate: float
+        The frame rate to resample the video to, e.g. the marker rate for a review, its own frame rate if None.
+    video_max_resolution: tuple[int, int]
+        The maximal (width, height) of the video, downscaled while decoding, its own resolution if None.
     marker_trajectories: bool
         If True, show the marker trajectories.
     notebook: bool
         If True, display the animation in the notebook.
+    marker_names: list[str]
+        The markers to display, all of them if None.
+    time_range: tuple[float, float]
+        The time window to display as (start, end) in seconds from the first frame of the file, all of it if None.
+        The forces are cropped to the same window.
+    recording: rr.RecordingStream
+        The recording to send the file to, e.g. to export several files at once in threads,
+        the global recording of rr.init by default.
     """
 
-    # Load a c3d file
-    pyomarkers = PyoMarkers.from_c3d(c3d_file, show_labels=show_marker_labels)
+    c3d, phase_rerun, multi_phase_rerun = c3d_phases(
+        c3d_file,
+        show_floor=show_floor,
+        show_force_plates=show_force_plates,
+        show_forces=show_forces,
+        show_events=show_events,
+        show_marker_labels=show_marker_labels,
+        down_sampled_forces=down_sampled_forces,
+        force_resampling=force_resampling,
+        video=video,
+        video_crop_mode=video_crop_mode,
+        video_mode=video_mode,
+        video_frame_rate=video_frame_rate,
+        video_max_resolution=video_max_resolution,
+        marker_names=marker_names,
+        time_range=time_range,
+        recording=recording,
+    )
+    multi_phase_rerun.rerun(Path(c3d_file).name, notebook=notebook)
+    log_c3d_annotations(c3d, phase_rerun, show_events, marker_trajectories)
+
+
+async def rrc3d_async(
+    c3d_file: str,
+    notebook: bool = False,
+    show_events: bool = True,
+    marker_trajectories: bool = False,
+    executor: Executor = None,
+    **kwargs,
+) -> None:
+    """
+    The awaitable rrc3d, e.g. within an async web service. The c3d file is parsed, and the columns are computed and
+    sent, in an executor, the event loop running between the sends of each entity. Cancelling the task stops the
+    sending before the next entity.
+
+    Parameters
+    ----------
+    c3d_file: str
+        The c3d file to display.
+    notebook: bool
+        If True, display the animation in the notebook.
+    show_events: bool
+        If True, show the events, as log entries.
+    marker_trajectories: bool
+        If True, show the marker trajectories.
+    executor: Executor
+        The executor parsing the file and sending the columns, the default thread pool of the event loop if None.
+    kwargs
+        The other options of rrc3d.
+    """
+    c3d, phase_rerun, multi_phase_rerun = await run_in_executor(
+        c3d_phases, c3d_file, show_events=show_events, executor=executor, **kwargs
+    )
+    await multi_phase_rerun.rerun_async(Path(c3d_file).name, notebook=notebook, executor=executor)
+    await run_in_executor(log_c3d_annotations, c3d, phase_rerun, show_events, marker_trajectories, executor=executor)
+
+
+def c3d_phases(
+    c3d_file: str,
+    show_floor: bool = True,
+    show_force_plates: bool = True,
+    show_forces: bool = True,
+    show_events: bool = True,
+    show_marker_labels: bool = True,
+    down_sampled_forces: bool = False,
+    force_resampling: str = "interpolate",
+    video: str | tuple[str, ...] = None,
+    video_crop_mode: str = "from_c3d",
+    video_mode: str = "auto",
+    video_frame_rate: float = None,
+    video_max_resolution: tuple[int, int] = None,
+    marker_names: list[str] = None,
+    time_range: tuple[float, float] = None,
+    recording: rr.RecordingStream = None,
+) -> tuple[C3dFile | str, PhaseRerun, MultiFrameRatePhaseRerun]:
+    """
+    Builds the phases of a c3d file displayed by rrc3d, with its options, without sending anything to rerun.
+
+    Returns
+    -------
+    tuple[C3dFile | str, PhaseRerun, MultiFrameRatePhaseRerun]
+        The parsed c3d file, the phase of the markers, and all the phases at their own frame rates.
+    """
+    # Load a c3d file, parsed once and shared by all the helpers below.
+    # Without forces, force plates and events, only the selected points are read from the file.
+    c3d = C3dFile(c3d_file) if show_forces or show_force_plates or show_events else c3d_file
+    pyomarkers = PyoMarkers.from_c3d(
+        c3d, show_labels=show_marker_labels, marker_names=marker_names, time_range=time_range
+    )
     units = pyomarkers.units
     pyomarkers = adjust_position_unit_to_meters(pyomarkers, pyomarkers.units)
     pyomarkers.show_labels = False
@@ -65,30 +183,36 @@ def rrc3d(
     filename = Path(c3d_file).name
 
     phase_reruns = []
-    phase_rerun = PhaseRerun(t_span)
+    phase_rerun = PhaseRerun(t_span, recording=recording)
     phase_reruns.append(phase_rerun)
     phase_rerun.add_xp_markers(filename, pyomarkers)
 
     if show_force_plates:
-        force_plates_corners = get_force_plates(c3d_file, units=units)
+        force_plates_corners = get_force_plates(c3d, units=units)
 
         for i, corners in enumerate(force_plates_corners):
             phase_rerun.add_force_plate(f"force_plate_{i}", corners["corners"])
 
     if show_forces:
-        force_data = get_force_vector(c3d_file)
+        force_data = get_force_vector(c3d)
         if len(force_data) == 0:
             raise RuntimeError("No force data found in the c3d file. Set show_forces to False.")
+        if time_range is not None:
+            force_data = crop_force_vector(force_data, t_span[0], t_span[-1] + 1 / pyomarkers.rate)
         if down_sampled_forces:
             for i, force in enumerate(force_data):
-                force["center_of_pressure"], force["force"] = down_sample_force(force, t_span, units)
+                force["center_of_pressure"], force["force"] = down_sample_force(
+                    force, t_span, units, mode=force_resampling
+                )
                 phase_rerun.add_force_data(
                     num=i,
                     force_origin=force["center_of_pressure"],
                     force_vector=force["force"],
                 )
         else:
-            phase_rerun_plateform = PhaseRerun(force_data[0]["time"])  # assuming the same time for all force data
+            phase_rerun_plateform = PhaseRerun(
+                force_data[0]["time"], recording=recording
+            )  # assuming the same time for all force data
             for i, force in enumerate(force_data):
                 phase_rerun_plateform.add_force_data(
                     num=i,
@@ -100,50 +224,61 @@ def rrc3d(
 
     if show_floor:
         square_width = max_xy_coordinate_span_by_markers(pyomarkers)
-        lowest_corner = 0 if not show_force_plates else get_lowest_corner(c3d_file, units=units)
+        lowest_corner = 0 if not show_force_plates else get_lowest_corner(c3d, units=units)
         phase_rerun.add_floor(square_width, height_offset=lowest_corner - 0.0005)
 
     if video is not None:
         for i, vid in enumerate(video if isinstance(video, tuple) else [video]):
-            vid_name = Path(vid).name
-            vid, time = load_a_video(vid)
-            vid, time = crop_video(
-                vid,
-                time,
+            video_file = VideoFile(name=Path(vid).name, path=vid, mode=video_mode, max_resolution=video_max_resolution)
+            # the frames are selected from their timestamps, the discarded ones are never decoded
+            frames, time = video_frames_selection(
+                video_file.frame_times,
                 video_crop_mode,
                 first_frame_in_sec=pyomarkers.first_frame / pyomarkers.rate,
                 last_frame_in_sec=pyomarkers.last_frame / pyomarkers.rate,
+                # the markers of a time_range or frame_range do not start at 0 s
+                start_time=t_span[0],
             )
+            video_file.select(frames)
+            time_offset = video_file.frame_times[0] - time[0]
+            if video_frame_rate is not None:
+                video_file.resample(video_frame_rate)
 
-            phase_reruns.append(PhaseRerun(time))
-            phase_reruns[-1].add_video(vid_name, np.array(vid, dtype=np.uint8))
+            phase_reruns.append(PhaseRerun(video_file.frame_times - time_offset, recording=recording))
+            phase_reruns[-1].add_video(Path(vid).name, video_file)
 
-    multi_phase_rerun = MultiFrameRatePhaseRerun(phase_reruns)
-    multi_phase_rerun.rerun(filename, notebook=notebook)
+    return c3d, phase_rerun, MultiFrameRatePhaseRerun(phase_reruns, recording=recording)
 
-    if show_events:
-        try:
-            set_event_as_log(c3d_file)
-        except:
-            raise NotImplementedError(
-                "The events feature is still experimental and may not work properly. " "Set show_events=False."
-            )
 
-    if marker_trajectories:
-        # # todo: find a better way to display curves but hacky way ok for now
-        marker_names = phase_rerun.xp_data.xp_data[0].marker_names
-        for m in marker_names:
-            for j, axis in enumerate(["X", "Y", "Z"]):
-                rr.send_columns(
-                    f"markers_graphs/{m}/{axis}",
-                    indexes=[rr.TimeColumn("stable_time", duration=t_span)],
-                    columns=[
-                        *rr.Scalars.columns(
-                            scalars=phase_rerun.xp_data.xp_data[0].markers_numpy[j, marker_names.index(m), :]
-                        )
-                    ],
+def log_c3d_annotations(
+    c3d: C3dFile | str, phase_rerun: PhaseRerun, show_events: bool = True, marker_trajectories: bool = False
+) -> None:
+    """Logs the events of the c3d file and the charts of the marker trajectories, after its phases."""
+    t_span = phase_rerun.t_span
+    with active_recording(phase_rerun.recording):
+        if show_events:
+            try:
+                set_event_as_log(c3d)
+            except:
+                raise NotImplementedError(
+                    "The events feature is still experimental and may not work properly. " "Set show_events=False."
                 )
 
+        if marker_trajectories:
+            # # todo: find a better way to display curves but hacky way ok for now
+            marker_names = phase_rerun.xp_data.xp_data[0].marker_names
+            for m in marker_names:
+                for j, axis in enumerate(["X", "Y", "Z"]):
+                    rr.send_columns(
+                        f"markers_graphs/{m}/{axis}",
+                        indexes=[rr.TimeColumn("stable_time", duration=t_span)],
+                        columns=[
+                            *rr.Scalars.columns(
+                                scalars=phase_rerun.xp_data.xp_data[0].markers_numpy[j, marker_names.index(m), :]
+                            )
+                        ],
+                    )
+
 
 def set_event_as_log(c3d_file: str) -> None:
     c3d_file = c3d_file_format(c3d_file)
@@ -164,20 +299,20 @@ def set_event_as_log(c3d_file: str) -> None:
 
 def max_xy_coordinate_span_by_markers(pyomarkers: PyoMarkers) -> float:
     """Return the max span of the x and y coordinates of the markers."""
-    min_pyomarkers = np.nanmin(np.nanmin(pyomarkers.to_numpy(), axis=2), axis=1)
-    max_pyomarkers = np.nanmax(np.nanmax(pyomarkers.to_numpy(), axis=2), axis=1)
+    min_pyomarkers = np.nanmin(np.nanmin(pyomarkers.to_numpy(homogeneous=False), axis=2), axis=1)
+    max_pyomarkers = np.nanmax(np.nanmax(pyomarkers.to_numpy(homogeneous=False), axis=2), axis=1)
     x_absolute_max = np.nanmax(np.abs([min_pyomarkers[0], max_pyomarkers[0]]))
     y_absolute_max = np.nanmax(np.abs([min_pyomarkers[1], max_pyomarkers[1]]))
 
     return np.max([x_absolute_max, y_absolute_max])
 
 
-def c3d_file_format(cd3_file) -> ezc3d.c3d:
-    """Return the c3d file in the format of ezc3d.c3d if it is a string path."""
-    if isinstance(cd3_file, str):
-        return ezc3d.c3d(cd3_file, extract_forceplat_data=True)
+def c3d_file_format(cd3_file: str | ezc3d.c3d | C3dFile) -> C3dFile:
+    """Return the c3d file as a C3dFile, parsing it only if it is a path."""
+    if isinstance(cd3_file, C3dFile):
+        return cd3_file
 
-    return cd3_file
+    return C3dFile(cd3_file)
 
 
 def adjust_pyomarkers_unit_to_meters(pyomarkers: PyoMarkers, unit: str) -> PyoMarkers:
@@ -232,7 +367,7 @@ def get_lowest_corner(c3d_file, units) -> float:
 
 def get_force_vector(c3d_file) -> list[dict[str, np.ndarray]]:
     c3d_file = c3d_file_format(c3d_file)
-    plateforms = c3d_file["data"]["platform"]
+    plateforms = c3d_file.platforms
 
     frame_rate = c3d_file["header"]["analogs"]["frame_rate"]
     first_frame = c3d_file["header"]["analogs"]["first_frame"]
@@ -252,37 +387,76 @@ def get_force_vector(c3d_file) -> list[dict[str, np.ndarray]]:
     return plateforms_dict
 
 
-def down_sample_force(plateform, t_span, units) -> tuple[np.ndarray, np.ndarray]:
-    ratio = plateform["force"].shape[1] / t_span.shape[0]
-    ratio_is_a_integer = ratio.is_integer()
-
-    if not ratio_is_a_integer:
-        raise NotImplementedError(
-            "Set down_sampled_forces to False."
-            "The ratio between the force data and the marker data is not an integer."
-            "Interpolation is not implemented yet."
+def crop_force_vector(plateforms: list[dict[str, np.ndarray]], t_start: float, t_end: float) -> list[dict]:
+    """Keep the force data in [t_start, t_end), to match a time window of the markers."""
+    cropped_plateforms = []
+    for plateform in plateforms:
+        in_window = (plateform["time"] >= t_start - 1e-9) & (plateform["time"] < t_end - 1e-9)
+        cropped_plateforms.append(
+            {
+                key: value[..., in_window] if key in ("force", "moment", "center_of_pressure", "Tz", "time") else value
+                for key, value in plateform.items()
+            }
         )
+    return cropped_plateforms
+
 
-    down_sampled_slice = slice(0, plateform["center_of_pressure"].shape[1], int(ratio))
-    down_sampled_center_of_pressure = adjust_position_unit_to_meters(
-        plateform["center_of_pressure"][:, down_sampled_slice], unit=units
+def down_sample_force(plateform, t_span, units, mode: str = "interpolate") -> tuple[np.ndarray, np.ndarray]:
+    """
+    Resamples the center of pressure and the force of a platform to the marker time span, whatever the ratio
+    between the analog and the marker rates.
+
+    Parameters
+    ----------
+    plateform: dict
+        The platform data, with its "time" if known, otherwise the samples are assumed to cover t_span evenly.
+    t_span: np.ndarray
+        The time of the markers.
+    units: str
+        The units of the center of pressure.
+    mode: str
+        "interpolate" or "peak", to keep the largest force around each marker frame, e.g. the impact peaks.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The center of pressure in meters and the force, (3, n_frames).
+    """
+    nb_samples = plateform["force"].shape[1]
+    if "time" in plateform:
+        time = plateform["time"]
+    else:
+        ratio = nb_samples / t_span.shape[0]
+        marker_period = t_span[1] - t_span[0] if t_span.shape[0] > 1 else 1
+        time = t_span[0] + np.arange(nb_samples) * marker_period / ratio
+
+    force = resample(plateform["force"], time, t_span, mode=mode)
+    center_of_pressure = resample(
+        plateform["center_of_pressure"],
+        time,
+        t_span,
+        mode=mode,
+        peak_magnitude=np.linalg.norm(plateform["force"], axis=0),
     )
 
-    return down_sampled_center_of_pressure, plateform["force"][:, down_sampled_slice]
+    return adjust_position_unit_to_meters(center_of_pressure, unit=units), force
 
 
 def load_a_video(video_path: str) -> tuple[np.ndarray, np.ndarray]:
-    """Load a video from a path."""
-    # Load the video
-    video_reader = imageio.get_reader(video_path, "ffmpeg")
-
-    # Extract frames and convert to numpy ndarray
-    frames = []
-    for frame in video_reader:
-        frames.append(frame)
+    """
+    Deprecated, use VideoFile instead, which decodes the displayed frames by windows instead of all at once.
 
-    frame_rate = video_reader.get_meta_data()["fps"]
-    time = np.linspace(0, len(frames) / frame_rate, len(frames))
+    Load a video from a path, every frame being decoded in memory.
+    """
+    warnings.warn(
+        "load_a_video is deprecated, use pyorerun.xp_components.VideoFile to stream the video from its file.",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    video_file = VideoFile(name=Path(video_path).name, path=video_path, mode="decode")
+    frames = [frame for frame in video_file.reader]
+    video_file.reader.close()
+    time = np.linspace(0, len(frames) / video_file.fps, len(frames))
 
     return np.array(frames, dtype=np.uint16), time
 
@@ -290,15 +464,47 @@ def load_a_video(video_path: str) -> tuple[np.ndarray, np.ndarray]:
 def crop_video(
     video: np.ndarray, time, video_crop_mode: str, first_frame_in_sec: float, last_frame_in_sec: float
 ) -> tuple[np.ndarray, np.ndarray]:
+    """Crop the frames of a decoded video (nb_frames, height, width, nb_components) to the c3d file."""
+    frames, time = video_frames_selection(time, video_crop_mode, first_frame_in_sec, last_frame_in_sec)
+    return video[frames], time
+
+
+def video_frames_selection(
+    time: np.ndarray,
+    video_crop_mode: str,
+    first_frame_in_sec: float,
+    last_frame_in_sec: float,
+    start_time: float = 0.0,
+) -> tuple[slice, np.ndarray]:
+    """
+    The frames of a video to display, from the time of its frames, before any of them is decoded.
 
+    Parameters
+    ----------
+    time: np.ndarray
+        The time of the frames of the video, from the beginning of the video file.
+    video_crop_mode: str
+        "from_c3d" to keep the frames recorded with the displayed frames of the c3d file, None if already cropped.
+    first_frame_in_sec: float
+        The time of the first displayed frame of the c3d file, from the beginning of the recording.
+    last_frame_in_sec: float
+        The time of the last displayed frame of the c3d file, from the beginning of the recording.
+    start_time: float
+        The time of the first displayed frame in the time span of the c3d file,
+        i.e. the beginning of the selected time_range or frame_range.
+
+    Returns
+    -------
+    tuple[slice, np.ndarray]
+        The frames to display, and their time in the time span of the c3d file.
+    """
     if video_crop_mode == "from_c3d":
         closest_time = lambda t: np.argmin(np.abs(t - time))
         first_frame = closest_time(first_frame_in_sec)
         last_frame = closest_time(last_frame_in_sec)
-        time = time[first_frame : last_frame + 1] - first_frame_in_sec
-        video = video[first_frame : last_frame + 1, :, :, :]
+        time = time[first_frame : last_frame + 1] - first_frame_in_sec + start_time
 
-        return video, time
+        return slice(first_frame, last_frame + 1), time
 
     elif video_crop_mode is not None:
         raise NotImplementedError(
@@ -306,4 +512,4 @@ def crop_video(
             "Please use video_crop_mode='from_c3d' or None if already cropped."
         )
 
-    return video, time
+    return slice(None), time
@@ -0,0 +1,54 @@
+import asyncio
+from collections.abc import Iterator
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Callable
+
+import numpy as np
+import rerun as rr
+
+from .keyframes import KeyframeColumns, flush, send_chunks
+
+
+async def run_in_executor(function: Callable, *args, executor: Executor = None, **kwargs) -> Any:
+    """
+    Runs a blocking function in an executor, the default thread pool of the event loop if None,
+    so that the event loop keeps running, e.g. to serve other requests while the kinematics are computed.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(function, *args, **kwargs))
+
+
+async def send_chunks_async(
+    chunks: dict[str, list | KeyframeColumns | Iterator[KeyframeColumns]],
+    t_span: np.ndarray,
+    executor: Executor = None,
+    recording: rr.RecordingStream = None,
+) -> None:
+    """
+    The awaitable send_chunks, which sends each entity, and each window of an iterator of keyframes, in the executor.
+    The event loop runs between the sends, and a cancellation stops the sending before the next one.
+
+    Parameters
+    ----------
+    chunks: dict[str, list | KeyframeColumns | Iterator[KeyframeColumns]]
+        The columns of each entity, either for every frame of t_span or only for some keyframes.
+    t_span: np.ndarray
+        The time instant of each frame.
+    executor: Executor
+        The executor computing and sending the columns, the default one of the event loop if None.
+    recording: rr.RecordingStream
+        The recording to send to, the global one if None, the threads of the executor having no recording of their own.
+    """
+    for name, chunk in chunks.items():
+        if not isinstance(chunk, Iterator):
+            await run_in_executor(send_chunks, {name: chunk}, t_span, recording, executor=executor)
+            continue
+
+        while True:
+            # the windows are produced in the executor too, e.g. decoding the frames of a video
+            keyframes = await run_in_executor(next, chunk, None, executor=executor)
+            if keyframes is None:
+                break
+            await run_in_executor(send_chunks, {name: keyframes}, t_span, recording, executor=executor)
+            await run_in_executor(flush, recording, executor=executor)
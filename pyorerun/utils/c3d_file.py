@@ -0,0 +1,373 @@
+from functools import cached_property
+
+import numpy as np
+
+
+class C3dFile:
+    """
+    A c3d file parsed once, to be shared between PyoMarkers and the rrc3d helpers.
+    The force platforms are only extracted the first time they are requested.
+
+    Attributes
+    ----------
+    path : str
+        The path to the c3d file, None if built from an already loaded ezc3d.c3d
+    c3d : ezc3d.c3d
+        The parsed c3d file
+    """
+
+    def __init__(self, c3d_file: "str | ezc3d.c3d", extract_forceplat_data: bool = False):
+        """
+        Parameters
+        ----------
+        c3d_file : str | ezc3d.c3d
+            The path to the c3d file, or an already loaded ezc3d.c3d
+        extract_forceplat_data : bool
+            If True, the force platforms are extracted while parsing, otherwise only when requested
+        """
+        import ezc3d  # imported with the first c3d file, not with pyorerun
+
+        if isinstance(c3d_file, ezc3d.c3d):
+            self.path = None
+            self.c3d = c3d_file
+        else:
+            self.path = str(c3d_file)
+            self.c3d = ezc3d.c3d(self.path, extract_forceplat_data=extract_forceplat_data)
+
+    def __getitem__(self, key: str):
+        return self.c3d[key]
+
+    @property
+    def header(self):
+        return self.c3d["header"]
+
+    @property
+    def parameters(self):
+        return self.c3d["parameters"]
+
+    @property
+    def data(self):
+        return self.c3d["data"]
+
+    @cached_property
+    def platforms(self) -> list:
+        """The force platforms (force, moment, center_of_pressure, ...), extracted from the already parsed file."""
+        if "platform" in self.c3d["data"].keys():
+            return self.c3d["data"]["platform"]
+
+        import ezc3d
+
+        return [
+            ezc3d.c3d.PlatForm(platform) for platform in ezc3d.ezc3d.ForcePlatforms(self.c3d.c3d_swig).forcePlatforms()
+        ]
+
+    @property
+    def first_frame(self) -> int:
+        return self.c3d.c3d_swig.header().firstFrame()
+
+    @property
+    def last_frame(self) -> int:
+        return self.c3d.c3d_swig.header().lastFrame()
+
+
+INTEL_PROCESSOR = 84
+DEC_PROCESSOR = 85
+MIPS_PROCESSOR = 86
+C3D_BLOCK_SIZE = 512
+
+
+class C3dPointsReader:
+    """
+    Reads the header and the parameters of a c3d file, and memory-maps its data section without decoding it.
+    Only the markers and frames that are selected are then read from the disk and converted,
+    so that the load time and the memory scale with the selection instead of the file.
+
+    Attributes
+    ----------
+    path : str
+        The path to the c3d file
+    parameters : dict[str, dict[str, np.ndarray | list[str]]]
+        The parameters of the c3d file, by group and by name
+    marker_names : list[str]
+        The labels of the points
+    rate : float
+        The point frame rate
+    units : str
+        The units of the points
+    first_frame : int
+        The index of the first frame of the file, starting from 0
+    nb_frames : int
+        The number of frames of the file
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        with open(self.path, "rb") as file:
+            header = file.read(C3D_BLOCK_SIZE)
+            file.seek((header[0] - 1) * C3D_BLOCK_SIZE)
+            parameter_section = file.read(4)
+            parameter_section += file.read(parameter_section[2] * C3D_BLOCK_SIZE - 4)
+
+        self.processor = parameter_section[3]
+        if self.processor not in (INTEL_PROCESSOR, DEC_PROCESSOR, MIPS_PROCESSOR):
+            raise ValueError(f"Unknown c3d processor type {self.processor} in {self.path}.")
+        byte_order = ">" if self.processor == MIPS_PROCESSOR else "<"
+        self.int16 = np.dtype(f"{byte_order}i2")
+
+        header_words = np.frombuffer(header[:20], dtype=self.int16)
+        self.parameters = self._read_parameters(parameter_section)
+        point = self.parameters.get("POINT", {})
+
+        self.nb_points = int(header_words[1])
+        self.nb_analogs_by_frame = int(header_words[2])
+        self.first_frame = int(np.uint16(header_words[3])) - 1
+        self.nb_frames = int(np.uint16(header_words[4])) - self.first_frame
+        trial = self.parameters.get("TRIAL", {})
+        if "ACTUAL_START_FIELD" in trial and "ACTUAL_END_FIELD" in trial:
+            # the header stores 16-bits frame numbers, long trials store 32-bits ones in the TRIAL group
+            start, end = [
+                int(np.uint16(trial[name][0])) + (int(np.uint16(trial[name][1])) << 16)
+                for name in ("ACTUAL_START_FIELD", "ACTUAL_END_FIELD")
+            ]
+            self.first_frame, self.nb_frames = start - 1, end - start + 1
+
+        self.scale = float(point["SCALE"][0]) if "SCALE" in point else float(self._floats(header[12:16])[0])
+        self.rate = float(point["RATE"][0]) if "RATE" in point else float(self._floats(header[20:24])[0])
+        self.units = point["UNITS"][0] if "UNITS" in point and len(point["UNITS"]) else "mm"
+        data_start = int(point["DATA_START"][0]) if "DATA_START" in point else int(header_words[8])
+
+        labels = []
+        for name in ["LABELS", *[f"LABELS{i}" for i in range(2, 100)]]:
+            if name not in point:
+                break
+            labels += point[name]
+        self.marker_names = [label.strip() for label in labels[: self.nb_points]]
+
+        self.is_float = self.scale < 0
+        value_dtype = (
+            (np.dtype("V4") if self.processor == DEC_PROCESSOR else np.dtype(f"{byte_order}f4"))
+            if self.is_float
+            else self.int16
+        )
+        self._data = np.memmap(
+            self.path,
+            dtype=value_dtype,
+            mode="r",
+            offset=(data_start - 1) * C3D_BLOCK_SIZE,
+            shape=(self.nb_frames, 4 * self.nb_points + self.nb_analogs_by_frame),
+        )
+
+    @property
+    def last_frame(self) -> int:
+        return self.first_frame + self.nb_frames - 1
+
+    def _floats(self, raw: bytes | np.ndarray) -> np.ndarray:
+        """Decodes 4-bytes floats according to the processor type of the file."""
+        raw = np.frombuffer(raw, dtype=np.uint8) if isinstance(raw, bytes) else np.ascontiguousarray(raw).view(np.uint8)
+        raw = raw.reshape(-1, 4)
+        if self.processor == MIPS_PROCESSOR:
+            return raw.copy().view(">f4").astype(float)[:, 0]
+        if self.processor == DEC_PROCESSOR:
+            # VAX F-float: swapped 16-bits words and an exponent bias of 128 instead of 127
+            return raw[:, [2, 3, 0, 1]].copy().view("<f4").astype(float)[:, 0] / 4
+        return raw.copy().view("<f4").astype(float)[:, 0]
+
+    def _read_parameters(self, section: bytes) -> dict[str, dict[str, np.ndarray | list[str]]]:
+        groups = {}
+        parameters = []
+        position = 4
+        while position + 2 <= len(section):
+            name_length = abs(_signed_byte(section[position]))
+            if name_length == 0:
+                break
+            group_id = _signed_byte(section[position + 1])
+            name = section[position + 2 : position + 2 + name_length].decode("latin-1").upper()
+            position += 2 + name_length
+            offset = int(np.frombuffer(section[position : position + 2], dtype=self.int16)[0])
+
+            if group_id < 0:
+                groups[-group_id] = name
+            else:
+                data_type = _signed_byte(section[position + 2])
+                dimensions = list(section[position + 4 : position + 4 + section[position + 3]])
+                start = position + 4 + len(dimensions)
+                nb_values = int(np.prod(dimensions)) if dimensions else 1
+                raw = section[start : start + abs(data_type) * nb_values]
+                parameters.append((group_id, name, self._parameter_value(data_type, dimensions, raw)))
+
+            if offset == 0:
+                break
+            position += offset
+
+        output = {group_name: {} for group_name in groups.values()}
+        for group_id, name, value in parameters:
+            if group_id in groups:
+                output[groups[group_id]][name] = value
+        return output
+
+    def _parameter_value(self, data_type: int, dimensions: list[int], raw: bytes) -> np.ndarray | list[str]:
+        if data_type == -1:
+            if not dimensions:
+                return [raw.decode("latin-1")]
+            length = dimensions[0]
+            return [raw[i : i + length].decode("latin-1").strip() for i in range(0, len(raw), length)] if length else []
+        if data_type == 1:
+            values = np.frombuffer(raw, dtype=np.uint8)
+        elif data_type == 2:
+            values = np.frombuffer(raw, dtype=self.int16)
+        else:
+            values = self._floats(raw)
+        return values.reshape(dimensions, order="F") if len(dimensions) > 1 else values
+
+    def marker_indices(self, marker_names: list[str] = None) -> list[int]:
+        if marker_names is None:
+            return list(range(self.nb_points))
+        missing = [name for name in marker_names if name not in self.marker_names]
+        if missing:
+            raise ValueError(f"The markers {missing} are not in {self.path}.")
+        return [self.marker_names.index(name) for name in marker_names]
+
+    def read_points(self, marker_names: list[str] = None, frames: slice = slice(None)) -> np.ndarray:
+        """
+        Reads the selected markers and frames of the point block.
+
+        Parameters
+        ----------
+        marker_names : list[str]
+            The markers to read, all of them if None
+        frames : slice
+            The frames to read, relative to the first frame of the file
+
+        Returns
+        -------
+        np.ndarray
+            The points (4, n_markers, n_frames), in the units of the file, NaN for invalid points
+        """
+        indices = np.array(self.marker_indices(marker_names), dtype=int)
+        columns = (4 * indices[:, np.newaxis] + np.arange(4)).ravel()
+        raw = self._data[frames][:, columns]
+        nb_frames, nb_markers = raw.shape[0], indices.shape[0]
+
+        if self.is_float:
+            values = self._floats(raw).reshape(nb_frames, nb_markers, 4)
+        else:
+            values = raw.astype(float).reshape(nb_frames, nb_markers, 4)
+            values[:, :, :3] *= self.scale
+
+        points = values.transpose(2, 1, 0)
+        points[:3, points[3] < 0] = np.nan
+        points[3] = 1
+        return points
+
+    @property
+    def analog_names(self) -> list[str]:
+        """The labels of the analog channels."""
+        analog = self.parameters.get("ANALOG", {})
+        labels = []
+        for name in ["LABELS", *[f"LABELS{i}" for i in range(2, 100)]]:
+            if name not in analog:
+                break
+            labels += analog[name]
+        return [label.strip() for label in labels[: self.nb_analog_channels]]
+
+    @property
+    def nb_analog_channels(self) -> int:
+        analog = self.parameters.get("ANALOG", {})
+        return int(analog["USED"][0]) if "USED" in analog else 0
+
+    @property
+    def analog_rate(self) -> float:
+        """The analog sampling rate, a multiple of the point frame rate."""
+        return self.rate * self.nb_analogs_by_frame / max(self.nb_analog_channels, 1)
+
+    def read_analogs(self, channel_names: list[str] = None, frames: slice = slice(None)) -> np.ndarray:
+        """
+        Reads the selected analog channels during the selected point frames.
+
+        Parameters
+        ----------
+        channel_names : list[str]
+            The analog channels to read, all of them if None
+        frames : slice
+            The point frames to read, relative to the first frame of the file
+
+        Returns
+        -------
+        np.ndarray
+            The analogs (n_channels, n_frames * analog_rate / rate), scaled as (raw - OFFSET) * SCALE * GEN_SCALE
+        """
+        if self.nb_analog_channels == 0:
+            raise ValueError(f"There is no analog channel in {self.path}.")
+        names = self.analog_names
+        if channel_names is None:
+            channel_names = names
+        missing = [name for name in channel_names if name not in names]
+        if missing:
+            raise ValueError(f"The analog channels {missing} are not in {self.path}.")
+        indices = np.array([names.index(name) for name in channel_names], dtype=int)
+
+        nb_channels = self.nb_analog_channels
+        samples_by_frame = self.nb_analogs_by_frame // nb_channels
+        # each frame stores its analog samples one after the other, each sample storing all the channels
+        columns = (
+            4 * self.nb_points + np.arange(samples_by_frame)[:, np.newaxis] * nb_channels + indices[np.newaxis, :]
+        ).ravel()
+        raw = self._data[frames][:, columns]
+        nb_samples = raw.shape[0] * samples_by_frame
+
+        if self.is_float:
+            values = self._floats(raw).reshape(nb_samples, indices.shape[0])
+        else:
+            values = raw.reshape(nb_samples, indices.shape[0]).astype(float)
+
+        analog = self.parameters["ANALOG"]
+        offsets = np.asarray(analog.get("OFFSET", np.zeros(nb_channels)), dtype=float)
+        if "FORMAT" in analog and analog["FORMAT"] and analog["FORMAT"][0].upper() == "UNSIGNED" and not self.is_float:
+            values = np.where(values < 0, values + 65536, values)
+            offsets = np.where(offsets < 0, offsets + 65536, offsets)
+        scales = np.asarray(analog.get("SCALE", np.ones(nb_channels)), dtype=float)
+        general_scale = float(analog["GEN_SCALE"][0]) if "GEN_SCALE" in analog else 1.0
+
+        return ((values - offsets[indices]) * scales[indices] * general_scale).T
+
+
+def c3d_frames_selection(
+    nb_frames: int, rate: float, frame_range: tuple[int, int] = None, time_range: tuple[float, float] = None
+) -> slice:
+    """
+    The frames to load from a c3d file.
+
+    Parameters
+    ----------
+    nb_frames : int
+        The number of frames of the file
+    rate : float
+        The point frame rate
+    frame_range : tuple[int, int]
+        The frames as (start, stop), stop excluded, counted from the first frame of the file
+    time_range : tuple[float, float]
+        The time window as (start, end) in seconds, both included, from the first frame of the file
+
+    Returns
+    -------
+    slice
+        The selected frames, all of them if no range is given
+    """
+    if frame_range is not None and time_range is not None:
+        raise ValueError("frame_range and time_range can not be given together.")
+
+    if time_range is not None:
+        start, end = time_range
+        frame_range = (int(np.ceil(start * rate - 1e-9)), int(np.floor(end * rate + 1e-9)) + 1)
+
+    if frame_range is None:
+        return slice(0, nb_frames)
+
+    start, stop = max(frame_range[0], 0), min(frame_range[1], nb_frames)
+    if start >= stop:
+        raise ValueError(f"The selected frames {frame_range} are outside of the {nb_frames} frames of the file.")
+    return slice(start, stop)
+
+
+def _signed_byte(value: int) -> int:
+    return value - 256 if value > 127 else value
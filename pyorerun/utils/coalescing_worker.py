@@ -0,0 +1,152 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+
+class CoalescingWorker:
+    """
+    Renders the latest submitted value in a background thread, at most at a maximal rate.
+    The values submitted while a render is running only overwrite a latest-value slot,
+    so the intermediate ones are dropped instead of being queued, e.g. the positions of a dragged slider.
+
+    Attributes
+    ----------
+    latencies : deque[float]
+        The last measured delays, in seconds, between the submission of a rendered value and the end of its render.
+    nb_rendered : int
+        The number of renders.
+    nb_dropped : int
+        The number of submitted values replaced by a newer one before being rendered.
+    nb_errors : int
+        The number of renders which raised an exception, the worker going on with the next values.
+    """
+
+    def __init__(
+        self,
+        render: Callable[[Any, set[int] | None], None],
+        max_rate: float = 60.0,
+        latency_callback: Callable[[float], None] = None,
+        nb_latencies: int = 1000,
+        error_callback: Callable[[Exception], None] = None,
+    ):
+        """
+        Parameters
+        ----------
+        render : Callable[[Any, set[int] | None], None]
+            The function rendering a value, with the union of the keys changed since the previous render,
+            None if everything changed, e.g. the q of a model and its changed dofs.
+        max_rate : float
+            The maximal number of renders per second.
+        latency_callback : Callable[[float], None]
+            Called after each render with its latency, the delay in seconds between the submission and the render.
+        nb_latencies : int
+            The number of latencies kept in latencies.
+        error_callback : Callable[[Exception], None]
+            Called with the exception of each failed render. If None, the first exception is raised by stop.
+        """
+        if max_rate <= 0:
+            raise ValueError(f"The maximal rate must be positive, got {max_rate}.")
+        self.render = render
+        self.min_period = 1 / max_rate
+        self.latency_callback = latency_callback
+        self.error_callback = error_callback
+        self.latencies = deque(maxlen=nb_latencies)
+        self.nb_rendered = 0
+        self.nb_dropped = 0
+        self.nb_errors = 0
+
+        self._error = None
+        self._lock = threading.Lock()
+        self._pending = threading.Event()
+        self._stopped = threading.Event()
+        self._value = None
+        self._changed = set()
+        self._submitted_at = None
+        self._thread = None
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="pyorerun-render", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """
+        Stops the thread once its current render is over, the pending value being dropped.
+        Raises the first exception of a failed render, when no error_callback reported it.
+        """
+        self._stopped.set()
+        self._pending.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, value: Any, changed: list[int] = None) -> None:
+        """
+        Writes a value in the latest-value slot, replacing the one not rendered yet.
+
+        Parameters
+        ----------
+        value : Any
+            The value to render, which must not be modified afterward, e.g. a copy of q.
+        changed : list[int]
+            The keys changed by this value, e.g. dofs, None if everything changed.
+        """
+        with self._lock:
+            if self._submitted_at is not None:
+                self.nb_dropped += 1
+            self._value = value
+            if changed is None or self._changed is None:
+                self._changed = None
+            else:
+                self._changed.update(changed)
+            self._submitted_at = time.perf_counter()
+        self._pending.set()
+
+    def _take(self) -> tuple[Any, set[int] | None, float]:
+        with self._lock:
+            taken = self._value, self._changed, self._submitted_at
+            self._value, self._changed, self._submitted_at = None, set(), None
+            self._pending.clear()
+        return taken
+
+    def _run(self) -> None:
+        last_render = -float("inf")
+        while not self._stopped.is_set():
+            self._pending.wait()
+            if self._stopped.is_set():
+                break
+            # the values submitted while waiting for the next render slot are coalesced
+            time.sleep(max(0.0, last_render + self.min_period - time.perf_counter()))
+            value, changed, submitted_at = self._take()
+            if submitted_at is None:
+                continue
+
+            last_render = time.perf_counter()
+            try:
+                self.render(value, changed)
+            except Exception as error:
+                self._report(error)
+                continue
+            self.nb_rendered += 1
+            latency = time.perf_counter() - submitted_at
+            self.latencies.append(latency)
+            if self.latency_callback is not None:
+                self.latency_callback(latency)
+
+    def _report(self, error: Exception) -> None:
+        """Reports the exception of a render, and makes the next render a full one, this one being incomplete."""
+        self.nb_errors += 1
+        with self._lock:
+            self._changed = None
+        if self.error_callback is not None:
+            self.error_callback(error)
+        elif self._error is None:
+            self._error = error
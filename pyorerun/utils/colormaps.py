@@ -0,0 +1,111 @@
+import numpy as np
+
+LUT_SIZE = 256
+
+# 17 evenly spaced colors of the matplotlib colormaps, interpolated when matplotlib is not installed
+COLORMAP_ANCHORS = {
+    "magma": [
+        [0, 0, 4],
+        [10, 8, 34],
+        [29, 17, 71],
+        [54, 16, 107],
+        [81, 18, 124],
+        [106, 28, 129],
+        [131, 38, 129],
+        [156, 46, 127],
+        [183, 55, 121],
+        [208, 65, 111],
+        [231, 82, 99],
+        [245, 107, 92],
+        [252, 137, 97],
+        [254, 167, 114],
+        [254, 196, 136],
+        [253, 226, 163],
+        [252, 253, 191],
+    ],
+    "viridis": [
+        [68, 1, 84],
+        [72, 24, 106],
+        [71, 45, 123],
+        [66, 64, 134],
+        [59, 82, 139],
+        [51, 99, 141],
+        [44, 114, 142],
+        [38, 130, 142],
+        [33, 145, 140],
+        [31, 160, 136],
+        [40, 174, 128],
+        [63, 188, 115],
+        [94, 201, 98],
+        [132, 212, 75],
+        [173, 220, 48],
+        [216, 226, 25],
+        [253, 231, 37],
+    ],
+}
+
+
+def colormap_lut(colormap) -> np.ndarray:
+    """
+    The 256 colors of a colormap as packed RGBA uint32, computed once and then indexed for every value.
+
+    Parameters
+    ----------
+    colormap: str | matplotlib.colors.Colormap | np.ndarray
+        The name of a colormap, a matplotlib colormap, or the colors (n, 3) or (n, 4) in 0-255 to interpolate.
+        Without matplotlib, only the names in COLORMAP_ANCHORS are known.
+
+    Returns
+    -------
+    np.ndarray
+        The lookup table (256,) of packed RGBA uint32.
+    """
+    if isinstance(colormap, str):
+        try:
+            import matplotlib
+
+            colormap = matplotlib.colormaps[colormap]
+        except ImportError:
+            if colormap not in COLORMAP_ANCHORS:
+                raise ValueError(
+                    f"The colormap {colormap} needs matplotlib, without it only {list(COLORMAP_ANCHORS)} are available."
+                )
+            colormap = np.array(COLORMAP_ANCHORS[colormap])
+
+    if callable(colormap):
+        # a matplotlib colormap, which returns the uint8 RGBA of the values
+        colors = np.asarray(colormap(np.linspace(0, 1, LUT_SIZE), bytes=True))
+    else:
+        anchors = np.asarray(colormap, dtype=float)
+        if anchors.ndim != 2 or anchors.shape[1] not in (3, 4):
+            raise ValueError(f"The colors of a colormap must be (n, 3) or (n, 4), got {anchors.shape}.")
+        positions = np.linspace(0, 1, anchors.shape[0])
+        colors = np.stack([np.interp(np.linspace(0, 1, LUT_SIZE), positions, channel) for channel in anchors.T], axis=1)
+
+    colors = np.clip(np.round(colors), 0, 255).astype(np.uint32)
+    alpha = colors[:, 3] if colors.shape[1] == 4 else np.full(LUT_SIZE, 255, dtype=np.uint32)
+    return (colors[:, 0] << 24) | (colors[:, 1] << 16) | (colors[:, 2] << 8) | alpha
+
+
+def apply_lut(values: np.ndarray, lut: np.ndarray) -> np.ndarray:
+    """
+    The colors of values normalized in [0, 1], the values outside being clipped and NaN taking the lowest color.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        The normalized values, of any shape.
+    lut: np.ndarray
+        The lookup table of packed RGBA uint32, from colormap_lut.
+
+    Returns
+    -------
+    np.ndarray
+        The packed RGBA uint32 colors, of the shape of values.
+    """
+    # float32 is precise enough for 256 colors, and halves the memory traffic of the intermediate indices
+    indices = np.multiply(values, lut.shape[0] - 1, dtype=np.float32)
+    indices += 0.5
+    np.clip(indices, 0, lut.shape[0] - 1, out=indices)
+    indices[np.isnan(indices)] = 0
+    return np.take(lut, indices.astype(np.uint8 if lut.shape[0] <= 256 else np.intp))
@@ -0,0 +1,52 @@
+from typing import Sequence
+
+import numpy as np
+
+
+def dof_dependencies(moving_dofs: list[Sequence[int] | None], nb_q: int) -> np.ndarray:
+    """
+    The dofs that move each component, e.g. the transform of a segment, as a mask.
+
+    Parameters
+    ----------
+    moving_dofs: list[Sequence[int] | None]
+        The dofs moving each component, None when they are not known, the component then moving with every dof.
+    nb_q: int
+        The number of dofs.
+
+    Returns
+    -------
+    np.ndarray
+        The dependencies (n_components, nb_q), True if the component moves with the dof.
+    """
+    dependencies = np.zeros((len(moving_dofs), nb_q), dtype=bool)
+    for i, dofs in enumerate(moving_dofs):
+        dependencies[i, slice(None) if dofs is None else list(dofs)] = True
+    return dependencies
+
+
+def kinematic_chain_dofs(segment_index: int, parents: Sequence[int | None], nb_dofs: Sequence[int]) -> tuple[int, ...]:
+    """
+    The dofs moving a segment, i.e. its own and the ones of its parents, when q is the concatenation of the dofs
+    of the segments in their order, as in biorbd.
+
+    Parameters
+    ----------
+    segment_index: int
+        The index of the segment.
+    parents: Sequence[int | None]
+        The index of the parent of each segment, None for the segments attached to the ground.
+    nb_dofs: Sequence[int]
+        The number of dofs of each segment.
+
+    Returns
+    -------
+    tuple[int, ...]
+        The dofs moving the segment, in increasing order.
+    """
+    first_dofs = np.concatenate(([0], np.cumsum(nb_dofs))).astype(int)
+    dofs = []
+    while segment_index is not None:
+        dofs.extend(range(first_dofs[segment_index], first_dofs[segment_index + 1]))
+        segment_index = parents[segment_index]
+    return tuple(sorted(dofs))
@@ -0,0 +1,184 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+ENVELOPES = ("low_pass", "rms")
+
+
+@dataclass
+class EmgProcessing:
+    """
+    The processing of raw EMG into muscle activation envelopes:
+    band-pass filter, rectification, then low-pass filter or moving root mean square.
+
+    Attributes
+    ----------
+    band_pass: tuple[float, float]
+        The cutoff frequencies (Hz) of the band-pass filter of the raw EMG, no band-pass filter if None.
+    envelope: str
+        "low_pass" to low-pass filter the rectified EMG, "rms" for its moving root mean square.
+    low_pass: float
+        The cutoff frequency (Hz) of the "low_pass" envelope.
+    rms_window: float
+        The duration (s) of the moving window of the "rms" envelope.
+    order: int
+        The order of the Butterworth filters.
+    """
+
+    band_pass: tuple[float, float] | None = (20.0, 450.0)
+    envelope: str = "low_pass"
+    low_pass: float = 6.0
+    rms_window: float = 0.1
+    order: int = 4
+
+    def __post_init__(self):
+        if self.envelope not in ENVELOPES:
+            raise ValueError(f"envelope={self.envelope} is not supported. Please use one of {ENVELOPES}.")
+        if self.band_pass is not None and not 0 < self.band_pass[0] < self.band_pass[1]:
+            raise ValueError(f"The band-pass cutoff frequencies must be increasing and positive, got {self.band_pass}.")
+        if self.low_pass <= 0 or self.rms_window <= 0:
+            raise ValueError("The low-pass cutoff frequency and the RMS window must be positive.")
+
+    def band_pass_filter(self, rate: float) -> np.ndarray | None:
+        """The second-order sections of the band-pass filter, None without band-pass."""
+        if self.band_pass is None:
+            return None
+        check_cutoff(self.band_pass[1], rate)
+        return butterworth(self.order, self.band_pass, rate, "bandpass")
+
+    def low_pass_filter(self, rate: float) -> np.ndarray | None:
+        """The second-order sections of the low-pass envelope filter, None for an RMS envelope."""
+        if self.envelope != "low_pass":
+            return None
+        check_cutoff(self.low_pass, rate)
+        return butterworth(self.order, self.low_pass, rate, "lowpass")
+
+    def rms_samples(self, rate: float) -> int:
+        return max(1, int(round(self.rms_window * rate)))
+
+
+def check_cutoff(cutoff: float, rate: float) -> None:
+    if cutoff >= rate / 2:
+        raise ValueError(f"The cutoff frequency {cutoff} Hz must be below the Nyquist frequency {rate / 2} Hz.")
+
+
+def scipy_signal():
+    """scipy.signal, imported with the first filter since it takes about a second to import."""
+    try:
+        from scipy import signal
+    except ImportError:
+        # scipy is not installed, the EMG can only be processed without filters
+        raise ImportError("scipy is needed to filter the EMG. Install it, or set band_pass=None and envelope='rms'.")
+    return signal
+
+
+def butterworth(order: int, cutoff: float | tuple[float, float], rate: float, btype: str) -> np.ndarray:
+    return scipy_signal().butter(order, cutoff, btype=btype, fs=rate, output="sos")
+
+
+def emg_envelope(emg: np.ndarray, rate: float, processing: EmgProcessing = None) -> np.ndarray:
+    """
+    Processes a whole trial of raw EMG at once, with zero-phase filters and a centered RMS window,
+    vectorized over the channels.
+
+    Parameters
+    ----------
+    emg: np.ndarray
+        The raw EMG (n_channels, n_samples).
+    rate: float
+        The sampling rate (Hz).
+    processing: EmgProcessing
+        The processing steps, the default EmgProcessing if None.
+
+    Returns
+    -------
+    np.ndarray
+        The envelopes (n_channels, n_samples).
+    """
+    processing = EmgProcessing() if processing is None else processing
+    emg = np.asarray(emg, dtype=float)
+
+    band_pass = processing.band_pass_filter(rate)
+    if band_pass is not None:
+        emg = scipy_signal().sosfiltfilt(band_pass, emg, axis=-1)
+    rectified = np.abs(emg)
+
+    low_pass = processing.low_pass_filter(rate)
+    if low_pass is not None:
+        # the zero-phase low-pass filter may ring slightly below zero, which is no activation
+        return np.maximum(scipy_signal().sosfiltfilt(low_pass, rectified, axis=-1), 0)
+
+    return centered_rms(rectified, processing.rms_samples(rate))
+
+
+def centered_rms(rectified: np.ndarray, window: int) -> np.ndarray:
+    """The moving root mean square over a centered window, shortened at the edges, from one cumulative sum."""
+    nb_samples = rectified.shape[-1]
+    cumulative = np.concatenate(
+        (np.zeros((*rectified.shape[:-1], 1)), np.cumsum(rectified**2, axis=-1)),
+        axis=-1,
+    )
+    starts = np.clip(np.arange(nb_samples) - window // 2, 0, nb_samples)
+    stops = np.clip(np.arange(nb_samples) + (window + 1) // 2, 0, nb_samples)
+    return np.sqrt(np.maximum(cumulative[..., stops] - cumulative[..., starts], 0) / (stops - starts))
+
+
+class EmgEnvelopeStream:
+    """
+    Processes raw EMG block after block, so that long trials never have to be held in memory.
+    The filters are causal and keep their state between the blocks, and the RMS window trails the samples,
+    so the envelopes lag slightly behind the zero-phase ones of emg_envelope.
+    """
+
+    def __init__(self, nb_channels: int, rate: float, processing: EmgProcessing = None):
+        """
+        Parameters
+        ----------
+        nb_channels: int
+            The number of EMG channels.
+        rate: float
+            The sampling rate (Hz).
+        processing: EmgProcessing
+            The processing steps, the default EmgProcessing if None.
+        """
+        self.processing = EmgProcessing() if processing is None else processing
+        self.band_pass = self.processing.band_pass_filter(rate)
+        self.low_pass = self.processing.low_pass_filter(rate)
+        self.rms_window = self.processing.rms_samples(rate)
+
+        self._band_pass_state = None if self.band_pass is None else np.zeros((self.band_pass.shape[0], nb_channels, 2))
+        self._low_pass_state = None
+        self._squared_tail = np.zeros((nb_channels, 0))
+
+    def process(self, emg: np.ndarray) -> np.ndarray:
+        """
+        Parameters
+        ----------
+        emg: np.ndarray
+            The next block of raw EMG (n_channels, n_samples).
+
+        Returns
+        -------
+        np.ndarray
+            The envelopes of the block (n_channels, n_samples).
+        """
+        emg = np.asarray(emg, dtype=float)
+        if self.band_pass is not None:
+            emg, self._band_pass_state = scipy_signal().sosfilt(self.band_pass, emg, axis=-1, zi=self._band_pass_state)
+        rectified = np.abs(emg)
+
+        if self.low_pass is not None:
+            if self._low_pass_state is None:
+                # starts at the level of the first sample, instead of a transient from zero
+                self._low_pass_state = scipy_signal().sosfilt_zi(self.low_pass)[:, np.newaxis, :] * rectified[:, :1]
+            envelope, self._low_pass_state = scipy_signal().sosfilt(
+                self.low_pass, rectified, axis=-1, zi=self._low_pass_state
+            )
+            return np.maximum(envelope, 0)
+
+        squared = np.concatenate((self._squared_tail, rectified**2), axis=-1)
+        cumulative = np.concatenate((np.zeros((squared.shape[0], 1)), np.cumsum(squared, axis=-1)), axis=-1)
+        stops = np.arange(self._squared_tail.shape[1], squared.shape[1]) + 1
+        starts = np.maximum(stops - self.rms_window, 0)
+        self._squared_tail = squared[:, -(self.rms_window - 1) :] if self.rms_window > 1 else squared[:, :0]
+        return np.sqrt(np.maximum(cumulative[:, stops] - cumulative[:, starts], 0) / (stops - starts))
@@ -0,0 +1,193 @@
+from typing import Callable
+
+import numpy as np
+
+INTEGRATORS = ("euler", "semi_implicit_euler", "rk4", "rk45")
+
+# Dormand-Prince 5(4) coefficients, the fifth order solution being kept
+DOPRI_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+DOPRI_A = np.array(
+    [
+        [0, 0, 0, 0, 0, 0],
+        [1 / 5, 0, 0, 0, 0, 0],
+        [3 / 40, 9 / 40, 0, 0, 0, 0],
+        [44 / 45, -56 / 15, 32 / 9, 0, 0, 0],
+        [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729, 0, 0],
+        [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656, 0],
+        [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+    ]
+)
+DOPRI_B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0])
+DOPRI_ERROR = DOPRI_B - np.array([5179 / 57600, 0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40])
+
+
+class Integrator:
+    """
+    Integrates the forward dynamics of a model, qddot = dynamics(q, qdot), from one frame to the next.
+    The stages are computed in buffers allocated once, so that a step only allocates what the dynamics return.
+
+    Attributes
+    ----------
+    method : str
+        "euler" for explicit Euler, "semi_implicit_euler" (symplectic, the velocity being updated first),
+        "rk4" for the classical Runge-Kutta, "rk45" for an adaptive Dormand-Prince with sub-steps within each frame.
+    nb_evaluations : int
+        The number of evaluations of the dynamics, e.g. to compare the cost of the methods.
+    """
+
+    def __init__(
+        self,
+        dynamics: Callable[[np.ndarray, np.ndarray], np.ndarray],
+        nb_q: int,
+        method: str = "rk4",
+        rtol: float = 1e-6,
+        atol: float = 1e-8,
+    ):
+        """
+        Parameters
+        ----------
+        dynamics : Callable[[np.ndarray, np.ndarray], np.ndarray]
+            The generalized accelerations (nb_q,) from the generalized coordinates and velocities.
+        nb_q : int
+            The number of generalized coordinates, equal to the number of generalized velocities.
+        method : str
+            The integration method, one of INTEGRATORS.
+        rtol : float
+            The relative tolerance of the "rk45" sub-steps.
+        atol : float
+            The absolute tolerance of the "rk45" sub-steps.
+        """
+        if method not in INTEGRATORS:
+            raise ValueError(f"method={method} is not supported. Please use one of {INTEGRATORS}.")
+        self.dynamics = dynamics
+        self.nb_q = nb_q
+        self.method = method
+        self.rtol = rtol
+        self.atol = atol
+        self.nb_evaluations = 0
+
+        # the state is [q, qdot], its derivative [qdot, qddot]
+        nb_stages = 7 if method == "rk45" else 4
+        self._stages = np.zeros((nb_stages, 2 * nb_q))
+        self._state = np.zeros(2 * nb_q)
+        self._stage_state = np.zeros(2 * nb_q)
+        self._step_size = None
+
+    def _derivative(self, state: np.ndarray, out: np.ndarray) -> np.ndarray:
+        self.nb_evaluations += 1
+        out[: self.nb_q] = state[self.nb_q :]
+        out[self.nb_q :] = self.dynamics(state[: self.nb_q], state[self.nb_q :])
+        return out
+
+    def step(self, q: np.ndarray, qdot: np.ndarray, dt: float, q_out: np.ndarray, qdot_out: np.ndarray) -> np.ndarray:
+        """
+        Integrates the state over dt.
+
+        Parameters
+        ----------
+        q : np.ndarray
+            The generalized coordinates at the beginning of the step.
+        qdot : np.ndarray
+            The generalized velocities at the beginning of the step.
+        dt : float
+            The duration of the step.
+        q_out : np.ndarray
+            Where the generalized coordinates at the end of the step are written, e.g. a column of a trajectory.
+        qdot_out : np.ndarray
+            Where the generalized velocities at the end of the step are written.
+
+        Returns
+        -------
+        np.ndarray
+            The generalized accelerations at the beginning of the step.
+        """
+        state = self._state
+        state[: self.nb_q] = q
+        state[self.nb_q :] = qdot
+        k = self._stages
+        self._derivative(state, k[0])
+        qddot = k[0, self.nb_q :].copy()
+
+        if self.method == "euler":
+            state += dt * k[0]
+        elif self.method == "semi_implicit_euler":
+            state[self.nb_q :] += dt * k[0, self.nb_q :]
+            state[: self.nb_q] += dt * state[self.nb_q :]
+        elif self.method == "rk4":
+            self._rk4(state, dt)
+        else:
+            self._rk45(state, dt)
+
+        q_out[:] = state[: self.nb_q]
+        qdot_out[:] = state[self.nb_q :]
+        return qddot
+
+    def _rk4(self, state: np.ndarray, dt: float) -> None:
+        k, stage_state = self._stages, self._stage_state
+        for i, fraction in enumerate((0.5, 0.5, 1.0)):
+            np.multiply(k[i], fraction * dt, out=stage_state)
+            stage_state += state
+            self._derivative(stage_state, k[i + 1])
+        state += dt / 6 * (k[0] + 2 * k[1] + 2 * k[2] + k[3])
+
+    def _rk45(self, state: np.ndarray, dt: float) -> None:
+        """Adaptive sub-steps until the end of the frame, k[0] being the derivative at the current state."""
+        k, stage_state = self._stages, self._stage_state
+        remaining = dt
+        h = dt if self._step_size is None else min(self._step_size, dt)
+        while remaining > 1e-12 * dt:
+            h = min(h, remaining)
+            for i in range(1, 7):
+                np.dot(DOPRI_A[i, :i], k[:i], out=stage_state)
+                stage_state *= h
+                stage_state += state
+                self._derivative(stage_state, k[i])
+
+            error = h * np.dot(DOPRI_ERROR, k)
+            scale = self.atol + self.rtol * np.maximum(np.abs(state), np.abs(stage_state))
+            error_norm = np.sqrt(np.mean((error / scale) ** 2))
+            if error_norm <= 1:
+                # the last stage is the fifth order solution, and its derivative the first stage of the next step
+                state[:] = stage_state
+                k[0] = k[6]
+                remaining -= h
+            h *= min(5.0, max(0.2, 0.9 * (error_norm + 1e-16) ** -0.2))
+        self._step_size = h
+
+    def integrate(self, q: np.ndarray, qdot: np.ndarray, time_vector: np.ndarray) -> tuple[np.ndarray, ...]:
+        """
+        Integrates the whole horizon at once, e.g. to send the trajectory as columns afterward.
+
+        Parameters
+        ----------
+        q : np.ndarray
+            The initial generalized coordinates.
+        qdot : np.ndarray
+            The initial generalized velocities.
+        time_vector : np.ndarray
+            The increasing time of each frame.
+
+        Returns
+        -------
+        tuple[np.ndarray, ...]
+            The generalized coordinates, velocities and accelerations (nb_q, n_frames) of each frame,
+            the accelerations of the last frame being computed at its state.
+        """
+        nb_frames = time_vector.shape[0]
+        q_trajectory = np.zeros((self.nb_q, nb_frames))
+        qdot_trajectory = np.zeros((self.nb_q, nb_frames))
+        qddot_trajectory = np.zeros((self.nb_q, nb_frames))
+        q_trajectory[:, 0] = q
+        qdot_trajectory[:, 0] = qdot
+
+        for i in range(nb_frames - 1):
+            qddot_trajectory[:, i] = self.step(
+                q_trajectory[:, i],
+                qdot_trajectory[:, i],
+                time_vector[i + 1] - time_vector[i],
+                q_trajectory[:, i + 1],
+                qdot_trajectory[:, i + 1],
+            )
+        self.nb_evaluations += 1
+        qddot_trajectory[:, -1] = self.dynamics(q_trajectory[:, -1], qdot_trajectory[:, -1])
+        return q_trajectory, qdot_trajectory, qddot_trajectory
@@ -0,0 +1,213 @@
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+import numpy as np
+import rerun as rr
+
+STATIC_TOLERANCE = 1e-9
+# the distance, in meters, from a segment origin at which an angle error moves a point as much as the position tolerance
+TOLERANCE_REFERENCE_LENGTH = 1.0
+
+
+@dataclass
+class KeyframeColumns:
+    """
+    The columns of an entity that are only sent at some frames of the timeline.
+    Rerun holds the latest value of an entity, so the frames in between keep the value of the last keyframe.
+
+    Attributes
+    ----------
+    frames: np.ndarray
+        The indices of the frames of the timeline at which the columns are sent.
+    columns: list
+        The rerun columns, with one row per keyframe.
+    """
+
+    frames: np.ndarray
+    columns: list
+
+
+@dataclass
+class KeyframeTolerances:
+    """
+    The tolerances of the lossy keyframe decimation.
+    A missing tolerance is derived from the other one, an angle error moving the points at TOLERANCE_REFERENCE_LENGTH
+    (1 m) of a segment origin as much as the position error, e.g. position=1e-4 gives angle=1e-4 rad.
+    Without any of them, the decimation is lossless.
+
+    Attributes
+    ----------
+    position: float
+        The maximal distance, in meters, between a displayed position and its true value.
+    angle: float
+        The maximal angle, in radians, between a displayed orientation and its true value.
+    """
+
+    position: float = None
+    angle: float = None
+
+    def __post_init__(self):
+        if self.position is None and self.angle is None:
+            self.position = self.angle = STATIC_TOLERANCE
+        elif self.angle is None:
+            self.angle = self.position / TOLERANCE_REFERENCE_LENGTH
+        elif self.position is None:
+            self.position = self.angle * TOLERANCE_REFERENCE_LENGTH
+        if self.position < 0 or self.angle < 0:
+            raise ValueError("The keyframe tolerances must be positive.")
+
+
+def held_frames(values: np.ndarray, tolerance: float = STATIC_TOLERANCE) -> np.ndarray:
+    """
+    Detects the frames at which a time series changes, to send it as run-length keyframes.
+    A constant time series is reduced to its first frame.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        The time series, the last axis being the frames, e.g. (4, 4, N) for homogenous matrices
+        or (3, M, N) for markers.
+    tolerance: float
+        The maximal absolute difference between two consecutive frames considered as no change.
+
+    Returns
+    -------
+    np.ndarray
+        The indices of the frames to keep, the first frame is always kept.
+    """
+    values = np.asarray(values)
+    values = values.reshape(-1, values.shape[-1])
+    if values.shape[1] < 2:
+        return np.arange(values.shape[1])
+
+    previous, current = values[:, :-1], values[:, 1:]
+    nan_previous, nan_current = np.isnan(previous), np.isnan(current)
+    with np.errstate(invalid="ignore"):
+        moved = np.abs(current - previous) > tolerance
+    changed = np.any(moved | (nan_previous != nan_current), axis=0)
+
+    return np.concatenate(([0], np.flatnonzero(changed) + 1))
+
+
+def decimated_frames(exceeds_tolerance: Callable[[int, slice], np.ndarray], nb_frames: int) -> np.ndarray:
+    """
+    Selects the keyframes such that holding the value of the last keyframe, as rerun does between two rows,
+    stays within tolerance of the true value at every frame.
+    The search is vectorized over windows of frames whose size adapts to the gap between keyframes,
+    so that the number of python iterations scales with the number of keyframes, not of frames.
+
+    Parameters
+    ----------
+    exceeds_tolerance: Callable[[int, slice], np.ndarray]
+        Returns, for the frames of the slice, whether holding the value of the anchor frame exceeds the tolerance.
+    nb_frames: int
+        The number of frames of the time series.
+
+    Returns
+    -------
+    np.ndarray
+        The indices of the frames to keep, the first frame is always kept.
+    """
+    frames = [0]
+    window = 16
+    cursor = 1
+    while cursor < nb_frames:
+        stop = min(cursor + window, nb_frames)
+        exceeded = exceeds_tolerance(frames[-1], slice(cursor, stop))
+        if exceeded.any():
+            frames.append(cursor + int(np.argmax(exceeded)))
+            window = max(16, 2 * (frames[-1] - frames[-2]))
+            cursor = frames[-1] + 1
+        else:
+            window *= 2
+            cursor = stop
+
+    return np.array(frames)
+
+
+def transform_keyframes(homogenous_matrices: np.ndarray, tolerances: KeyframeTolerances = None) -> np.ndarray:
+    """
+    The keyframes of a time series of homogenous matrices (4, 4, N).
+    Without tolerances, only the frames at which the transform changes are kept (lossless).
+    """
+    if tolerances is None:
+        return held_frames(homogenous_matrices[:3, :, :])
+
+    translations = homogenous_matrices[:3, 3, :]
+    rotations = homogenous_matrices[:3, :3, :]
+
+    def exceeds_tolerance(anchor: int, frames: slice) -> np.ndarray:
+        distances = np.linalg.norm(translations[:, frames] - translations[:, anchor, np.newaxis], axis=0)
+        # ||R_anchor - R||_F = 2 sqrt(2) sin(angle / 2), which stays accurate for small angles
+        frobenius = np.linalg.norm(rotations[:, :, frames] - rotations[:, :, anchor, np.newaxis], axis=(0, 1))
+        angles = 2 * np.arcsin(np.clip(frobenius / (2 * np.sqrt(2)), 0, 1))
+        return (distances > tolerances.position) | (angles > tolerances.angle)
+
+    return decimated_frames(exceeds_tolerance, homogenous_matrices.shape[2])
+
+
+def marker_keyframes(markers: np.ndarray, tolerances: KeyframeTolerances = None) -> np.ndarray:
+    """
+    The keyframes of a time series of markers (3, M, N), the appearance or disappearance (NaN) of a marker
+    is always kept. Without tolerances, only the frames at which a marker moves are kept (lossless).
+    """
+    if tolerances is None:
+        return held_frames(markers)
+
+    is_nan = np.isnan(markers).any(axis=0)
+
+    def exceeds_tolerance(anchor: int, frames: slice) -> np.ndarray:
+        distances = np.linalg.norm(markers[:, :, frames] - markers[:, :, anchor, np.newaxis], axis=0)
+        with np.errstate(invalid="ignore"):
+            moved = np.any(distances > tolerances.position, axis=0)
+        return moved | np.any(is_nan[:, frames] != is_nan[:, anchor, np.newaxis], axis=0)
+
+    return decimated_frames(exceeds_tolerance, markers.shape[2])
+
+
+def send_chunks(
+    chunks: dict[str, list | KeyframeColumns | Iterator[KeyframeColumns]],
+    t_span: np.ndarray,
+    recording: rr.RecordingStream = None,
+) -> None:
+    """
+    Sends the chunks of a phase on the "stable_time" timeline.
+
+    Parameters
+    ----------
+    chunks: dict[str, list | KeyframeColumns | Iterator[KeyframeColumns]]
+        The columns of each entity, either for every frame of t_span or only for some keyframes.
+        An iterator of keyframes is sent one chunk at a time, e.g. video frames decoded by windows.
+    t_span: np.ndarray
+        The time instant of each frame.
+    recording: rr.RecordingStream
+        The recording to send to, the one logged to in this thread if None.
+    """
+    times = [rr.TimeColumn("stable_time", duration=t_span)]
+
+    for name, chunk in chunks.items():
+        if not isinstance(chunk, (KeyframeColumns, Iterator)):
+            rr.send_columns(
+                name,
+                indexes=times,
+                columns=chunk,
+                recording=recording,
+            )
+            continue
+
+        for keyframes in [chunk] if isinstance(chunk, KeyframeColumns) else chunk:
+            rr.send_columns(
+                name,
+                indexes=[rr.TimeColumn("stable_time", duration=t_span[keyframes.frames])],
+                columns=keyframes.columns,
+                recording=recording,
+            )
+            if isinstance(chunk, Iterator):
+                # waits for the window to leave the sink before producing the next one, to keep the memory bounded
+                flush(recording)
+
+
+def flush(recording: rr.RecordingStream = None) -> None:
+    recording = rr.get_data_recording(recording)
+    if recording is not None:
+        recording.flush()
@@ -0,0 +1,54 @@
+from importlib import import_module
+from typing import Any, Callable
+
+# the optional dependencies whose absence makes an attribute unavailable, any other import error being a bug
+OPTIONAL_BACKENDS = ("biorbd", "opensim", "pinocchio", "biobuddy")
+
+
+def is_missing_backend(error: ImportError) -> bool:
+    """Whether an import error is an optional backend which is not installed."""
+    return isinstance(error, ModuleNotFoundError) and (error.name or "").split(".")[0] in OPTIONAL_BACKENDS
+
+
+def lazy_attributes(
+    package: str, attributes: dict[str, tuple[str, str]], namespace: dict[str, Any]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    The __getattr__ and __dir__ of a package whose attributes are imported on first access (PEP 562),
+    so that importing the package does not import the backends and heavy libraries of its modules.
+    An attribute needing a missing optional backend raises an AttributeError, any other import error is raised.
+
+    Parameters
+    ----------
+    package: str
+        The name of the package, the __name__ of its __init__.
+    attributes: dict[str, tuple[str, str]]
+        The module, relative to the package, and the name in that module of each attribute.
+    namespace: dict[str, Any]
+        The globals of the package, where an imported attribute is kept for the next accesses.
+
+    Returns
+    -------
+    tuple[Callable[[str], Any], Callable[[], list[str]]]
+        The __getattr__ and __dir__ of the package.
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name not in attributes:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module_name, attribute = attributes[name]
+        try:
+            module = import_module(module_name, package)
+            value = getattr(module, attribute)
+        except ImportError as error:
+            if not is_missing_backend(error):
+                raise
+            # an optional backend which is not installed, e.g. biorbd, as if the attribute did not exist
+            raise AttributeError(f"{package}.{name} is not available: {error}") from error
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*namespace, *attributes})
+
+    return __getattr__, __dir__
@@ -1,5 +1,3 @@
-import numpy as np
-
 from ..model_interfaces import AbstractModel
 from ..pyomarkers import PyoMarkers
 
@@ -21,14 +19,17 @@ def sort_markers_to_a_predefined_order(
     model_marker_names : tuple[str] | list[str]
         The names of the markers as declared in the model.
     """
-    current_tracked_markers = tracked_markers.to_numpy()
-    reordered_markers = np.zeros_like(current_tracked_markers)
-    for i_marker, model_marker_name in enumerate(model_marker_names):
-        name_index = tracked_marker_names.index(model_marker_name)
-        reordered_markers[:, i_marker, :] = current_tracked_markers[:, name_index, :]
-
-    reordered_tracked_markers = PyoMarkers(reordered_markers, marker_names=list(model_marker_names))
-    return reordered_tracked_markers
+    if list(tracked_marker_names) != tracked_markers.marker_names:
+        # relabeled without copying, the positions being a view of the tracked ones
+        tracked_markers = PyoMarkers(
+            tracked_markers.to_numpy(homogeneous=False),
+            time=tracked_markers.time,
+            marker_names=list(tracked_marker_names),
+            show_labels=tracked_markers.show_labels,
+            attrs=tracked_markers.attrs,
+        )
+    # only the positions are gathered with an index array, the time and attributes are shared
+    return tracked_markers.reordered(list(model_marker_names))
 
 
 def check_and_adjust_markers(model: AbstractModel, tracked_markers: PyoMarkers) -> PyoMarkers:
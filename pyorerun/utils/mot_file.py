@@ -0,0 +1,64 @@
+import io
+
+import numpy as np
+
+STO_VALUE_SUFFIX = "/value"
+STO_SPEED_SUFFIX = "/speed"
+
+
+def read_mot(filename: str) -> dict:
+    """
+    Reads an OpenSim .mot or .sto file, parsing its header and then its numeric block in one bulk NumPy parse.
+    The .sto state labels such as "/jointset/hip_r/hip_flexion_r/value" are renamed after their coordinate,
+    and their speed columns are dropped.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the .mot or .sto file
+
+    Returns
+    -------
+    dict
+        "time" (n_frames,), "coordinate_names", "q" (n_coordinates, n_frames) in the order of the file,
+        "in_degrees" and "header" the key=value pairs of the header.
+    """
+    header = {}
+    with open(filename, "r") as file:
+        for line in file:
+            line = line.strip()
+            if line.lower() == "endheader":
+                break
+            if "=" in line:
+                key, value = line.split("=", 1)
+                header[key.strip()] = value.strip()
+        else:
+            raise ValueError(f"No 'endheader' line found in {filename}.")
+
+        labels_line = file.readline()
+        while labels_line and not labels_line.strip():
+            labels_line = file.readline()
+        text = file.read()
+
+    labels = [label.strip() for label in labels_line.strip("\r\n").split("\t" if "\t" in labels_line else None)]
+    data = np.loadtxt(io.StringIO(text), ndmin=2, dtype=float)
+    if data.shape[1] != len(labels):
+        raise ValueError(f"{filename} has {len(labels)} column labels but {data.shape[1]} columns of values.")
+
+    time_index = [label.lower() for label in labels].index("time") if "time" in map(str.lower, labels) else 0
+    columns = [i for i, label in enumerate(labels) if i != time_index and not label.endswith(STO_SPEED_SUFFIX)]
+
+    return {
+        "time": data[:, time_index],
+        "coordinate_names": tuple(_coordinate_name(labels[i]) for i in columns),
+        "q": data[:, columns].T,
+        "in_degrees": header.get("inDegrees", "no").lower() == "yes",
+        "header": header,
+    }
+
+
+def _coordinate_name(label: str) -> str:
+    """The coordinate of a .sto state label such as "/jointset/hip_r/hip_flexion_r/value", the label otherwise."""
+    if label.startswith("/") and label.endswith(STO_VALUE_SUFFIX):
+        return label[: -len(STO_VALUE_SUFFIX)].rsplit("/", 1)[-1]
+    return label
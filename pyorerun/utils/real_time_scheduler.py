@@ -0,0 +1,177 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+@dataclass
+class SchedulerStats:
+    """
+    What a RealTimeScheduler achieved.
+
+    Attributes
+    ----------
+    simulated_time: float
+        The simulated duration (s).
+    wall_time: float
+        The wall-clock duration of the run (s).
+    nb_steps: int
+        The number of simulated states.
+    nb_rendered: int
+        The number of rendered states.
+    nb_skipped: int
+        The number of simulated states never rendered, a newer one being available at render time.
+    """
+
+    simulated_time: float = 0.0
+    wall_time: float = 0.0
+    nb_steps: int = 0
+    nb_rendered: int = 0
+    nb_skipped: int = 0
+
+    @property
+    def sim_rate(self) -> float:
+        """The simulated states per second of wall-clock time."""
+        return self.nb_steps / self.wall_time if self.wall_time > 0 else 0.0
+
+    @property
+    def display_rate(self) -> float:
+        """The rendered states per second of wall-clock time."""
+        return self.nb_rendered / self.wall_time if self.wall_time > 0 else 0.0
+
+    @property
+    def real_time_factor(self) -> float:
+        """The simulated time per second of wall-clock time, 1 being real time."""
+        return self.simulated_time / self.wall_time if self.wall_time > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.nb_steps} steps at {self.sim_rate:.1f} Hz, {self.nb_rendered} rendered at {self.display_rate:.1f} Hz "
+            f"({self.nb_skipped} skipped), real-time factor {self.real_time_factor:.2f}"
+        )
+
+
+class RealTimeScheduler:
+    """
+    Runs a simulation in a thread and renders its states at a fixed display rate, decoupled from each other.
+    The simulation thread paces its steps on their simulated time, with deadlines from the start of the run,
+    so that the time to compute and to render never accumulates as a drift. Its states go to a bounded queue,
+    from which the renderer only displays the newest one at each display frame, the older ones being skipped.
+    """
+
+    def __init__(
+        self,
+        step: Callable[[], tuple[float, Any] | None],
+        render: Callable[[float, Any], None],
+        real_time_factor: float | None = 1.0,
+        display_rate: float = 30.0,
+        queue_size: int = 64,
+        start_time: float = 0.0,
+    ):
+        """
+        Parameters
+        ----------
+        step: Callable[[], tuple[float, Any] | None]
+            Simulates the next state and returns its simulated time and the state, None when the simulation is over.
+        render: Callable[[float, Any], None]
+            Displays a state at its simulated time, called from the thread of run.
+        real_time_factor: float | None
+            The simulated time per second of wall-clock time, e.g. 0.5 for slow motion,
+            None to simulate as fast as possible.
+        display_rate: float
+            The maximal number of rendered states per second of wall-clock time.
+        queue_size: int
+            The maximal number of states waiting to be rendered, the oldest ones being dropped beyond.
+        start_time: float
+            The simulated time at the start of the run.
+        """
+        if real_time_factor is not None and real_time_factor <= 0:
+            raise ValueError(f"The real-time factor must be positive or None, got {real_time_factor}.")
+        if display_rate <= 0:
+            raise ValueError(f"The display rate must be positive, got {display_rate}.")
+        self.step = step
+        self.render = render
+        self.real_time_factor = real_time_factor
+        self.display_period = 1 / display_rate
+        self.start_time = start_time
+        self.stats = SchedulerStats()
+
+        self._states = deque(maxlen=queue_size)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._finished_event = threading.Event()
+        self._finished = False
+        self._error = None
+
+    def stop(self) -> None:
+        """Stops the simulation after its current step, e.g. from the render function."""
+        self._stopped.set()
+
+    def run(self) -> SchedulerStats:
+        """Simulates and renders until the simulation is over or stopped, and returns what was achieved."""
+        self.stats = SchedulerStats()
+        self._finished = False
+        self._error = None
+        self._stopped.clear()
+        self._finished_event.clear()
+        start = time.perf_counter()
+
+        simulation = threading.Thread(target=self._simulate, args=(start,), name="pyorerun-simulation", daemon=True)
+        simulation.start()
+        try:
+            self._render_loop()
+        finally:
+            self._stopped.set()
+            simulation.join()
+            self.stats.wall_time = time.perf_counter() - start
+
+        if self._error is not None:
+            raise self._error
+        return self.stats
+
+    def _simulate(self, start: float) -> None:
+        try:
+            while not self._stopped.is_set():
+                produced = self.step()
+                if produced is None:
+                    break
+                simulated_time, state = produced
+                with self._lock:
+                    if len(self._states) == self._states.maxlen:
+                        self.stats.nb_skipped += 1
+                    self._states.append((simulated_time, state))
+                    self.stats.nb_steps += 1
+                    self.stats.simulated_time = simulated_time - self.start_time
+
+                if self.real_time_factor is not None:
+                    # the deadline of each step is from the start, so the delays never accumulate
+                    deadline = start + (simulated_time - self.start_time) / self.real_time_factor
+                    time.sleep(max(0.0, deadline - time.perf_counter()))
+        except Exception as error:
+            self._error = error
+        finally:
+            with self._lock:
+                self._finished = True
+            # the last state is displayed without waiting for the next display frame
+            self._finished_event.set()
+
+    def _render_loop(self) -> None:
+        next_frame = time.perf_counter()
+        while True:
+            self._finished_event.wait(max(0.0, next_frame - time.perf_counter()))
+            with self._lock:
+                states = list(self._states)
+                self._states.clear()
+                finished = self._finished
+                # the simulation thread counts the skipped states too
+                self.stats.nb_skipped += max(len(states) - 1, 0)
+
+            if states:
+                self.render(*states[-1])
+                self.stats.nb_rendered += 1
+            elif finished:
+                return
+
+            # a late frame is not caught up with a burst of renders
+            next_frame = max(next_frame + self.display_period, time.perf_counter())
@@ -0,0 +1,32 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+import rerun as rr
+
+
+def current_recording_id() -> str | None:
+    """The id of the recording logged to in this thread, None without any recording."""
+    recording = rr.get_data_recording()
+    return None if recording is None else recording.get_recording_id()
+
+
+@contextmanager
+def active_recording(recording: rr.RecordingStream | None) -> Iterator[None]:
+    """
+    Makes a recording the one logged to by the components in this thread, e.g. the recording of a phase,
+    the previous one being restored at the end. The current one is kept if None, by default the global one of rr.init.
+    Unlike the context of the recording itself, it can be nested, and entered by several threads at once.
+
+    Parameters
+    ----------
+    recording: rr.RecordingStream | None
+        The recording to log to.
+    """
+    if recording is None:
+        yield
+        return
+    previous = rr.set_thread_local_data_recording(recording)
+    try:
+        yield
+    finally:
+        rr.set_thread_local_data_recording(previous)
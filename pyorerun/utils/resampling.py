@@ -0,0 +1,95 @@
+import numpy as np
+
+RESAMPLING_MODES = ("interpolate", "peak")
+
+
+def resample(
+    values: np.ndarray,
+    times: np.ndarray,
+    target_times: np.ndarray,
+    mode: str = "interpolate",
+    peak_magnitude: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Resamples a time series to other time instants, whatever the ratio between the two rates.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        The time series, the last axis being the samples, e.g. (3, n_samples) for a force or a center of pressure.
+    times: np.ndarray
+        The increasing time of each sample.
+    target_times: np.ndarray
+        The increasing time instants to resample to.
+    mode: str
+        "interpolate" to linearly interpolate the samples around each target time, a NaN sample giving NaN values.
+        "peak" to keep, for each target time, the sample of largest magnitude among those closer to this target time
+        than to the others, so that short peaks such as impacts survive the decimation.
+        A target time without any sample close to it is interpolated.
+    peak_magnitude: np.ndarray
+        The magnitude (n_samples,) compared in "peak" mode, the norm of the values along their first axis if None.
+        The magnitude of a force is usually given to resample its center of pressure with the same samples.
+
+    Returns
+    -------
+    np.ndarray
+        The resampled time series, (..., n_target_times).
+    """
+    if mode not in RESAMPLING_MODES:
+        raise ValueError(f"mode={mode} is not supported. Please use one of {RESAMPLING_MODES}.")
+    values = np.asarray(values, dtype=float)
+    times = np.asarray(times, dtype=float)
+    target_times = np.asarray(target_times, dtype=float)
+    if values.shape[-1] != times.shape[0]:
+        raise ValueError(f"The values have {values.shape[-1]} samples but {times.shape[0]} times are given.")
+
+    resampled = interpolate(values, times, target_times)
+    if mode == "interpolate":
+        return resampled
+
+    if peak_magnitude is None:
+        peak_magnitude = np.linalg.norm(values.reshape(-1, values.shape[-1]), axis=0)
+    samples, targets = peak_samples(times, target_times, peak_magnitude)
+    resampled[..., targets] = values[..., samples]
+    return resampled
+
+
+def interpolate(values: np.ndarray, times: np.ndarray, target_times: np.ndarray) -> np.ndarray:
+    """Linear interpolation of every channel at once, the first and last samples being held outside of times."""
+    if times.shape[0] == 1:
+        return np.repeat(values, target_times.shape[0], axis=-1)
+
+    after = np.clip(np.searchsorted(times, target_times, side="right"), 1, times.shape[0] - 1)
+    before = after - 1
+    weights = np.clip((target_times - times[before]) / (times[after] - times[before]), 0, 1)
+
+    interpolated = values[..., before] * (1 - weights)
+    # a weight of 0 must not propagate the NaN of the next sample, e.g. the center of pressure lifting off
+    interpolated += np.where(weights > 0, values[..., after] * weights, 0)
+    return np.where(weights < 1, interpolated, values[..., after])
+
+
+def peak_samples(times: np.ndarray, target_times: np.ndarray, magnitude: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The sample of largest magnitude closest to each target time, vectorized with one sort.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The indices of the selected samples, and of the target times they are selected for.
+        The target times without any sample are not returned.
+    """
+    # each sample belongs to the closest target time, the edges being halfway between two target times
+    edges = (target_times[1:] + target_times[:-1]) / 2
+    bins = np.searchsorted(edges, times)
+    in_range = (times >= 2 * target_times[0] - edges[0]) if edges.shape[0] else np.ones(times.shape[0], dtype=bool)
+    if edges.shape[0]:
+        in_range &= times <= 2 * target_times[-1] - edges[-1]
+
+    magnitude = np.where(np.isnan(magnitude), -np.inf, magnitude)
+    candidates = np.flatnonzero(in_range)
+    # sorted by bin, then by decreasing magnitude, the first sample of each bin is its peak
+    order = candidates[np.lexsort((-magnitude[candidates], bins[candidates]))]
+    first_of_bin = np.concatenate(([True], bins[order][1:] != bins[order][:-1])) if order.shape[0] else order
+    samples = order[first_of_bin]
+    return samples, bins[samples]
@@ -0,0 +1,113 @@
+import threading
+
+import numpy as np
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+class FrameRingBuffer:
+    """
+    A preallocated ring buffer of timestamped frames, e.g. the q of a model, written by producer threads
+    and drained at once by a consumer thread. No array is allocated when a frame is pushed.
+
+    Attributes
+    ----------
+    nb_dropped : int
+        The number of frames dropped because the buffer was full or closed.
+    """
+
+    def __init__(self, capacity: int, frame_size: int, policy: str = "drop_oldest"):
+        """
+        Parameters
+        ----------
+        capacity : int
+            The maximal number of frames waiting to be drained.
+        frame_size : int
+            The number of values of a frame.
+        policy : str
+            What to do with a frame pushed in a full buffer: "drop_oldest" to overwrite the oldest frame,
+            "drop_newest" to reject the pushed frame, or "block" to wait until a frame is drained (backpressure).
+        """
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"policy={policy} is not supported. Please use one of {OVERFLOW_POLICIES}.")
+        if capacity < 1:
+            raise ValueError(f"The capacity must be at least 1, got {capacity}.")
+        self.capacity = capacity
+        self.policy = policy
+        self.nb_dropped = 0
+
+        self._times = np.zeros(capacity)
+        self._frames = np.zeros((capacity, frame_size))
+        self._start = 0
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, t: float, frame: np.ndarray, timeout: float = None) -> bool:
+        """
+        Writes a frame at its time, following the overflow policy when the buffer is full.
+
+        Returns
+        -------
+        bool
+            False if the frame was dropped, i.e. rejected by "drop_newest", not written before the timeout,
+            or pushed in a closed buffer.
+        """
+        with self._condition:
+            if self._size == self.capacity:
+                if self.policy == "drop_newest":
+                    self.nb_dropped += 1
+                    return False
+                if self.policy == "drop_oldest":
+                    self._start = (self._start + 1) % self.capacity
+                    self._size -= 1
+                    self.nb_dropped += 1
+                elif not self._condition.wait_for(lambda: self._size < self.capacity or self._closed, timeout):
+                    self.nb_dropped += 1
+                    return False
+            if self._closed:
+                self.nb_dropped += 1
+                return False
+
+            index = (self._start + self._size) % self.capacity
+            self._times[index] = t
+            self._frames[index] = frame
+            self._size += 1
+            self._condition.notify_all()
+        return True
+
+    def drain(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Takes all the frames waiting, in the order they were pushed.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The times (n,) and the frames (n, frame_size).
+        """
+        with self._condition:
+            indices = (self._start + np.arange(self._size)) % self.capacity
+            times, frames = self._times[indices], self._frames[indices]
+            self._start = (self._start + self._size) % self.capacity
+            self._size = 0
+            self._condition.notify_all()
+        return times, frames
+
+    def wait(self, timeout: float = None) -> bool:
+        """Waits for a frame to be pushed, False if none came before the timeout or the buffer was closed."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._size > 0 or self._closed, timeout) and self._size > 0
+
+    def open(self) -> None:
+        """Accepts frames again after close, e.g. when a stream is restarted."""
+        with self._condition:
+            self._closed = False
+
+    def close(self) -> None:
+        """Releases the producers waiting for some space, the next frames being dropped."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
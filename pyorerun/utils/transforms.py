@@ -0,0 +1,61 @@
+import numpy as np
+
+
+def rotation_matrices_to_quaternions(rotation_matrices: np.ndarray) -> np.ndarray:
+    """
+    Converts a batch of rotation matrices to unit quaternions, in a vectorized way.
+    It follows the numerically stable branch selection of Shepperd's method, based on the largest diagonal term.
+
+    Parameters
+    ----------
+    rotation_matrices: np.ndarray
+        The rotation matrices, of shape (N, 3, 3).
+
+    Returns
+    -------
+    np.ndarray
+        The unit quaternions in the (x, y, z, w) convention of rerun, of shape (N, 4), with w >= 0.
+    """
+    m = np.asarray(rotation_matrices, dtype=float)
+    if m.ndim != 3 or m.shape[1:] != (3, 3):
+        raise ValueError(f"rotation_matrices must be of shape (N, 3, 3), got {m.shape}.")
+    nb_rotations = m.shape[0]
+    trace = m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2]
+    branch = np.argmax(np.column_stack((m[:, 0, 0], m[:, 1, 1], m[:, 2, 2], trace)), axis=1)
+
+    quaternions = np.empty((nb_rotations, 4))
+
+    w_is_largest = branch == 3
+    quaternions[w_is_largest, 0] = m[w_is_largest, 2, 1] - m[w_is_largest, 1, 2]
+    quaternions[w_is_largest, 1] = m[w_is_largest, 0, 2] - m[w_is_largest, 2, 0]
+    quaternions[w_is_largest, 2] = m[w_is_largest, 1, 0] - m[w_is_largest, 0, 1]
+    quaternions[w_is_largest, 3] = 1 + trace[w_is_largest]
+
+    rows = np.nonzero(~w_is_largest)[0]
+    i = branch[rows]
+    j = (i + 1) % 3
+    k = (j + 1) % 3
+    quaternions[rows, i] = 1 - trace[rows] + 2 * m[rows, i, i]
+    quaternions[rows, j] = m[rows, j, i] + m[rows, i, j]
+    quaternions[rows, k] = m[rows, k, i] + m[rows, i, k]
+    quaternions[rows, 3] = m[rows, k, j] - m[rows, j, k]
+
+    quaternions /= np.linalg.norm(quaternions, axis=1, keepdims=True)
+    quaternions[quaternions[:, 3] < 0] *= -1
+
+    return quaternions
+
+
+def quaternions_to_rotation_matrices(quaternions: np.ndarray) -> np.ndarray:
+    """
+    Converts a batch of unit quaternions (x, y, z, w) to rotation matrices of shape (N, 3, 3).
+    """
+    x, y, z, w = np.asarray(quaternions, dtype=float).T
+    return np.stack(
+        (
+            np.stack((1 - 2 * (y**2 + z**2), 2 * (x * y - z * w), 2 * (x * z + y * w)), axis=1),
+            np.stack((2 * (x * y + z * w), 1 - 2 * (x**2 + z**2), 2 * (y * z - x * w)), axis=1),
+            np.stack((2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x**2 + y**2)), axis=1),
+        ),
+        axis=1,
+    )
@@ -0,0 +1,65 @@
+import io
+
+import numpy as np
+
+TRC_HEADER_LINES = 5
+
+
+def read_trc(filename: str, frame_range: tuple[int, int] = None) -> dict:
+    """
+    Reads a TRC file, parsing its header and then its numeric block in one bulk NumPy parse.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the TRC file
+    frame_range : tuple[int, int], optional
+        The rows to load as (start, stop), stop excluded, all of them if None
+
+    Returns
+    -------
+    dict
+        "markers" (3, n_markers, n_frames) with NaN for the missing markers, "marker_names", "time",
+        "frames" (the Frame# column), "units" and "rate".
+    """
+    with open(filename, "r") as file:
+        header = [file.readline() for _ in range(TRC_HEADER_LINES)]
+        text = file.read()
+
+    keys = header[1].rstrip("\r\n").split("\t")
+    values = header[2].rstrip("\r\n").split("\t")
+    properties = {key.strip(): value.strip() for key, value in zip(keys, values) if key.strip()}
+
+    nb_markers = int(properties["NumMarkers"])
+    marker_fields = header[3].rstrip("\r\n").split("\t")[2:]
+    marker_names = [marker_fields[3 * i].strip() for i in range(nb_markers)]
+
+    lines = text.lstrip("\r\n").splitlines()
+    start, stop = (0, len(lines)) if frame_range is None else frame_range
+    text = "\n".join(line for line in lines[start:stop] if line.strip())
+    text = _fill_missing_fields(text)
+
+    data = np.loadtxt(
+        io.StringIO(text),
+        delimiter="\t",
+        usecols=range(2 + 3 * nb_markers),
+        ndmin=2,
+        dtype=float,
+    )
+
+    return {
+        "markers": data[:, 2:].reshape(-1, nb_markers, 3).transpose(2, 1, 0),
+        "marker_names": marker_names,
+        "time": data[:, 1],
+        "frames": data[:, 0].astype(int),
+        "units": properties.get("Units", "mm"),
+        "rate": float(properties["DataRate"]) if "DataRate" in properties else None,
+    }
+
+
+def _fill_missing_fields(text: str) -> str:
+    """An empty field, between two tabs or before the end of a line, is a missing marker coordinate."""
+    # the replacements do not overlap, a second pass fills the runs of consecutive empty fields
+    text = text.replace("\t\t", "\tnan\t").replace("\t\t", "\tnan\t")
+    text = text.replace("\t\n", "\tnan\n")
+    return text + "nan" if text.endswith("\t") else text
@@ -1,5 +1,5 @@
 from .force_vector import ForceVector, VectorXp
 from .markers import MarkersXp
 from .persistent_marker_options import PersistentMarkerOptions
-from .timeseries_q import TimeSeriesQ, OsimTimeSeries
-from .video import Video
+from .timeseries_q import TimeSeriesQ, OsimTimeSeries, MotTimeSeries
+from .video import Video, VideoFile
@@ -47,8 +47,8 @@ class Vector(ExperimentalData, ABC):
         return {
             self.name: [
                 *rr.Arrows3D.columns(
-                    origins=self.vector_origins.T.tolist(),
-                    vectors=self.vector_magnitude.T.tolist(),
+                    origins=self.vector_origins.T,
+                    vectors=self.vector_magnitude.T,
                     colors=[VECTOR_COLOR for _ in range(self.nb_frames)],
                 )
             ]
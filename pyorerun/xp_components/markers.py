@@ -4,6 +4,7 @@ from ..pyomarkers import PyoMarkers
 
 from ..abstract.abstract_class import ExperimentalData
 from ..abstract.markers import Markers, MarkerProperties
+from ..utils.keyframes import KeyframeColumns, KeyframeTolerances, marker_keyframes
 
 
 class MarkersXp(Markers, ExperimentalData):
@@ -22,7 +23,7 @@ class MarkersXp(Markers, ExperimentalData):
 
         self.name = name + "/markers"
         self.markers = markers
-        self.markers_numpy = markers.to_numpy()
+        self.markers_numpy = markers.to_numpy(homogeneous=False)
         self.markers_properties = MarkerProperties(
             marker_names=markers.channel.values.tolist(),
             radius=0.01,
@@ -85,24 +86,29 @@ class MarkersXp(Markers, ExperimentalData):
             show_labels=self.markers_properties.show_labels_to_rerun(),
         )
 
-    def to_chunk(self, **kwargs) -> dict[str, list]:
-        # flatten the markers to 3 x (nb_markers * nb_frames)
-        flattened_markers = self.markers_numpy[:3, :, :].transpose(2, 1, 0).reshape(-1, 3)
-        marker_names = self.marker_names * self.nb_frames
-        partition = [self.nb_markers for _ in range(self.nb_frames)]
+    def to_chunk(self, tolerances: KeyframeTolerances = None, **kwargs) -> dict[str, KeyframeColumns]:
+        frames = marker_keyframes(self.markers_numpy[:3, :, :], tolerances)
+        nb_frames = frames.shape[0]
+        # flatten the markers to 3 x (nb_markers * nb_keyframes)
+        flattened_markers = self.markers_numpy[:3, :, frames].transpose(2, 1, 0).reshape(-1, 3)
+        marker_names = self.marker_names * nb_frames
+        partition = [self.nb_markers for _ in range(nb_frames)]
 
         return {
-            self.name: [
-                *rr.Points3D.columns(
-                    positions=flattened_markers,
-                    labels=marker_names,
-                ).partition(partition),
-                *rr.Points3D.columns(
-                    colors=[self.markers_properties.color for _ in range(self.nb_frames)],
-                    radii=[self.markers_properties.radius for _ in range(self.nb_frames)],
-                    show_labels=[self.markers_properties.show_labels for _ in range(self.nb_frames)],
-                ),
-            ]
+            self.name: KeyframeColumns(
+                frames=frames,
+                columns=[
+                    *rr.Points3D.columns(
+                        positions=flattened_markers,
+                        labels=marker_names,
+                    ).partition(partition),
+                    *rr.Points3D.columns(
+                        colors=[self.markers_properties.color for _ in range(nb_frames)],
+                        radii=[self.markers_properties.radius for _ in range(nb_frames)],
+                        show_labels=[self.markers_properties.show_labels for _ in range(nb_frames)],
+                    ),
+                ],
+            )
         }
 
 
@@ -46,7 +46,7 @@ class PersistentMarkerOptions(MarkerProperties):
             The current frame index.
         """
         n = self.nb_frames
-        start = max(0, frame_idx - n + 1)
+        start = 0 if n is None else max(0, frame_idx - n + 1)
         return list(range(start, frame_idx + 1))
 
     def all_frames_to_keep(self, total_frames: int) -> list[list[int]]:
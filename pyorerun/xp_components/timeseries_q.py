@@ -1,12 +1,11 @@
 import numpy as np
 import rerun as rr
 
-try:
-    import opensim as osim
-except ImportError:
-    pass
 from ..abstract.abstract_class import ExperimentalData
 from ..abstract.q import QProperties
+from ..utils.recording import current_recording_id
+from ..utils.keyframes import KeyframeColumns
+from ..utils.mot_file import read_mot
 
 
 class OsimTimeSeries:
@@ -49,6 +48,8 @@ class OsimTimeSeries:
         return self.motion_data.getColumnLabels()
 
     def initialize_file(self):
+        import opensim as osim
+
         self.motion_data = osim.TimeSeriesTable(self.mot_file)
 
     @property
@@ -69,10 +70,8 @@ class OsimTimeSeries:
             raise ValueError(
                 "The original .mot file is not in degrees. Please set the osim_model before calling this method."
             )
-        q_tmp = self.q.copy()
-        for q_idx, q in enumerate(q_tmp):
-            q_tmp[q_idx] = np.rad2deg(q) if self.motion_types[q_idx] == 1 else q
-        return self.q
+        is_rotation = np.array(self.motion_types) == 1
+        return np.where(is_rotation[:, np.newaxis], np.rad2deg(self.q), self.q)
 
     @property
     def q_in_radian(self):
@@ -85,10 +84,8 @@ class OsimTimeSeries:
             raise ValueError(
                 "The original .mot file is in degrees. Please set the osim_model before calling this method."
             )
-        q_tmp = self.q.copy()
-        for q_idx, q in enumerate(q_tmp):
-            q_tmp[q_idx] = np.deg2rad(q) if self.motion_types[q_idx] != 2 else q
-        return q_tmp
+        is_translation = np.array(self.motion_types) == 2
+        return np.where(is_translation[:, np.newaxis], self.q, np.deg2rad(self.q))
 
     def set_opensim_model(self, osim_model: any):
         """
@@ -96,19 +93,121 @@ class OsimTimeSeries:
         """
         if osim_model is None:
             return
-        self.osim_model = osim_model if not isinstance(osim_model, str) else osim.Model(osim_model)
+        if isinstance(osim_model, str):
+            import opensim as osim
+
+            osim_model = osim.Model(osim_model)
+        self.osim_model = osim_model
         coordinates_ordered = [
             self.osim_model.getCoordinateSet().get(coordinate) for coordinate in self.coordinate_names
         ]
         self.motion_types = [coordinate.getMotionType() for coordinate in coordinates_ordered]
 
 
+class MotTimeSeries:
+    """
+    A time series of generalized coordinates q read from a .mot or .sto file, without OpenSim.
+    The coordinates are mapped to the degrees of freedom of a model, whatever the model interface.
+    """
+
+    def __init__(self, mot_file: str, model: "AbstractModel" = None):
+        """
+        Parameters
+        ----------
+        mot_file : str
+            The path to the .mot or .sto file.
+        model : AbstractModel
+            The model whose degrees of freedom the coordinates are mapped to, and converted to radians.
+        """
+        self.mot_file = mot_file
+        self.model = None
+        self.initialize_file()
+        self.set_model(model)
+
+    def initialize_file(self):
+        self.motion_data = read_mot(self.mot_file)
+
+    @property
+    def is_degree(self) -> bool:
+        """
+        Returns True if the rotations of the .mot file are in degrees, False otherwise.
+        """
+        return self.motion_data["in_degrees"]
+
+    @property
+    def times(self) -> np.ndarray:
+        """
+        Returns the time series of the .mot file.
+        """
+        return self.motion_data["time"]
+
+    @property
+    def coordinate_names(self) -> tuple[str, ...]:
+        """
+        Returns the names of the coordinates in the .mot file.
+        """
+        return self.motion_data["coordinate_names"]
+
+    @property
+    def q(self) -> np.ndarray:
+        """
+        Returns the time series of the generalized coordinates q, in the order and the units of the file.
+        """
+        return self.motion_data["q"]
+
+    @property
+    def q_in_radian(self) -> np.ndarray:
+        """
+        Returns the generalized coordinates q in the degrees of freedom order of the model, rotations in radians.
+        Without model, the coordinates are kept in the order of the file.
+        """
+        if self.model is not None:
+            return self.to_q(self.model)
+        if self.is_degree:
+            raise ValueError("The original .mot file is in degrees. Please set the model before calling this method.")
+        return self.q
+
+    def set_model(self, model: "AbstractModel"):
+        """
+        Set the model to be used for the mapping and the conversion.
+        """
+        if model is None:
+            return
+        self.model = model
+
+    def to_q(self, model: "AbstractModel") -> np.ndarray:
+        """
+        Maps the coordinates of the file to the degrees of freedom of the model, rotations in radians.
+
+        Parameters
+        ----------
+        model : AbstractModel
+            The model, all its degrees of freedom must be in the file.
+
+        Returns
+        -------
+        np.ndarray
+            The generalized coordinates q (model.nb_q, n_frames).
+        """
+        missing = [name for name in model.dof_names if name not in self.coordinate_names]
+        if missing:
+            raise ValueError(f"The degrees of freedom {missing} of the model are not in {self.mot_file}.")
+
+        indices = [self.coordinate_names.index(name) for name in model.dof_names]
+        q = self.q[indices, :]
+        if not self.is_degree:
+            return q
+
+        is_translation = np.array(model.dof_is_translation, dtype=bool)
+        return np.where(is_translation[:, np.newaxis], q, np.deg2rad(q))
+
+
 class TimeSeriesQ(ExperimentalData):
     def __init__(self, name, q: np.ndarray, properties: QProperties):
         self.name = name
         self.q = q
         self.properties = properties
-        self.properties.set_time_series(base_name="dontknow")
+        self._styles_recording_id = None
 
     @property
     def nb_q(self):
@@ -127,41 +226,45 @@ class TimeSeriesQ(ExperimentalData):
         return 1
 
     def initialize(self):
-        pass
+        self.log_styles()
+
+    def log_styles(self) -> None:
+        """Logs the static styles of the series, unless they are already logged in the current recording."""
+        recording_id = current_recording_id()
+        if recording_id is not None and recording_id == self._styles_recording_id:
+            return
+        self.properties.set_time_series(base_name=self.name)
+        self._styles_recording_id = recording_id
+
+    @property
+    def range_frames(self) -> list[int]:
+        """The frames at which the constant ranges are logged, the first and last ones drawing the whole line."""
+        return [0, self.nb_frames - 1]
 
     def to_rerun(self, frame: int) -> None:
-        if self.properties.ranges is None:
-            for joint_idx in range(self.nb_q):
-                name = f"{self.properties.displayed_joint_names[joint_idx]}"
-                rr.log(
-                    f"{name}/value",
-                    rr.SeriesLine(color=self.properties.value_color, name="q", width=self.properties.width),
-                )
-                rr.log(f"{name}/value", rr.Scalar(self.q[joint_idx, frame]))
-        else:
-            for joint_idx in range(self.nb_q):
-                name = f"{self.properties.displayed_joint_names[joint_idx]}"
+        self.log_styles()
+        for joint_idx in range(self.nb_q):
+            name = f"{self.properties.displayed_joint_names[joint_idx]}"
+            rr.log(f"{name}/value", rr.Scalars(self.q[joint_idx, frame]))
+            if self.properties.ranges is not None and frame in self.range_frames:
                 qmin, qmax = self.properties.ranges[joint_idx]
-                #  todo: this log calls should be done once for all somewhere in the properties of Q
-                rr.log(
-                    f"{name}/min",
-                    rr.SeriesLine(color=self.properties.min_color, name="min", width=self.properties.width),
-                )
-                rr.log(
-                    f"{name}/max",
-                    rr.SeriesLine(color=self.properties.max_color, name="max", width=self.properties.width),
-                )
-                rr.log(
-                    f"{name}/value",
-                    rr.SeriesLine(color=self.properties.value_color, name="q", width=self.properties.width),
-                )
-                self.to_serie_line(name=name, min=qmin, max=qmax, val=self.q[joint_idx, frame])
+                rr.log(f"{name}/min", rr.Scalars(qmin))
+                rr.log(f"{name}/max", rr.Scalars(qmax))
 
     @staticmethod
     def to_serie_line(name: str, min: float, max: float, val: float):
-        rr.log(f"{name}/min", rr.Scalar(min))
-        rr.log(f"{name}/max", rr.Scalar(max))
-        rr.log(f"{name}/value", rr.Scalar(val))
+        rr.log(f"{name}/min", rr.Scalars(min))
+        rr.log(f"{name}/max", rr.Scalars(max))
+        rr.log(f"{name}/value", rr.Scalars(val))
 
-    def to_chunk(self):
-        pass
+    def to_chunk(self, **kwargs) -> dict[str, list | KeyframeColumns]:
+        frames = np.array(self.range_frames)
+        output = {}
+        for joint_idx in range(self.nb_q):
+            name = f"{self.properties.displayed_joint_names[joint_idx]}"
+            output[f"{name}/value"] = [*rr.Scalars.columns(scalars=self.q[joint_idx, :])]
+            if self.properties.ranges is not None:
+                qmin, qmax = self.properties.ranges[joint_idx]
+                output[f"{name}/min"] = KeyframeColumns(frames, [*rr.Scalars.columns(scalars=np.full(2, qmin))])
+                output[f"{name}/max"] = KeyframeColumns(frames, [*rr.Scalars.columns(scalars=np.full(2, qmax))])
+        return output
@@ -1,7 +1,13 @@
+from typing import Iterator
+
 import numpy as np
 import rerun as rr
 
 from ..abstract.abstract_class import ExperimentalData
+from ..utils.keyframes import KeyframeColumns
+
+# the size of the frames sent at once, which bounds the memory whatever the video length
+VIDEO_WINDOW_BYTES = 64 * 1024**2
 
 
 class Video(ExperimentalData):
@@ -26,20 +32,7 @@ class Video(ExperimentalData):
         return 1
 
     def initialize(self):
-        format_static = rr.components.ImageFormat(
-            width=self.nb_horizontal_pixels(),
-            height=self.nb_vertical_pixels(),
-            color_model="RGB",
-            channel_datatype="U8",
-        )
-        image_zero = rr.Image.from_fields(
-            format=format_static,
-        )
-        rr.log(
-            self.name,
-            image_zero,
-            static=True,
-        )
+        log_image_format(self.name, width=self.nb_horizontal_pixels(), height=self.nb_vertical_pixels())
 
     def to_rerun(self, frame: int) -> None:
         rr.log(
@@ -52,11 +45,235 @@ class Video(ExperimentalData):
             self.video[frame, :, :, :],
         )
 
-    def to_chunk(self, **kwargs) -> dict[str, list]:
-        return {
-            self.name: [
-                *rr.Image.columns(
-                    buffer=[self.video[f, :, :, :].tolist() for f in range(self.nb_frames)],
-                )
-            ]
-        }
+    def to_chunk(self, **kwargs) -> dict[str, Iterator[KeyframeColumns]]:
+        return {self.name: self._windows()}
+
+    def _windows(self) -> Iterator[KeyframeColumns]:
+        window_size = frames_by_window(self.video[0].nbytes)
+        for start in range(0, self.nb_frames, window_size):
+            frames = np.arange(start, min(start + window_size, self.nb_frames))
+            yield image_columns(frames, self.video[frames[0] : frames[-1] + 1])
+
+
+class VideoFile(ExperimentalData):
+    """
+    A video streamed from its file instead of being decoded in memory.
+    The videos that rerun can play (mp4) are logged once as an encoded asset, each frame referencing one of its
+    timestamps. The other ones, or the downscaled ones, are decoded and sent by windows of uint8 frames.
+    Only the frames from the first displayed one to the last displayed one are decoded.
+
+    Attributes
+    ----------
+    name : str
+        The name of the entity
+    path : str
+        The path to the video file
+    timestamps_nanos : np.ndarray
+        The timestamp of every frame of the video file, in nanoseconds
+    frames : np.ndarray
+        The indices of the frames of the video file to display, in increasing order
+    width : int
+        The width of the displayed frames, in pixels
+    height : int
+        The height of the displayed frames, in pixels
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        frames: np.ndarray | slice = None,
+        mode: str = "auto",
+        frame_rate: float = None,
+        max_resolution: tuple[int, int] = None,
+    ):
+        """
+        Parameters
+        ----------
+        name : str
+            The name of the entity
+        path : str
+            The path to the video file
+        frames : np.ndarray | slice
+            The frames of the video file to display, all of them if None
+        mode : str
+            "asset" to log the encoded video, "decode" to decode its frames,
+            "auto" to log the encoded video when rerun supports its format and it is not downscaled, decode it otherwise
+        frame_rate : float
+            The frame rate to resample the displayed frames to, the frame rate of the file if None
+        max_resolution : tuple[int, int]
+            The maximal (width, height) of the displayed frames, downscaled while decoding with their aspect ratio kept
+        """
+        if mode not in ("auto", "asset", "decode"):
+            raise ValueError(f"mode={mode} is not supported. Please use 'auto', 'asset' or 'decode'.")
+        if mode == "asset" and max_resolution is not None:
+            raise ValueError("An encoded video asset can not be downscaled. Please use mode='decode' or 'auto'.")
+
+        self.name = name
+        self.path = str(path)
+        self.asset = None
+        self._reader = None
+
+        if mode != "decode" and max_resolution is None:
+            try:
+                self.asset = rr.AssetVideo(path=self.path)
+                self.timestamps_nanos = np.asarray(self.asset.read_frame_timestamps_nanos(), dtype=np.int64)
+            except RuntimeError:
+                if mode == "asset":
+                    raise
+                self.asset = None
+
+        if self.asset is None:
+            import imageio
+
+            reader = imageio.get_reader(self.path, "ffmpeg")
+            metadata = reader.get_meta_data()
+            self.fps = metadata["fps"]
+            self.timestamps_nanos = np.round(np.arange(reader.count_frames()) * 1e9 / self.fps).astype(np.int64)
+            self.width, self.height = downscaled_size(*metadata["size"], max_resolution)
+            self.is_downscaled = (self.width, self.height) != tuple(metadata["size"])
+            reader.close()
+
+        self.frames = np.arange(self.timestamps_nanos.shape[0])
+        if frames is not None:
+            self.select(frames)
+        if frame_rate is not None:
+            self.resample(frame_rate)
+
+    @property
+    def is_asset(self) -> bool:
+        return self.asset is not None
+
+    @property
+    def frame_times(self) -> np.ndarray:
+        """The time of the displayed frames in seconds, from the beginning of the video file."""
+        return self.timestamps_nanos[self.frames] / 1e9
+
+    @property
+    def nb_frames(self) -> int:
+        return self.frames.shape[0]
+
+    @property
+    def nb_components(self):
+        return 1
+
+    def select(self, frames: np.ndarray | slice) -> None:
+        """Keeps some of the displayed frames, e.g. to crop the video, indexed among the displayed frames."""
+        self.frames = self.frames[frames]
+        if self.nb_frames == 0:
+            raise ValueError(f"No frame of {self.path} is selected.")
+
+    def resample(self, frame_rate: float) -> None:
+        """Keeps the displayed frames the closest to a regular time grid at frame_rate, never duplicating a frame."""
+        if frame_rate <= 0:
+            raise ValueError(f"The frame rate must be positive, got {frame_rate}.")
+        times = self.frame_times
+        grid = np.arange(times[0], times[-1] + 1e-9, 1 / frame_rate)
+        self.frames = self.frames[np.unique(nearest_frames(times, grid))]
+
+    def align(self, t_span: np.ndarray) -> None:
+        """Displays, at each instant of t_span from the beginning of the video, the closest frame."""
+        self.frames = self.frames[nearest_frames(self.frame_times, t_span)]
+
+    def _open_reader(self, first_frame: int = 0):
+        """Opens the video, scaled by ffmpeg while decoding, and seeked to first_frame without decoding before it."""
+        input_params = []
+        if first_frame > 0:
+            # half a frame before, so that the rounding of the timestamps never skips the first frame
+            input_params = ["-ss", f"{(first_frame - 0.5) / self.fps:.6f}"]
+        import imageio
+
+        return imageio.get_reader(
+            self.path,
+            "ffmpeg",
+            size=(self.width, self.height) if self.is_downscaled else None,
+            input_params=input_params,
+        )
+
+    @property
+    def reader(self):
+        if self._reader is None:
+            self._reader = self._open_reader()
+        return self._reader
+
+    def initialize(self):
+        if self.is_asset:
+            rr.log(self.name, self.asset, static=True)
+        else:
+            log_image_format(self.name, width=self.width, height=self.height)
+
+    def to_rerun(self, frame: int) -> None:
+        if self.is_asset:
+            rr.log(self.name, rr.VideoFrameReference(nanoseconds=self.timestamps_nanos[self.frames[frame]]))
+        else:
+            rr.log(self.name, rr.Image(self.reader.get_data(self.frames[frame])))
+
+    def to_chunk(self, **kwargs) -> dict[str, list | Iterator[KeyframeColumns]]:
+        if self.is_asset:
+            return {self.name: [*rr.VideoFrameReference.columns_nanos(self.timestamps_nanos[self.frames])]}
+        return {self.name: self._decoded_windows()}
+
+    def _decoded_windows(self) -> Iterator[KeyframeColumns]:
+        """
+        Decodes the video once, sequentially from the first displayed frame to the last one,
+        and only keeps a window of the displayed frames in memory.
+        A frame displayed several times, e.g. aligned on a faster time span, is decoded once.
+        """
+        first_frame = int(self.frames[0])
+        # the number of times each decoded frame is displayed
+        repeats = np.bincount(self.frames - first_frame)
+
+        window_size = frames_by_window(self.width * self.height * 3)
+        reader = self._open_reader(first_frame)
+        window = []
+        displayed_frame = 0
+        for video_frame, image in enumerate(reader):
+            if video_frame >= repeats.shape[0]:
+                break
+            window += [image] * int(repeats[video_frame])
+            if len(window) >= window_size:
+                yield image_columns(np.arange(displayed_frame, displayed_frame + len(window)), np.stack(window))
+                displayed_frame += len(window)
+                window = []
+        reader.close()
+
+        if window:
+            yield image_columns(np.arange(displayed_frame, displayed_frame + len(window)), np.stack(window))
+
+
+def nearest_frames(times: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """The index of the closest of the increasing times for each target, vectorized with a binary search."""
+    if times.shape[0] == 1:
+        return np.zeros(targets.shape[0], dtype=int)
+    after = np.clip(np.searchsorted(times, targets), 1, times.shape[0] - 1)
+    before = after - 1
+    return np.where(targets - times[before] <= times[after] - targets, before, after)
+
+
+def downscaled_size(width: int, height: int, max_resolution: tuple[int, int] = None) -> tuple[int, int]:
+    """The size of the frames once fitted in max_resolution (width, height), the aspect ratio being kept."""
+    if max_resolution is None:
+        return width, height
+    scale = min(1.0, max_resolution[0] / width, max_resolution[1] / height)
+    return max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+
+
+def frames_by_window(frame_bytes: int) -> int:
+    return max(1, VIDEO_WINDOW_BYTES // frame_bytes)
+
+
+def log_image_format(name: str, width: int, height: int) -> None:
+    """Logs the format of the uint8 RGB frames of a video once, so that each frame only sends its pixels."""
+    format_static = rr.components.ImageFormat(
+        width=width,
+        height=height,
+        color_model="RGB",
+        channel_datatype="U8",
+    )
+    rr.log(name, rr.Image.from_fields(format=format_static), static=True)
+
+
+def image_columns(frames: np.ndarray, images: np.ndarray) -> KeyframeColumns:
+    """The uint8 images (n_frames, height, width, 3) as raw buffers, without any conversion to python lists."""
+    images = np.ascontiguousarray(images, dtype=np.uint8)
+    return KeyframeColumns(frames, [*rr.Image.columns(buffer=images.reshape(images.shape[0], -1))])
@@ -18,10 +18,10 @@ class XpRerunPhase:
         for data in self.xp_data:
             data.to_rerun(frame)
 
-    def to_chunk(self) -> dict[str, list]:
+    def to_chunk(self, **kwargs) -> dict[str, list]:
         output = {}
         for data in self.xp_data:
-            output.update(data.to_chunk())
+            output.update(data.to_chunk(**kwargs))
         return output
 
     @property
@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+from pyorerun.utils.coalescing_worker import CoalescingWorker
+
+
+def test_coalescing_worker_drops_stale_values():
+    rendered = []
+
+    def render(value, changed):
+        rendered.append((value, changed))
+        time.sleep(0.02)
+
+    latencies = []
+    worker = CoalescingWorker(render, max_rate=1000, latency_callback=latencies.append)
+    worker.start()
+    for i in range(50):
+        worker.submit(i, changed=[i % 3])
+        time.sleep(0.001)
+    time.sleep(0.1)
+    worker.stop()
+
+    assert not worker.is_running
+    # the slow renders are not queued, the newest value always being rendered last
+    assert len(rendered) < 50
+    assert rendered[-1][0] == 49
+    assert worker.nb_rendered == len(rendered) == len(latencies) == len(worker.latencies)
+    assert worker.nb_rendered + worker.nb_dropped == 50
+    # the changed keys of the dropped values are rendered with the next value
+    assert set().union(*[changed for _, changed in rendered]) == {0, 1, 2}
+
+
+def test_coalescing_worker_max_rate():
+    render_times = []
+    worker = CoalescingWorker(lambda value, changed: render_times.append(time.perf_counter()), max_rate=20)
+    worker.start()
+    start = time.perf_counter()
+    while time.perf_counter() - start < 0.3:
+        worker.submit(None)
+        time.sleep(0.001)
+    worker.stop()
+
+    assert len(render_times) <= 8
+    assert min(b - a for a, b in zip(render_times[:-1], render_times[1:])) >= 0.05 - 1e-3
+
+
+def test_coalescing_worker_full_update():
+    rendered = []
+    worker = CoalescingWorker(lambda value, changed: rendered.append(changed))
+    worker.submit(0, changed=[1])
+    worker.submit(1)
+    worker.start()
+    time.sleep(0.05)
+    worker.stop()
+    assert rendered == [None]
+
+    with pytest.raises(ValueError, match="must be positive"):
+        CoalescingWorker(print, max_rate=0)
+
+
+def test_coalescing_worker_survives_a_failed_render():
+    rendered = []
+
+    def render(value, changed):
+        if value == 0:
+            raise RuntimeError("render failed")
+        rendered.append((value, changed))
+
+    errors = []
+    worker = CoalescingWorker(render, error_callback=errors.append)
+    worker.start()
+    worker.submit(0, changed=[0])
+    time.sleep(0.05)
+    worker.submit(1, changed=[1])
+    time.sleep(0.05)
+    assert worker.is_running
+    worker.stop()
+
+    assert [str(error) for error in errors] == ["render failed"]
+    assert worker.nb_errors == 1
+    # the failed render is followed by a full one
+    assert rendered == [(1, None)]
+
+    # without callback, the error is raised by stop
+    worker = CoalescingWorker(render)
+    worker.start()
+    worker.submit(0)
+    time.sleep(0.05)
+    assert worker.is_running
+    with pytest.raises(RuntimeError, match="render failed"):
+        worker.stop()
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from pyorerun import PyoMuscles
+from pyorerun.abstract.linestrip import LineStripProperties
+from pyorerun.utils import colormaps
+from pyorerun.utils.colormaps import apply_lut, colormap_lut
+
+
+def unpack(colors: np.ndarray) -> np.ndarray:
+    return np.stack([(colors >> shift) & 255 for shift in (24, 16, 8, 0)], axis=-1)
+
+
+def test_colormap_lut():
+    lut = colormap_lut("magma")
+    assert lut.shape == (256,)
+    assert lut.dtype == np.uint32
+    np.testing.assert_array_equal(unpack(lut[[0, -1]]), [[0, 0, 3, 255], [251, 252, 191, 255]])
+
+    lut = colormap_lut(np.array([[0, 0, 0], [255, 0, 0]]))
+    np.testing.assert_array_equal(unpack(lut[[0, 128, 255]]), [[0, 0, 0, 255], [128, 0, 0, 255], [255, 0, 0, 255]])
+
+    with pytest.raises(ValueError, match="must be \\(n, 3\\) or \\(n, 4\\)"):
+        colormap_lut(np.zeros(3))
+
+
+def test_colormap_lut_without_matplotlib(monkeypatch):
+    import builtins
+
+    real_import = builtins.__import__
+
+    def import_without_matplotlib(name, *args, **kwargs):
+        if name.startswith("matplotlib"):
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    with_matplotlib = colormap_lut("viridis")
+    monkeypatch.setattr(builtins, "__import__", import_without_matplotlib)
+    without_matplotlib = colormap_lut("viridis")
+    assert np.abs(unpack(without_matplotlib).astype(int) - unpack(with_matplotlib)).max() <= 6
+    with pytest.raises(ValueError, match="needs matplotlib"):
+        colormap_lut("twilight")
+
+
+def test_apply_lut():
+    lut = np.arange(256, dtype=np.uint32)
+    np.testing.assert_array_equal(apply_lut(np.array([[-1, 0, 0.5, 1, 2, np.nan]]), lut), [[0, 0, 128, 255, 255, 0]])
+
+
+def test_muscle_colors_to_rerun():
+    anchors = np.array(colormaps.COLORMAP_ANCHORS["magma"])
+    muscles = PyoMuscles(np.array([[0.0, 0.5, 1.0], [1.0, 1.0, 0.0]]), mvc=np.ones(2), colormap=anchors)
+    colors = muscles.to_colors()
+    assert colors.shape == (2, 3)
+    np.testing.assert_array_equal(unpack(colors[:, 0]), [[*anchors[0], 255], [*anchors[-1], 255]])
+
+    properties = LineStripProperties(strip_names=["m0", "m1"], radius=0.01, color=colors)
+    # the colors of the strips of a frame are consecutive
+    np.testing.assert_array_equal(properties.color_to_rerun(3), colors.T.ravel())
+    np.testing.assert_array_equal(properties.color_to_rerun(1), colors[:, 0])
+
+
+def test_muscle_colormap_type():
+    with pytest.raises(TypeError, match="colormap must be"):
+        PyoMuscles(np.ones((2, 3)), colormap=3)
@@ -0,0 +1,147 @@
+import numpy as np
+import rerun as rr
+
+from pyorerun.model_components.model_updapter import ModelUpdater
+from pyorerun.model_interfaces.abstract_model_interface import AbstractModelNoMesh, AbstractSegment
+from pyorerun.utils.dof_dependencies import dof_dependencies, kinematic_chain_dofs
+
+
+def test_dof_dependencies():
+    dependencies = dof_dependencies([(0,), (0, 2), None, ()], nb_q=3)
+    np.testing.assert_array_equal(dependencies, [[1, 0, 0], [1, 0, 1], [1, 1, 1], [0, 0, 0]])
+
+
+def test_kinematic_chain_dofs():
+    # a pelvis with 6 dofs, two thighs of 3 dofs attached to it, and a shank of 1 dof attached to the second thigh
+    parents = (None, 0, 0, 2)
+    nb_dofs = (6, 3, 3, 1)
+    assert kinematic_chain_dofs(0, parents, nb_dofs) == (0, 1, 2, 3, 4, 5)
+    assert kinematic_chain_dofs(1, parents, nb_dofs) == (0, 1, 2, 3, 4, 5, 6, 7, 8)
+    assert kinematic_chain_dofs(3, parents, nb_dofs) == (0, 1, 2, 3, 4, 5, 9, 10, 11, 12)
+
+    # a segment without dofs moves with its parent
+    assert kinematic_chain_dofs(1, (None, 0), (2, 0)) == (0, 1)
+
+
+class BranchedModel(AbstractModelNoMesh):
+    """
+    A planar trunk (dof 0) with an arm (dof 1) and a head (dof 2), each segment having two markers,
+    a muscle from the trunk to the arm and one from the trunk to the head. The evaluated markers and muscles are
+    recorded, and the markers of a segment only depend on its transform, to check the ones left untouched.
+    """
+
+    parents = (None, 0, 0)
+    marker_segments = (0, 0, 1, 1, 2, 2)
+    muscle_segments = ((0, 1), (0, 2))
+
+    def __init__(self):
+        super().__init__("branched")
+        self.evaluated_markers = []
+        self.evaluated_muscles = []
+
+    name = "branched"
+    nb_markers = 6
+    marker_names = tuple(f"marker_{i}" for i in range(6))
+    nb_segments = 3
+    segment_names = ("trunk", "arm", "head")
+    segments_with_mass = ()
+    segment_names_with_mass = ()
+    nb_ligaments = 0
+    ligament_names = ()
+    nb_muscles = 2
+    muscle_names = ("pectoralis", "sternocleidomastoid")
+    nb_q = 3
+    dof_names = ("trunk", "arm", "head")
+    q_ranges = ((-np.pi, np.pi),) * 3
+    gravity = np.array([0, 0, -9.81])
+    has_soft_contacts = False
+    has_rigid_contacts = False
+    soft_contacts_names = ()
+    rigid_contacts_names = ()
+    soft_contact_radii = ()
+
+    @property
+    def segments(self):
+        return tuple(BranchedSegment(name, i) for i, name in enumerate(self.segment_names))
+
+    def segment_dofs(self, segment_index):
+        return kinematic_chain_dofs(segment_index, self.parents, (1, 1, 1))
+
+    def segment_homogeneous_matrices_in_global(self, q, segment_index):
+        rt = np.eye(4)
+        for dof in self.segment_dofs(segment_index):
+            rotation = np.eye(4)
+            rotation[:2, :2] = [[np.cos(q[dof]), -np.sin(q[dof])], [np.sin(q[dof]), np.cos(q[dof])]]
+            rotation[:2, 3] = (0, 0.5) if dof > 0 else (0, 0)
+            rt = rt @ rotation
+        return rt
+
+    def markers(self, q, indices=None):
+        indices = range(self.nb_markers) if indices is None else indices
+        self.evaluated_markers.append(list(indices))
+        return np.array(
+            [self.segment_homogeneous_matrices_in_global(q, self.marker_segments[i])[:3, 3] + i for i in indices]
+        )
+
+    def centers_of_mass(self, q):
+        return np.zeros((0, 3))
+
+    def soft_contacts(self, q):
+        return np.zeros((0, 3))
+
+    def rigid_contacts(self, q):
+        return np.zeros((0, 3))
+
+    def ligament_strips(self, q, indices=None):
+        return []
+
+    def muscle_strips(self, q, indices=None):
+        indices = range(self.nb_muscles) if indices is None else indices
+        self.evaluated_muscles.append(list(indices))
+        markers = {i: self.segment_homogeneous_matrices_in_global(q, i)[:3, 3].tolist() for i in range(3)}
+        return [[markers[segment] for segment in self.muscle_segments[i]] for i in indices]
+
+
+class BranchedSegment(AbstractSegment):
+    def __init__(self, name, index):
+        self._name = name
+        self._index = index
+
+    name = property(lambda self: self._name)
+    id = property(lambda self: self._index)
+    has_mesh = False
+    has_meshlines = False
+    mesh_path = []
+    mesh_scale_factor = []
+    mass = 0.0
+
+
+def test_moving_a_leaf_dof_only_updates_its_markers_and_muscles():
+    rr.init("test_moving_a_leaf_dof_only_updates_its_markers_and_muscles")
+    rr.memory_recording()
+    model = BranchedModel()
+    model_updater = ModelUpdater("branched", model)
+
+    q = np.zeros(3)
+    model_updater.to_rerun(q)
+    trunk_and_arm_markers = model_updater.markers._markers[:4].copy()
+    assert model.evaluated_markers == [[0, 1, 2, 3, 4, 5]]
+
+    # the head dof only moves the markers of the head and its muscle
+    np.testing.assert_array_equal(
+        model_updater.item_dependencies[id(model_updater.markers)][:, 2], [False, False, False, False, True, True]
+    )
+    model.evaluated_markers, model.evaluated_muscles = [], []
+    # the trunk dof changes too without being told, which the markers of the trunk and arm must not see
+    q = np.array([0.3, 0.0, 0.5])
+    model_updater.to_rerun(q, changed_dofs=[2])
+    assert model.evaluated_markers == [[4, 5]]
+    assert model.evaluated_muscles == [[1]]
+    np.testing.assert_array_equal(model_updater.markers._markers[:4], trunk_and_arm_markers)
+    np.testing.assert_almost_equal(model_updater.markers._markers[4:], model.markers(q, indices=[4, 5]))
+
+    # the trunk dof moves everything
+    model.evaluated_markers, model.evaluated_muscles = [], []
+    model_updater.to_rerun(q, changed_dofs=[0])
+    assert model.evaluated_markers == [[0, 1, 2, 3, 4, 5]]
+    assert model.evaluated_muscles == [[0, 1]]
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+import ezc3d
+import numpy as np
+import pytest
+
+from pyorerun import EmgProcessing, PyoMuscles
+from pyorerun.utils.c3d_file import C3dPointsReader
+from pyorerun.utils.emg import EmgEnvelopeStream, centered_rms, emg_envelope
+
+RUNNING_C3D = str(Path(__file__).parent / "../examples/c3d/Running_0002.c3d")
+EMG_CHANNELS = ["CH1 - GF", "CH2 - RF", "CH3 - VE", "CH4 - VI", "CH5 - BF", "CH6 - ST"]
+
+
+def test_read_analogs():
+    analogs = ezc3d.c3d(RUNNING_C3D)["data"]["analogs"][0]
+    reader = C3dPointsReader(RUNNING_C3D)
+
+    assert reader.analog_rate == 2000
+    assert reader.analog_names[16] == "CH1 - GF"
+    np.testing.assert_array_equal(reader.read_analogs(), analogs)
+    np.testing.assert_array_equal(
+        reader.read_analogs(["CH1 - GF", "Channel_03"], slice(10, 20)), analogs[[16, 2], 100:200]
+    )
+    with pytest.raises(ValueError, match="not_a_channel"):
+        reader.read_analogs(["not_a_channel"])
+
+
+def test_emg_envelope():
+    rate = 2000
+    time = np.arange(4 * rate) / rate
+    rng = np.random.default_rng(42)
+    # a 2-second burst of noise, as the EMG of a contraction
+    contraction = (time > 1) & (time < 3)
+    emg = rng.normal(size=(2, time.shape[0])) * np.where(contraction, 1.0, 0.01)
+
+    for processing in (EmgProcessing(), EmgProcessing(envelope="rms", band_pass=None)):
+        envelope = emg_envelope(emg, rate, processing)
+        assert envelope.shape == emg.shape
+        assert np.all(envelope >= 0)
+        assert envelope[:, (time > 1.5) & (time < 2.5)].min() > 10 * envelope[:, time < 0.5].max()
+
+
+def test_centered_rms():
+    rectified = np.array([[1.0, 1.0, 4.0, 1.0, 1.0]])
+    np.testing.assert_almost_equal(centered_rms(rectified, 3), np.sqrt([[1, 6, 6, 6, 1]]))
+    np.testing.assert_almost_equal(centered_rms(rectified, 1), rectified)
+
+
+@pytest.mark.parametrize("processing", [EmgProcessing(), EmgProcessing(envelope="rms", rms_window=0.01)])
+def test_envelope_stream_blocks(processing):
+    emg = np.random.default_rng(0).normal(size=(3, 5000))
+
+    at_once = EmgEnvelopeStream(3, 2000, processing).process(emg)
+    stream = EmgEnvelopeStream(3, 2000, processing)
+    by_blocks = np.concatenate([stream.process(emg[:, start : start + 700]) for start in range(0, 5000, 700)], axis=1)
+
+    np.testing.assert_almost_equal(by_blocks, at_once)
+
+
+def test_emg_processing_errors():
+    with pytest.raises(ValueError, match="envelope=mean is not supported"):
+        EmgProcessing(envelope="mean")
+    with pytest.raises(ValueError, match="increasing and positive"):
+        EmgProcessing(band_pass=(450, 20))
+    with pytest.raises(ValueError, match="Nyquist"):
+        emg_envelope(np.zeros((1, 100)), 500, EmgProcessing())
+
+
+def test_pyomuscles_from_c3d():
+    time = np.arange(80) / 200
+    muscles = PyoMuscles.from_c3d(RUNNING_C3D, channels=EMG_CHANNELS, time=time)
+    assert muscles.shape == (6, 80)
+    assert muscles.muscle_names == EMG_CHANNELS
+    np.testing.assert_array_equal(muscles.time, time)
+    np.testing.assert_almost_equal(muscles.to_numpy().max(axis=1), 1)
+    assert muscles.to_colors().shape == (6, 80)
+    assert muscles.to_colors().dtype == np.uint32
+
+    streamed = PyoMuscles.from_c3d(
+        RUNNING_C3D, channels=EMG_CHANNELS, muscle_names=[f"muscle_{i}" for i in range(6)], time=time, block_size=100
+    )
+    assert streamed.shape == (6, 80)
+    assert streamed.muscle_names[0] == "muscle_0"
+
+    # without time base, the envelopes stay at the analog rate
+    raw_rate = PyoMuscles.from_c3d(RUNNING_C3D, channels=EMG_CHANNELS[:1], block_size=100)
+    assert raw_rate.shape == (1, 800)
+    assert raw_rate.rate == 2000
@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = (
+    "rerun",
+    "trimesh",
+    "scipy",
+    "imageio",
+    "tkinter",
+    "matplotlib",
+    "ezc3d",
+    "biorbd",
+    "opensim",
+    "pinocchio",
+    "biobuddy",
+)
+
+IMPORT = """
+import json
+import sys
+import time
+
+tic = time.perf_counter()
+{statement}
+duration = time.perf_counter() - tic
+print(json.dumps({{"duration": duration, "modules": sorted({{name.split(".")[0] for name in sys.modules}})}}))
+"""
+
+
+def cold_import(statement: str) -> tuple[float, set[str]]:
+    """The duration of a statement in a fresh interpreter, numpy being imported before, and the modules loaded."""
+    code = IMPORT.format(statement=statement)
+    result = subprocess.run([sys.executable, "-c", "import numpy\n" + code], capture_output=True, text=True, check=True)
+    output = json.loads(result.stdout.strip().splitlines()[-1])
+    return output["duration"], set(output["modules"])
+
+
+def test_import_pyorerun_is_light():
+    duration, modules = cold_import("import pyorerun")
+    assert modules.isdisjoint(HEAVY_MODULES), modules & set(HEAVY_MODULES)
+    # a generous budget, importing rerun alone takes about 0.5 s and the backends seconds
+    assert duration < float(os.environ.get("PYORERUN_IMPORT_TIME_BUDGET", 2.0))
+
+
+@pytest.mark.parametrize("name", ["PyoMarkers", "EmgProcessing"])
+def test_import_light_classes(name):
+    _, modules = cold_import(f"from pyorerun import {name}")
+    assert modules.isdisjoint(HEAVY_MODULES), modules & set(HEAVY_MODULES)
+
+
+def test_import_phase_rerun_without_backends():
+    _, modules = cold_import("from pyorerun import PhaseRerun")
+    assert "rerun" in modules
+    assert modules.isdisjoint({"trimesh", "scipy", "imageio", "tkinter", "biorbd", "opensim", "pinocchio"})
+
+
+def test_lazy_attributes():
+    import pyorerun
+
+    assert pyorerun.PhaseRerun is pyorerun.phase_rerun.PhaseRerun
+    assert "PhaseRerun" in dir(pyorerun)
+    with pytest.raises(AttributeError):
+        pyorerun.NotAnAttribute
+
+    from pyorerun.model_interfaces.available_interfaces import AVAILABLE_INTERFACES, available_interface
+
+    assert set(AVAILABLE_INTERFACES) == {
+        name for name in ("biorbd", "opensim", "pinocchio") if available_interface(name)
+    }
+
+
+def test_lazy_attributes_only_hide_missing_backends(tmp_path, monkeypatch):
+    from pyorerun.utils.lazy_imports import lazy_attributes
+
+    (tmp_path / "needs_backend.py").write_text("import biorbd\nModel = object\n")
+    (tmp_path / "broken.py").write_text("from .not_a_module import Model\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # as if biorbd was not installed
+    monkeypatch.setitem(sys.modules, "biorbd", None)
+
+    namespace = {}
+    __getattr__, _ = lazy_attributes(
+        "package", {"Model": ("needs_backend", "Model"), "Broken": ("broken", "Model")}, namespace
+    )
+    with pytest.raises(AttributeError, match="not available"):
+        __getattr__("Model")
+    # a bug of a module is not hidden as a missing backend
+    with pytest.raises(ImportError):
+        __getattr__("Broken")
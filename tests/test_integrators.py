@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from pyorerun.utils.integrators import Integrator
+
+
+def oscillator(q, qdot):
+    return -q
+
+
+def final_error(method: str, dt: float) -> tuple[float, Integrator]:
+    time_vector = np.linspace(0, 6, int(round(6 / dt)) + 1)
+    integrator = Integrator(oscillator, nb_q=1, method=method)
+    q, qdot, qddot = integrator.integrate(np.ones(1), np.zeros(1), time_vector)
+    np.testing.assert_almost_equal(qddot, -q)
+    return abs(q[0, -1] - np.cos(time_vector[-1])), integrator
+
+
+def test_integrators_orders():
+    # the error is divided by 2 ** order when dt is halved
+    for method, order, dt in (("euler", 1, 0.01), ("semi_implicit_euler", 1, 0.01), ("rk4", 4, 0.05)):
+        ratio = final_error(method, 2 * dt)[0] / final_error(method, dt)[0]
+        assert ratio == pytest.approx(2**order, rel=0.2), method
+
+    assert final_error("rk4", 0.05)[0] < 1e-5
+    assert final_error("euler", 0.05)[0] > 0.1
+
+
+def test_semi_implicit_euler_keeps_the_energy():
+    time_vector = np.arange(0, 100, 0.05)
+    for method, bounded in (("semi_implicit_euler", True), ("euler", False)):
+        q, qdot, _ = Integrator(oscillator, nb_q=1, method=method).integrate(np.ones(1), np.zeros(1), time_vector)
+        energy = q[0] ** 2 + qdot[0] ** 2
+        assert (np.max(np.abs(energy - 1)) < 0.1) == bounded
+
+
+def test_rk45_adaptive_steps():
+    # large frames are sub-stepped to stay within tolerance
+    error, integrator = final_error("rk45", 0.5)
+    assert error < 1e-5
+    assert integrator.nb_evaluations > 7 * 12
+
+    # small frames are integrated in a single step of 7 evaluations each
+    error, integrator = final_error("rk45", 0.01)
+    assert error < 1e-6
+    assert integrator.nb_evaluations <= 7 * 600 + 1
+
+    with pytest.raises(ValueError, match="method=rk2 is not supported"):
+        Integrator(oscillator, nb_q=1, method="rk2")
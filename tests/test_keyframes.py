@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation
+
+from pyorerun.model_components.local_frame import LocalFrameUpdater
+from pyorerun.utils.keyframes import (
+    STATIC_TOLERANCE,
+    KeyframeTolerances,
+    held_frames,
+    marker_keyframes,
+    transform_keyframes,
+)
+
+
+def test_held_frames_constant():
+    values = np.tile(np.eye(4)[:, :, np.newaxis], (1, 1, 50))
+    values += np.random.default_rng(0).uniform(-1e-12, 1e-12, values.shape)
+    np.testing.assert_array_equal(held_frames(values), [0])
+
+
+def test_held_frames_steps():
+    values = np.zeros((3, 2, 10))
+    values[0, 1, 4:] = 0.5
+    values[2, 0, 7:] = -0.1
+    np.testing.assert_array_equal(held_frames(values), [0, 4, 7])
+    np.testing.assert_array_equal(held_frames(values, tolerance=0.2), [0, 4])
+
+
+def test_held_frames_nan():
+    values = np.zeros((3, 1, 6))
+    values[:, 0, 2:4] = np.nan
+    np.testing.assert_array_equal(held_frames(values), [0, 2, 4])
+
+
+def test_static_local_frame_is_sent_once():
+    def transform(q):
+        rt = np.eye(4)
+        rt[:3, 3] = [0.1, 0.2, 0.3]
+        return rt
+
+    chunk = LocalFrameUpdater("segment", transform).to_chunk(np.zeros((2, 100)))["segment"]
+    np.testing.assert_array_equal(chunk.frames, [0])
+
+
+def held_values(values: np.ndarray, frames: np.ndarray) -> np.ndarray:
+    """What rerun displays: the value of the last keyframe at each frame."""
+    last_keyframe = frames[np.searchsorted(frames, np.arange(values.shape[-1]), side="right") - 1]
+    return values[..., last_keyframe]
+
+
+def test_transform_keyframes_within_tolerance():
+    t = np.linspace(0, 1, 1000)
+    homogenous_matrices = np.tile(np.eye(4)[:, :, np.newaxis], (1, 1, t.shape[0]))
+    homogenous_matrices[:3, :3, :] = (
+        Rotation.from_rotvec(np.outer(0.5 * np.sin(np.pi * t), [0, 0, 1])).as_matrix().transpose(1, 2, 0)
+    )
+    homogenous_matrices[0, 3, :] = 0.2 * t**2
+
+    tolerances = KeyframeTolerances(position=1e-3, angle=np.deg2rad(0.5))
+    frames = transform_keyframes(homogenous_matrices, tolerances)
+    assert frames[0] == 0
+    assert frames.shape[0] < t.shape[0] / 4
+
+    displayed = held_values(homogenous_matrices, frames)
+    position_errors = np.linalg.norm(displayed[:3, 3, :] - homogenous_matrices[:3, 3, :], axis=0)
+    angle_errors = Rotation.from_matrix(
+        np.einsum("jin,jkn->nik", displayed[:3, :3, :], homogenous_matrices[:3, :3, :])
+    ).magnitude()
+    assert np.all(position_errors <= tolerances.position)
+    assert np.all(angle_errors <= tolerances.angle + 1e-12)
+
+    np.testing.assert_array_equal(transform_keyframes(homogenous_matrices), np.arange(t.shape[0]))
+
+
+def test_marker_keyframes_within_tolerance():
+    t = np.linspace(0, 1, 500)
+    markers = np.zeros((3, 2, t.shape[0]))
+    markers[0, 0, :] = np.sin(t)
+    markers[1, 1, :] = 0.01 * t
+    markers[:, 1, 100:120] = np.nan
+
+    frames = marker_keyframes(markers, KeyframeTolerances(position=1e-3))
+    assert 100 in frames and 120 in frames
+
+    displayed = held_values(markers, frames)
+    errors = np.linalg.norm(displayed - markers, axis=0)
+    assert np.nanmax(errors) <= 1e-3
+    np.testing.assert_array_equal(np.isnan(displayed), np.isnan(markers))
+
+
+def test_transform_keyframes_with_only_a_position_tolerance():
+    # a segment rotating at 1 kHz, e.g. an oversampled simulation
+    t = np.linspace(0, 1, 1000)
+    homogenous_matrices = np.tile(np.eye(4)[:, :, np.newaxis], (1, 1, t.shape[0]))
+    homogenous_matrices[:3, :3, :] = Rotation.from_rotvec(np.outer(t, [0, 0, 1])).as_matrix().transpose(1, 2, 0)
+
+    frames = transform_keyframes(homogenous_matrices, KeyframeTolerances(position=1e-2))
+    # one keyframe for each 1e-2 rad, instead of every frame with the former 1e-9 rad default
+    assert frames.shape[0] <= t.shape[0] / 10 + 1
+
+    displayed = held_values(homogenous_matrices, frames)
+    angle_errors = Rotation.from_matrix(
+        np.einsum("jin,jkn->nik", displayed[:3, :3, :], homogenous_matrices[:3, :3, :])
+    ).magnitude()
+    assert np.all(angle_errors <= 1e-2 + 1e-12)
+
+
+def test_keyframe_tolerances():
+    assert KeyframeTolerances().position == KeyframeTolerances().angle == STATIC_TOLERANCE
+    assert KeyframeTolerances(position=1e-3, angle=None).angle == 1e-3
+    assert KeyframeTolerances(angle=1e-2).position == 1e-2
+    assert KeyframeTolerances(position=1e-3, angle=0.1).angle == 0.1
+    with pytest.raises(ValueError):
+        KeyframeTolerances(position=-1)
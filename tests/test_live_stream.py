@@ -0,0 +1,168 @@
+import queue
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from pyorerun.live_stream import LiveStream, encode_frame
+from pyorerun.model_components.model_markers import PersistentMarkersUpdater
+from pyorerun.utils.ring_buffer import FrameRingBuffer
+from pyorerun.xp_components.persistent_marker_options import PersistentMarkerOptions
+
+PRODUCER = """
+import sys
+import numpy as np
+from pyorerun.live_stream import encode_frame
+
+for i in range(200):
+    sys.stdout.buffer.write(encode_frame(np.full(3, i), t=i / 200))
+sys.stdout.buffer.flush()
+"""
+
+
+class ModelOfThreeDofs:
+    nb_q = 3
+
+
+class RecordingUpdater:
+    """Records the batches of q sent, instead of computing the components of a model."""
+
+    model = ModelOfThreeDofs()
+
+    def __init__(self):
+        self.batches = []
+
+    def initialize(self):
+        pass
+
+    def to_chunk(self, q, persistent=True):
+        assert not persistent
+        self.batches.append(q.copy())
+        return {}
+
+    def update_persistent(self, q, frame):
+        pass
+
+    def to_rerun_persistent(self, q, frame):
+        pass
+
+
+def sent_frames(updater: RecordingUpdater) -> np.ndarray:
+    return np.concatenate(updater.batches, axis=1)[0]
+
+
+def test_live_stream_from_a_producer_process():
+    updater = RecordingUpdater()
+    stream = LiveStream(updater, viewer_rate=100, capacity=16, policy="block")
+    stream.start()
+    producer = subprocess.Popen([sys.executable, "-c", PRODUCER], stdout=subprocess.PIPE)
+    stream.read_binary(producer.stdout)
+    stream.join()
+    producer.wait()
+
+    # the producer is blocked by the full buffer instead of losing frames, which are sent by batches
+    assert stream.nb_received == stream.nb_logged == 200
+    assert stream.nb_dropped == 0
+    np.testing.assert_array_equal(sent_frames(updater), np.arange(200))
+    assert 1 < len(updater.batches) < 200
+
+
+def test_live_stream_from_a_queue_and_a_socket():
+    updater = RecordingUpdater()
+    stream = LiveStream(updater, viewer_rate=100, latest_only=True)
+    stream.start()
+
+    frames = queue.Queue()
+    stream.read_queue(frames)
+    for i in range(10):
+        frames.put((i / 100, np.full(3, i)))
+        time.sleep(0.002)
+    frames.put(None)
+
+    port = stream.serve()
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(b"".join(encode_frame(np.full(3, i), t=i / 100) for i in range(10, 20)))
+    stream.join()
+
+    # only the latest frame of each batch is displayed
+    assert stream.nb_received == 20
+    assert stream.nb_logged == len(updater.batches) < 20
+    assert sent_frames(updater)[-1] == 19
+
+    with pytest.raises(ValueError, match="the model has 3 dofs"):
+        stream.push(np.zeros(4))
+
+
+def test_live_stream_restarted():
+    updater = RecordingUpdater()
+    stream = LiveStream(updater, viewer_rate=100)
+    stream.start()
+    with pytest.raises(RuntimeError, match="already started"):
+        stream.start()
+    stream.push(np.zeros(3), t=0.0)
+    stream.stop()
+
+    # a frame pushed while stopped is dropped, and counted
+    assert not stream.push(np.ones(3), t=0.01)
+    assert stream.nb_dropped == 1
+
+    stream.start()
+    assert stream.push(np.full(3, 2.0), t=0.02)
+    stream.stop()
+    assert stream.nb_logged == 2
+    np.testing.assert_array_equal(sent_frames(updater), [0, 2])
+
+
+def test_frame_ring_buffer_policies():
+    for policy, kept in (("drop_oldest", [2, 3, 4]), ("drop_newest", [0, 1, 2])):
+        buffer = FrameRingBuffer(3, 1, policy=policy)
+        for i in range(5):
+            buffer.push(i, np.full(1, i))
+        times, frames = buffer.drain()
+        np.testing.assert_array_equal(times, kept)
+        np.testing.assert_array_equal(frames[:, 0], kept)
+        assert buffer.nb_dropped == 2
+        assert len(buffer) == 0
+
+    buffer = FrameRingBuffer(1, 1, policy="block")
+    assert buffer.push(0, np.zeros(1))
+    assert not buffer.push(1, np.zeros(1), timeout=0.01)
+
+    with pytest.raises(ValueError, match="policy=drop is not supported"):
+        FrameRingBuffer(3, 1, policy="drop")
+
+
+class TrailUpdater(RecordingUpdater):
+    """Records the batches of q and the trail of a persistent marker following q."""
+
+    def __init__(self, nb_frames: int):
+        super().__init__()
+        options = PersistentMarkerOptions(["a"], radius=0.01, color=np.array([255, 0, 0]), nb_frames=nb_frames)
+        self.persistent_markers = PersistentMarkersUpdater("model", lambda q: q[np.newaxis, :3], options)
+        self.trails = []
+
+    def update_persistent(self, q, frame):
+        self.persistent_markers.update_trail(q, frame)
+
+    def to_rerun_persistent(self, q, frame):
+        self.persistent_markers.update_trail(q, frame)
+        self.trails.append(self.persistent_markers.trail[:, 0].copy())
+
+
+@pytest.mark.parametrize("latest_only", [False, True])
+def test_live_stream_trails_span_the_batches(latest_only):
+    updater = TrailUpdater(nb_frames=8)
+    stream = LiveStream(updater, latest_only=latest_only)
+    for batch in range(5):
+        for i in range(3):
+            stream.push(np.full(3, 3 * batch + i), t=(3 * batch + i) / 100)
+        stream.send(*stream.buffer.drain())
+
+    # one trail logged by batch, with the displayed frames of the previous batches
+    assert len(updater.trails) == 5
+    displayed = sent_frames(updater)
+    np.testing.assert_array_equal(updater.trails[-1], displayed[-8:])
+    assert updater.trails[-1].shape[0] == (5 if latest_only else 8)
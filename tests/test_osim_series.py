@@ -3,7 +3,7 @@ from pathlib import Path
 import numpy as np
 import pytest
 
-from pyorerun import OsimTimeSeries
+from pyorerun import MotTimeSeries, OsimTimeSeries
 
 try:
     import opensim
@@ -61,3 +61,60 @@ def test_osim_time_series():
     )
     assert OSIM_TIME_SERIES.q[0, 50] == np.float64(3.16086172)
     assert OSIM_TIME_SERIES.is_degree is True
+
+
+class DofModel:
+    """The degrees of freedom of a model, all that MotTimeSeries needs."""
+
+    dof_names = ("pelvis_tx", "pelvis_tilt", "knee_angle_r")
+    dof_is_translation = (True, False, False)
+
+
+def test_mot_time_series():
+    mot_file = str(Path(__file__).parent) + "/../examples/osim/ik.mot"
+    mot = MotTimeSeries(mot_file)
+
+    assert len(mot.coordinate_names) == 37
+    assert mot.coordinate_names[:4] == ("pelvis_tilt", "pelvis_list", "pelvis_rotation", "pelvis_tx")
+    assert mot.q.shape == (37, 301)
+    assert mot.times.shape == (301,)
+    np.testing.assert_almost_equal(mot.times[:2], [0.0, 0.017])
+    assert mot.q[0, 50] == np.float64(3.16086172)
+    assert mot.is_degree is True
+    with pytest.raises(ValueError, match="in degrees"):
+        mot.q_in_radian
+
+    mot.set_model(DofModel())
+    q = mot.q_in_radian
+    assert q.shape == (3, 301)
+    np.testing.assert_almost_equal(q[0], mot.q[3])
+    np.testing.assert_almost_equal(q[1], np.deg2rad(mot.q[0]))
+    np.testing.assert_almost_equal(q[2], np.deg2rad(mot.q[9]))
+
+
+def test_mot_time_series_missing_dof():
+    model = DofModel()
+    model.dof_names = ("pelvis_tx", "not_a_coordinate")
+    mot = MotTimeSeries(str(Path(__file__).parent) + "/../examples/osim/ik.mot")
+    with pytest.raises(ValueError, match="not_a_coordinate"):
+        mot.to_q(model)
+
+
+def test_sto_states(tmp_path):
+    sto_file = tmp_path / "states.sto"
+    sto_file.write_text(
+        "version=1\n"
+        "nRows=2\n"
+        "nColumns=5\n"
+        "inDegrees=no\n"
+        "endheader\n"
+        "time\t/jointset/hip_r/hip_flexion_r/value\t/jointset/hip_r/hip_flexion_r/speed\t"
+        "/jointset/ground_pelvis/pelvis_tx/value\t/forceset/soleus_r/activation\n"
+        "0.0\t0.1\t1.0\t0.5\t0.01\n"
+        "0.1\t0.2\t1.0\t0.6\t0.02\n"
+    )
+    mot = MotTimeSeries(str(sto_file))
+
+    assert mot.coordinate_names == ("hip_flexion_r", "pelvis_tx", "/forceset/soleus_r/activation")
+    assert mot.is_degree is False
+    np.testing.assert_almost_equal(mot.q_in_radian, [[0.1, 0.2], [0.5, 0.6], [0.01, 0.02]])
@@ -0,0 +1,58 @@
+import numpy as np
+
+from pyorerun.model_components.model_markers import PersistentMarkersUpdater, compute_markers
+from pyorerun.xp_components.persistent_marker_options import PersistentMarkerOptions
+
+
+class CountedMarkers:
+    """Two markers moving with the two dofs, counting the frames evaluated."""
+
+    def __init__(self):
+        self.nb_calls = 0
+
+    def __call__(self, q: np.ndarray) -> np.ndarray:
+        self.nb_calls += 1
+        return np.array([[q[0], 0, 1], [q[0], q[1], 2]])
+
+
+def expected_trail(q: np.ndarray, frames: list[int]) -> np.ndarray:
+    return compute_markers(q[:, frames], 2, CountedMarkers()).transpose(2, 1, 0).reshape(-1, 3)
+
+
+def persistent_markers(nb_frames: int | None) -> tuple[PersistentMarkersUpdater, CountedMarkers]:
+    callable_markers = CountedMarkers()
+    options = PersistentMarkerOptions(["a", "b"], radius=0.01, color=np.array([255, 0, 0]), nb_frames=nb_frames)
+    return PersistentMarkersUpdater("model", callable_markers, options), callable_markers
+
+
+def test_persistent_markers_trail_only_computes_the_new_frame():
+    updater, callable_markers = persistent_markers(nb_frames=5)
+    q = np.random.default_rng(0).uniform(-1, 1, (2, 30))
+
+    for frame in range(30):
+        updater.update_trail(q[:, : frame + 1], frame)
+        np.testing.assert_array_equal(
+            updater.trail, expected_trail(q, updater.persistent_options.frames_to_keep(frame))
+        )
+    callable_markers.nb_calls = 0
+    updater.update_trail(q, 29)
+    assert callable_markers.nb_calls == 0
+
+    # a jump in the frames recomputes the whole window
+    updater.update_trail(q[:, :13], 12)
+    assert callable_markers.nb_calls == 5
+    np.testing.assert_array_equal(updater.trail, expected_trail(q, [8, 9, 10, 11, 12]))
+
+    component = updater.to_component(q[:, :14], 13)
+    assert callable_markers.nb_calls == 6
+    assert component.labels.as_arrow_array().to_pylist() == ["a", "b"] * 5
+
+
+def test_persistent_markers_trail_of_all_the_frames():
+    updater, callable_markers = persistent_markers(nb_frames=None)
+    q = np.random.default_rng(1).uniform(-1, 1, (2, 100))
+
+    for frame in range(100):
+        updater.update_trail(q[:, : frame + 1], frame)
+    assert callable_markers.nb_calls == 100
+    np.testing.assert_array_equal(updater.trail, expected_trail(q, list(range(100))))
@@ -2,9 +2,12 @@
 Tests for the custom PyoMarkers class.
 """
 
+from pathlib import Path
+
 import numpy as np
 import pytest
 from pyorerun.pyomarkers import PyoMarkers
+from pyorerun.utils.c3d_file import C3dFile
 
 
 def test_pyomarkers_basic_init():
@@ -124,3 +127,128 @@ def test_max_xy_coordinate_span_compatibility():
     result = np.max([x_absolute_max, y_absolute_max])
 
     assert result == 2.0  # Same as the original test expectation
+
+
+def test_pyomarkers_without_copy():
+    """Test that the positions are views of the data, and float32 storage."""
+    data = np.random.rand(3, 4, 6)
+    markers = PyoMarkers(data)
+    assert np.shares_memory(markers.to_numpy(homogeneous=False), data)
+    assert markers.to_numpy(homogeneous=False) is markers.positions
+
+    data_4d = np.random.rand(4, 4, 6)
+    assert np.shares_memory(PyoMarkers(data_4d).positions, data_4d)
+
+    # an in-place unit conversion does not modify the data of the caller
+    expected = data.copy()
+    markers /= 1000
+    np.testing.assert_array_equal(data, expected)
+    np.testing.assert_array_equal(markers.positions, expected / 1000)
+
+    float32_markers = PyoMarkers(data, dtype=np.float32)
+    assert float32_markers.dtype == np.float32
+    assert float32_markers.to_numpy().dtype == np.float32
+    assert PyoMarkers(data.astype(np.float32)).dtype == np.float32
+    assert PyoMarkers(np.ones((3, 1, 2), dtype=int)).dtype == np.float64
+
+    float32_markers /= 1000
+    assert float32_markers.dtype == np.float32
+    np.testing.assert_allclose(float32_markers.positions, data / 1000, rtol=1e-6)
+
+
+def test_pyomarkers_data_is_deprecated_and_read_only():
+    """Test that writing into the deprecated data raises instead of being lost."""
+    data = np.random.rand(3, 4, 6)
+    markers = PyoMarkers(data)
+    with pytest.warns(DeprecationWarning):
+        homogeneous = markers.data
+    np.testing.assert_array_equal(homogeneous, markers.to_numpy())
+    with pytest.raises(ValueError):
+        homogeneous[0, 0, 0] = 5
+
+
+def test_pyomarkers_reordered():
+    """Test reordering the markers with an index array."""
+    data = np.random.rand(4, 3, 5)
+    markers = PyoMarkers(data, time=np.arange(5) / 10, marker_names=["a", "b", "c"])
+
+    assert markers.reordered(["a", "b", "c"]) is markers
+
+    reordered = markers.reordered(["c", "a"])
+    assert reordered.marker_names == ["c", "a"]
+    assert reordered.time is markers.time
+    np.testing.assert_array_equal(reordered.to_numpy(), data[:, [2, 0], :])
+
+    # a unit conversion of the reordered markers does not change the original ones
+    reordered.attrs["units"] = "m"
+    assert markers.units == "mm"
+
+    with pytest.raises(ValueError, match="are not in"):
+        markers.reordered(["d"])
+
+
+@pytest.mark.parametrize("c3d_file", ["Running_0002.c3d", "example.c3d"])
+def test_from_c3d_selection(c3d_file):
+    filename = str(Path(__file__).parent / "../examples/c3d" / c3d_file)
+    markers = PyoMarkers.from_c3d(filename)
+    selected_names = [markers.marker_names[3], markers.marker_names[0]]
+
+    selected = PyoMarkers.from_c3d(filename, marker_names=selected_names, frame_range=(5, 15))
+    np.testing.assert_array_equal(selected.to_numpy(), markers.to_numpy()[:, [3, 0], 5:15])
+    np.testing.assert_allclose(selected.time, markers.time[5:15])
+    assert selected.marker_names == selected_names
+    assert selected.first_frame == markers.first_frame + 5
+    assert selected.last_frame == markers.first_frame + 14
+    assert selected.units == markers.units
+
+    # the same selection from an already parsed file
+    parsed = PyoMarkers.from_c3d(C3dFile(filename), marker_names=selected_names, frame_range=(5, 15))
+    np.testing.assert_array_equal(parsed.to_numpy(), selected.to_numpy())
+
+    in_time_range = PyoMarkers.from_c3d(filename, time_range=(markers.time[5], markers.time[14]))
+    np.testing.assert_array_equal(in_time_range.to_numpy(), markers.to_numpy()[:, :, 5:15])
+    assert in_time_range.marker_names == markers.marker_names
+
+    with pytest.raises(ValueError):
+        PyoMarkers.from_c3d(filename, marker_names=["not_a_marker"])
+    with pytest.raises(ValueError):
+        PyoMarkers.from_c3d(filename, frame_range=(0, 2), time_range=(0, 1))
+
+
+def test_from_trc():
+    filename = str(Path(__file__).parent / "../examples/osim/ABD01.trc")
+    markers = PyoMarkers.from_trc(filename)
+
+    assert markers.shape == (4, 9, 1091)
+    assert markers.marker_names[:3] == ["gu", "centelbow", "EpL"]
+    assert markers.units == "mm"
+    assert markers.rate == 100
+    assert (markers.first_frame, markers.last_frame) == (0, 1090)
+    np.testing.assert_array_equal(markers.to_numpy()[:3, 0, 0], [-74.708, -22.067, 163.892])
+    np.testing.assert_allclose(markers.time[:3], [0, 0.01, 0.02])
+
+    selected = PyoMarkers.from_trc(filename, frame_range=(10, 20))
+    np.testing.assert_array_equal(selected.to_numpy(), markers.to_numpy()[:, :, 10:20])
+    assert selected.first_frame == 10
+
+
+def test_from_trc_missing_markers(tmp_path):
+    lines = [
+        "PathFileType\t4\t(X/Y/Z)\tmissing.trc",
+        "DataRate\tCameraRate\tNumFrames\tNumMarkers\tUnits",
+        "100\t100\t3\t3\tm",
+        "Frame#\tTime\ta\t\t\tb\t\t\tc\t\t",
+        "\t\tX1\tY1\tZ1\tX2\tY2\tZ2\tX3\tY3\tZ3",
+        "",
+        "1\t0\t1\t2\t3\t4\t5\t6\t7\t8\t9",
+        "2\t0.01\t1\t2\t3\t\t\t\t7\t8\t9",
+        "3\t0.02\t1\t2\t3\t4\t5\t6\t\t\t",
+    ]
+    filename = tmp_path / "missing.trc"
+    filename.write_text("\r\n".join(lines) + "\r\n")
+
+    markers = PyoMarkers.from_trc(str(filename))
+    assert markers.marker_names == ["a", "b", "c"]
+    assert markers.units == "m"
+    np.testing.assert_array_equal(np.isnan(markers.to_numpy()[:3]).sum(axis=0), [[0, 0, 0], [0, 3, 0], [0, 0, 3]])
+    np.testing.assert_array_equal(markers.to_numpy()[:3, 2, 1], [7, 8, 9])
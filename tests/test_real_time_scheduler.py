@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from pyorerun.utils.real_time_scheduler import RealTimeScheduler
+
+
+def counting_steps(nb_steps: int, dt: float, cost: float = 0.0):
+    steps = iter(range(1, nb_steps + 1))
+
+    def step():
+        i = next(steps, None)
+        if i is None:
+            return None
+        time.sleep(cost)
+        return i * dt, i
+
+    return step
+
+
+def test_real_time_without_drift():
+    rendered = []
+    # each step costs half of its simulated time, which a sleep of dt after each step would add to the duration
+    scheduler = RealTimeScheduler(
+        counting_steps(50, dt=0.004, cost=0.002),
+        lambda t, state: rendered.append(state),
+        display_rate=50,
+    )
+    stats = scheduler.run()
+
+    assert stats.nb_steps == 50
+    assert stats.simulated_time == pytest.approx(0.2)
+    assert 0.95 < stats.real_time_factor <= 1.01
+    # the states are skipped to display at most 50 per second, the last one always being displayed
+    assert rendered[-1] == 50
+    assert stats.nb_rendered == len(rendered) < 20
+    assert stats.nb_rendered + stats.nb_skipped == 50
+    assert stats.display_rate <= 60
+
+
+def test_real_time_factor():
+    stats = RealTimeScheduler(counting_steps(20, dt=0.01), lambda t, state: None, real_time_factor=2).run()
+    assert stats.wall_time == pytest.approx(0.1, abs=0.03)
+    assert stats.real_time_factor == pytest.approx(2, rel=0.3)
+
+    # as fast as possible, the slow renders do not slow the simulation down
+    stats = RealTimeScheduler(
+        counting_steps(1000, dt=0.01), lambda t, state: time.sleep(0.01), real_time_factor=None
+    ).run()
+    assert stats.nb_steps == 1000
+    assert stats.real_time_factor > 10
+    assert "1000 steps" in str(stats)
+
+
+def test_scheduler_errors():
+    def failing_step():
+        raise RuntimeError("diverged")
+
+    with pytest.raises(RuntimeError, match="diverged"):
+        RealTimeScheduler(failing_step, lambda t, state: None).run()
+    with pytest.raises(ValueError, match="real-time factor"):
+        RealTimeScheduler(failing_step, print, real_time_factor=0)
+    with pytest.raises(ValueError, match="display rate"):
+        RealTimeScheduler(failing_step, print, display_rate=-1)
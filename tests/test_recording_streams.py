@@ -0,0 +1,53 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import rerun as rr
+
+from pyorerun import MultiPhaseRerun, PhaseRerun, PyoMarkers
+
+
+def add_markers(phase: PhaseRerun, name: str) -> PhaseRerun:
+    positions = np.random.default_rng(0).uniform(size=(3, 2, phase.t_span.shape[0]))
+    phase.add_xp_markers(name, PyoMarkers(positions, channels=["a", "b"], time=phase.t_span))
+    phase.add_floor(square_width=2, height_offset=0, subsquares=10)
+    return phase
+
+
+def test_phases_built_concurrently_in_their_own_recordings():
+    rr.init("global_recording")
+    global_sink = rr.memory_recording()
+    recordings = {name: rr.RecordingStream(name) for name in ("first_trial", "second_trial")}
+    sinks = {name: recording.memory_recording() for name, recording in recordings.items()}
+
+    def export(name: str, by_frame: bool) -> None:
+        phase = add_markers(PhaseRerun(np.linspace(0, 1, 100), recording=recordings[name]), f"{name}_markers")
+        if by_frame:
+            phase.rerun_by_frame(name)
+        else:
+            phase.rerun(name)
+        recordings[name].flush()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(export, recordings, (True, False)))
+
+    for name, other_name in (("first_trial", "second_trial"), ("second_trial", "first_trial")):
+        data = sinks[name].drain_as_bytes()
+        assert f"{name}_markers".encode() in data
+        assert f"{other_name}_markers".encode() not in data
+    assert b"_trial_markers" not in global_sink.drain_as_bytes()
+
+
+def test_multi_phase_async_in_its_own_recording():
+    recording = rr.RecordingStream("multi_phase_trial")
+    sink = recording.memory_recording()
+    multi_phase = MultiPhaseRerun(recording=recording)
+    for phase in range(2):
+        multi_phase.add_phase(np.linspace(phase, phase + 1, 20), phase=phase)
+        add_markers(multi_phase.rerun_biorbd_phases[phase]["animation"], f"markers_of_phase_{phase}")
+
+    asyncio.run(multi_phase.rerun_async())
+    recording.flush()
+
+    data = sink.drain_as_bytes()
+    assert b"markers_of_phase_0" in data and b"markers_of_phase_1" in data
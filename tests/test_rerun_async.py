@@ -0,0 +1,77 @@
+import asyncio
+import time
+from pathlib import Path
+
+import numpy as np
+import rerun as rr
+
+from pyorerun import PhaseRerun, PyoMarkers, c3d_async
+from pyorerun.utils import async_utils
+
+RUNNING_C3D = Path(__file__).parent / "../examples/c3d/Running_0002.c3d"
+
+
+def phase_with_many_entities(nb_entities: int = 20) -> PhaseRerun:
+    t_span = np.linspace(0, 1, 50)
+    phase = PhaseRerun(t_span)
+    for i in range(nb_entities):
+        positions = np.random.default_rng(i).uniform(size=(3, 2, 50))
+        phase.add_xp_markers(f"markers_{i}", PyoMarkers(positions, channels=["a", "b"], time=t_span))
+    return phase
+
+
+def test_rerun_async_yields_to_the_event_loop(monkeypatch):
+    sent = []
+
+    def slow_send_chunks(chunks, t_span, recording=None):
+        time.sleep(0.01)
+        sent.extend(chunks)
+
+    monkeypatch.setattr(async_utils, "send_chunks", slow_send_chunks)
+    rr.init("rerun_async")
+    rr.memory_recording()
+
+    async def main() -> int:
+        ticks = 0
+        task = asyncio.create_task(phase_with_many_entities().rerun_async(init=False))
+        while not task.done():
+            ticks += 1
+            await asyncio.sleep(0.001)
+        await task
+        return ticks
+
+    # the event loop keeps running while the entities are sent, one at a time
+    assert asyncio.run(main()) > 20
+    assert len(sent) == 20
+
+
+def test_rerun_async_cancellation(monkeypatch):
+    sent = []
+
+    def slow_send_chunks(chunks, t_span, recording=None):
+        time.sleep(0.01)
+        sent.extend(chunks)
+
+    monkeypatch.setattr(async_utils, "send_chunks", slow_send_chunks)
+    rr.init("rerun_async_cancelled")
+    rr.memory_recording()
+
+    async def main() -> bool:
+        task = asyncio.create_task(phase_with_many_entities().rerun_async(init=False))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.sleep(0.05)
+        return task.cancelled()
+
+    assert asyncio.run(main())
+    assert 0 < len(sent) < 20
+
+
+def test_c3d_async():
+    async def main():
+        await asyncio.gather(
+            c3d_async(str(RUNNING_C3D), show_events=False, down_sampled_forces=True),
+            asyncio.sleep(0.01),
+        )
+
+    asyncio.run(main())
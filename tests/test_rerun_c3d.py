@@ -1,3 +1,6 @@
+from pathlib import Path
+
+import ezc3d
 import numpy as np
 import pytest
 from pyorerun import PyoMarkers
@@ -7,7 +10,10 @@ from pyorerun.rrc3d import (
     adjust_position_unit_to_meters,
     adjust_pyomarkers_unit_to_meters,
     down_sample_force,
+    c3d_phases,
+    rrc3d,
 )
+from pyorerun.utils.c3d_file import C3dFile
 
 
 def test_max_xy_coordinate_span():
@@ -67,7 +73,77 @@ def test_down_sample_force():
     np.testing.assert_array_equal(cop, expected_cop)
     np.testing.assert_array_equal(force_vec, expected_force)
 
-    # Test non-integer ratio raises error
-    t_span = np.array([0, 1, 2])  # 3 points vs 4 force samples
-    with pytest.raises(NotImplementedError):
-        down_sample_force(force, t_span, "mm")
+    # Non-integer ratio, 4 force samples over 3 marker frames are interpolated
+    t_span = np.array([0, 1, 2])
+    cop, force_vec = down_sample_force(force, t_span, "mm")
+    np.testing.assert_almost_equal(force_vec, [[1, 7 / 3, 11 / 3], [5, 19 / 3, 23 / 3], [9, 31 / 3, 35 / 3]])
+    np.testing.assert_almost_equal(cop[:, 0], [0.01, 0.05, 0.09])
+
+    # The peak mode keeps the largest force around each marker frame
+    force["time"] = np.array([0, 0.4, 0.8, 1.2])
+    cop, force_vec = down_sample_force(force, np.array([0, 1]), "mm", mode="peak")
+    np.testing.assert_array_equal(force_vec, [[2, 4], [6, 8], [10, 12]])
+    np.testing.assert_array_equal(cop, [[0.02, 0.04], [0.06, 0.08], [0.1, 0.12]])
+
+
+RUNNING_C3D = Path(__file__).parent / "../examples/c3d/Running_0002.c3d"
+EXAMPLE_C3D = Path(__file__).parent / "../examples/c3d/example.c3d"
+
+
+def test_rrc3d_parses_the_file_once(monkeypatch):
+    nb_parses = []
+    swig_c3d = ezc3d.ezc3d.c3d
+
+    def counting_swig_c3d(*args):
+        if args:
+            nb_parses.append(args[0])
+        return swig_c3d(*args)
+
+    monkeypatch.setattr(ezc3d.ezc3d, "c3d", counting_swig_c3d)
+
+    rrc3d(str(RUNNING_C3D), show_events=False, down_sampled_forces=True)
+    assert nb_parses == [str(RUNNING_C3D)]
+
+
+def test_c3d_file_platforms():
+    c3d = C3dFile(str(RUNNING_C3D))
+    platforms = c3d.platforms
+    expected = ezc3d.c3d(str(RUNNING_C3D), extract_forceplat_data=True)["data"]["platform"]
+
+    assert len(platforms) == len(expected)
+    for platform, expected_platform in zip(platforms, expected):
+        np.testing.assert_array_equal(platform["force"], expected_platform["force"])
+        np.testing.assert_array_equal(platform["center_of_pressure"], expected_platform["center_of_pressure"])
+
+    markers = PyoMarkers.from_c3d(c3d)
+    assert markers.shape[1:] == c3d["data"]["points"].shape[1:]
+    assert markers.attrs["filename"] == str(RUNNING_C3D)
+
+    assert PyoMarkers.from_c3d(str(RUNNING_C3D)).attrs["filename"] == str(RUNNING_C3D)
+    ezc3d_file = ezc3d.c3d(str(RUNNING_C3D))
+    assert PyoMarkers.from_c3d(ezc3d_file).attrs["filename"] is ezc3d_file
+
+
+def test_c3d_video_synchronized_with_time_range(tmp_path):
+    import imageio
+
+    video_path = str(tmp_path / "video.avi")
+    writer = imageio.get_writer(video_path, fps=10, codec="mpeg4", macro_block_size=1)
+    for _ in range(100):
+        writer.append_data(np.zeros((16, 32, 3), dtype=np.uint8))
+    writer.close()
+
+    _, phase_rerun, multi_phase_rerun = c3d_phases(
+        str(EXAMPLE_C3D),
+        show_floor=False,
+        show_force_plates=False,
+        show_forces=False,
+        show_events=False,
+        video=video_path,
+        video_mode="decode",
+        time_range=(2.0, 4.0),
+    )
+    video_phase = multi_phase_rerun.phase_reruns[-1]
+    assert phase_rerun.t_span[0] == pytest.approx(2.0)
+    assert video_phase.t_span[0] == pytest.approx(phase_rerun.t_span[0])
+    assert video_phase.t_span[-1] == pytest.approx(phase_rerun.t_span[-1], abs=0.1)
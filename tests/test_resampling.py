@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from pyorerun.utils.resampling import resample
+
+
+def test_interpolate_arbitrary_ratio():
+    times = np.arange(0, 1.0001, 1 / 1000)
+    values = np.vstack((np.sin(2 * np.pi * times), times, np.ones_like(times)))
+    target_times = np.arange(0, 1.0001, 1 / 240)
+
+    resampled = resample(values, times, target_times)
+    assert resampled.shape == (3, target_times.shape[0])
+    np.testing.assert_almost_equal(resampled[0], np.sin(2 * np.pi * target_times), decimal=5)
+    np.testing.assert_almost_equal(resampled[1], target_times)
+    np.testing.assert_almost_equal(resampled[2], 1)
+
+
+def test_interpolate_nan_center_of_pressure():
+    times = np.arange(6) / 4
+    cop = np.array([[0.0, 1.0, np.nan, np.nan, 4.0, 5.0]])
+
+    resampled = resample(cop, times, np.array([0.125, 0.25, 0.375, 0.75, 1.0, 1.125, 2.0]))
+    np.testing.assert_array_equal(resampled[0, [0, 1, 4, 5, 6]], [0.5, 1.0, 4.0, 4.5, 5.0])
+    assert np.isnan(resampled[0, [2, 3]]).all()
+
+
+def test_peak_preserving_decimation():
+    times = np.arange(2000) / 2000
+    force = np.zeros((3, 2000))
+    force[2] = 700
+    # an impact of 1 ms, between two frames at 100 Hz
+    force[2, 1004:1006] = 2500
+
+    interpolated = resample(force, times, np.arange(100) / 100)
+    peak = resample(force, times, np.arange(100) / 100, mode="peak")
+    assert interpolated[2].max() == 700
+    assert peak[2].max() == 2500
+    assert np.argmax(peak[2]) == 50
+
+
+def test_peak_resamples_with_another_magnitude():
+    times = np.arange(8) / 8
+    force = np.array([[0, 3, 1, 0, 0, 0, 9, 0]], dtype=float)
+    cop = np.array([[0, 1, 2, 3, 4, 5, 6, np.nan]])
+
+    resampled = resample(cop, times, np.array([0.125, 0.625]), mode="peak", peak_magnitude=np.abs(force[0]))
+    np.testing.assert_array_equal(resampled, [[1, 6]])
+
+
+def test_resample_errors():
+    with pytest.raises(ValueError, match="mode=nearest is not supported"):
+        resample(np.zeros((3, 4)), np.arange(4), np.arange(2), mode="nearest")
+    with pytest.raises(ValueError, match="The values have 4 samples but 5 times are given."):
+        resample(np.zeros((3, 4)), np.arange(5), np.arange(2))
@@ -0,0 +1,79 @@
+import numpy as np
+import rerun as rr
+from trimesh.creation import box
+
+from pyorerun.model_components.mesh import TransformableMeshUpdater
+from pyorerun.model_components.segment import SegmentUpdater
+
+
+class CountingTransform:
+    def __init__(self):
+        self.nb_calls = 0
+
+    def __call__(self, q):
+        self.nb_calls += 1
+        rt = np.eye(4)
+        rt[:3, 3] = q[:3]
+        return rt
+
+
+def mesh_updater(segment_name: str, file_name: str, mesh_rt: np.ndarray) -> TransformableMeshUpdater:
+    mesh = box()
+    mesh.metadata["file_name"] = file_name
+    return TransformableMeshUpdater(segment_name, mesh, mesh_rt)
+
+
+def test_meshes_are_children_of_the_segment():
+    mesh_rt = np.eye(4)
+    mesh_rt[:3, 3] = [0.1, 0.2, 0.3]
+    transform = CountingTransform()
+    segment = SegmentUpdater(
+        name="model/segment",
+        transform_callable=transform,
+        meshes=[mesh_updater("model/segment", f"mesh_{i}", mesh_rt) for i in range(3)],
+    )
+
+    assert segment.local_frame.name == "model/segment"
+    assert [mesh.name for mesh in segment.meshes] == [
+        "model/segment/mesh_0",
+        "model/segment/mesh_1",
+        "model/segment/mesh_2",
+    ]
+    np.testing.assert_array_equal(segment.meshes[0].mesh_rt, mesh_rt)
+
+    nb_frames = 7
+    q = np.random.rand(3, nb_frames)
+    chunks = segment.to_chunk(q)
+
+    # a single time-varying transform for the whole segment, whatever its number of meshes
+    assert list(chunks.keys()) == ["model/segment"]
+    assert transform.nb_calls == nb_frames
+
+
+def test_mesh_offset_is_constant():
+    mesh_rt = np.eye(4)
+    mesh_rt[:3, 3] = [0.1, 0.2, 0.3]
+    mesh = mesh_updater("model/segment", "mesh", mesh_rt)
+
+    assert mesh.to_chunk(np.zeros((3, 5))) == {}
+    np.testing.assert_almost_equal(mesh.to_component().translation.as_arrow_array().to_pylist(), [[0.1, 0.2, 0.3]])
+
+
+def test_meshes_are_logged_once_by_recording(monkeypatch):
+    segment = SegmentUpdater(
+        name="model/segment",
+        transform_callable=CountingTransform(),
+        meshes=[mesh_updater("model/segment", f"mesh_{i}", np.eye(4)) for i in range(2)],
+    )
+    logged_meshes = []
+    monkeypatch.setattr(TransformableMeshUpdater, "initialize", lambda mesh: logged_meshes.append(mesh.name))
+
+    rr.init("test_meshes_are_logged_once_by_recording")
+    for frame in range(5):
+        segment.to_rerun(np.full(3, frame, dtype=float))
+    assert logged_meshes == ["model/segment/mesh_0", "model/segment/mesh_1"]
+
+    # a new recording needs the meshes again
+    rr.init("test_meshes_are_logged_again_in_a_new_recording")
+    segment.to_rerun(np.zeros(3))
+    assert len(logged_meshes) == 4
@@ -0,0 +1,57 @@
+import numpy as np
+import rerun as rr
+
+from pyorerun import PhaseRerun
+from pyorerun.abstract.q import QProperties
+from pyorerun.live_animation import LiveModelAnimation
+from pyorerun.utils.keyframes import KeyframeColumns
+from pyorerun.xp_components import TimeSeriesQ
+
+
+def test_time_series_q_to_chunk():
+    q = np.linspace(0, 1, 20).reshape(2, 10)
+    time_series = TimeSeriesQ("phase/q", q, QProperties(joint_names=["a", "b"], ranges=((-1, 1), (-2, 2))))
+
+    chunk = time_series.to_chunk()
+
+    assert sorted(chunk) == [f"q{i} - {dof}/{line}" for i, dof in enumerate("ab") for line in ("max", "min", "value")]
+    assert chunk["q1 - b/value"][0].as_arrow_array().to_numpy(zero_copy_only=False).size == 10
+    # the constant ranges are only sent at the first and last frames
+    assert isinstance(chunk["q1 - b/min"], KeyframeColumns)
+    np.testing.assert_array_equal(chunk["q1 - b/min"].frames, [0, 9])
+
+    phase = PhaseRerun(np.linspace(0, 1, 10))
+    phase.add_q("q", q, dof_names=("a", "b"), ranges=((-1, 1), (-2, 2)))
+    phase.rerun("time_series_q")
+    phase.rerun_by_frame("time_series_q_by_frame")
+
+
+class ModelWithManyDofs:
+    name = "many_dofs"
+    nb_q = 40
+    dof_names = tuple(f"dof{i}" for i in range(40))
+    q_ranges = tuple((-1.0, 1.0) for _ in range(40))
+
+
+class ModelUpdaterStub:
+    model = ModelWithManyDofs()
+
+
+def test_live_q_charts_only_log_the_changed_dofs(monkeypatch):
+    logged = []
+    monkeypatch.setattr(rr, "log", lambda entity, *args, **kwargs: logged.append((entity, kwargs.get("static", False))))
+    rr.init("live_q_charts")
+    rr.memory_recording()
+    animation = LiveModelAnimation(ModelUpdaterStub(), with_q_charts=True)
+    q = np.zeros(40)
+
+    animation.update_trajectories(q, changed_dofs=[3])
+    # the first update of a recording logs the static styles and all the dofs
+    assert sum(static for _, static in logged) == 3 * 40
+    assert len(logged) == 2 * 3 * 40
+
+    logged.clear()
+    animation.update_trajectories(q, changed_dofs=[3, 5])
+    assert sorted(logged) == sorted(
+        (f"q{i} - dof{i}/{line}", False) for i in (3, 5) for line in ("min", "max", "value")
+    )
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation
+
+from pyorerun.model_components.local_frame import LocalFrameUpdater
+from pyorerun.utils.transforms import rotation_matrices_to_quaternions, quaternions_to_rotation_matrices
+
+
+def test_rotation_matrices_to_quaternions():
+    rotations = Rotation.random(500, random_state=42).as_matrix()
+    rotations = np.concatenate(
+        (
+            rotations,
+            np.eye(3)[np.newaxis, :, :],
+            Rotation.from_rotvec([[np.pi, 0, 0], [0, np.pi, 0], [0, 0, np.pi]]).as_matrix(),
+        ),
+        axis=0,
+    )
+    quaternions = rotation_matrices_to_quaternions(rotations)
+
+    assert quaternions.shape == (504, 4)
+    np.testing.assert_allclose(np.linalg.norm(quaternions, axis=1), 1)
+    np.testing.assert_allclose(quaternions[500], [0, 0, 0, 1])
+    np.testing.assert_allclose(quaternions_to_rotation_matrices(quaternions), rotations, atol=1e-12)
+    np.testing.assert_allclose(quaternions_to_rotation_matrices(quaternions.astype(np.float32)), rotations, atol=1e-6)
+
+
+def test_rotation_matrices_to_quaternions_wrong_shape():
+    with pytest.raises(ValueError):
+        rotation_matrices_to_quaternions(np.eye(4))
+
+
+def test_compact_local_frame_chunk():
+    def transform(q):
+        rt = np.eye(4)
+        rt[:3, :3] = Rotation.from_rotvec(q[:3]).as_matrix()
+        rt[:3, 3] = q[3:6]
+        return rt
+
+    q = np.random.default_rng(0).uniform(-1, 1, (6, 20))
+    default_chunk = LocalFrameUpdater("segment", transform).to_chunk(q)["segment"].columns
+    compact_chunk = LocalFrameUpdater("segment", transform, compact=True).to_chunk(q)["segment"].columns
+
+    default_names = {column.component_descriptor().component for column in default_chunk}
+    compact_names = {column.component_descriptor().component for column in compact_chunk}
+    assert any("mat3x3" in name for name in default_names)
+    assert any("quaternion" in name for name in compact_names)
+    assert not any("mat3x3" in name for name in compact_names)
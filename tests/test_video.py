@@ -0,0 +1,144 @@
+import imageio
+import numpy as np
+import pytest
+
+from pyorerun import PhaseRerun
+from pyorerun.rrc3d import crop_video, load_a_video, video_frames_selection
+from pyorerun.utils.keyframes import KeyframeColumns
+from pyorerun.xp_components import Video, VideoFile
+from pyorerun.xp_components import video as video_module
+from pyorerun.xp_components.video import downscaled_size, nearest_frames
+
+
+def write_video(path, nb_frames: int = 20, fps: int = 10, codec: str = "mpeg4") -> str:
+    writer = imageio.get_writer(str(path), fps=fps, codec=codec, macro_block_size=1)
+    for i in range(nb_frames):
+        frame = np.zeros((16, 32, 3), dtype=np.uint8)
+        frame[:, i % 32] = 255
+        writer.append_data(frame)
+    writer.close()
+    return str(path)
+
+
+def test_video_file_decoded_by_windows(tmp_path, monkeypatch):
+    path = write_video(tmp_path / "video.avi")
+    # two frames of 16 x 32 RGB pixels by window
+    monkeypatch.setattr(video_module, "VIDEO_WINDOW_BYTES", 2 * 16 * 32 * 3)
+
+    video = VideoFile("video", path, frames=slice(5, 12))
+    assert not video.is_asset
+    assert video.nb_frames == 7
+    np.testing.assert_almost_equal(video.frame_times, np.arange(5, 12) / 10)
+
+    windows = list(video.to_chunk()["video"])
+    assert all(isinstance(window, KeyframeColumns) for window in windows)
+    assert [window.frames.tolist() for window in windows] == [[0, 1], [2, 3], [4, 5], [6]]
+
+
+def decoded_frame_indices(video: VideoFile, monkeypatch) -> list[int]:
+    """The index of the frames drawn by write_video, from the column of their white line."""
+    indices = []
+
+    def image_columns(frames, images):
+        indices.extend(np.argmax(images.astype(float).mean(axis=(1, 3)), axis=1).tolist())
+        return KeyframeColumns(frames, [])
+
+    monkeypatch.setattr(video_module, "image_columns", image_columns)
+    list(video.to_chunk()["video"])
+    return indices
+
+
+def test_video_file_decodes_only_the_selected_frames(tmp_path, monkeypatch):
+    video = VideoFile("video", write_video(tmp_path / "video.avi"), frames=slice(7, 15))
+    assert decoded_frame_indices(video, monkeypatch) == list(range(7, 15))
+
+    video.resample(frame_rate=5)
+    np.testing.assert_array_equal(video.frames, [7, 9, 11, 13])
+    assert decoded_frame_indices(video, monkeypatch) == [7, 9, 11, 13]
+
+
+def test_video_file_downscaled(tmp_path):
+    path = write_video(tmp_path / "video.mp4", codec="libx264")
+    video = VideoFile("video", path, max_resolution=(8, 100), frame_rate=2.5)
+    assert not video.is_asset
+    assert (video.width, video.height) == (8, 4)
+    np.testing.assert_array_equal(video.frames, [0, 4, 8, 12, 16])
+    windows = list(video.to_chunk()["video"])
+    assert sum(window.frames.shape[0] for window in windows) == 5
+
+    with pytest.raises(ValueError, match="can not be downscaled"):
+        VideoFile("video", path, mode="asset", max_resolution=(8, 8))
+
+
+def test_nearest_frames():
+    times = np.array([0.0, 0.1, 0.2, 0.3])
+    np.testing.assert_array_equal(nearest_frames(times, np.array([-1, 0.04, 0.06, 0.25, 0.31, 2])), [0, 0, 1, 2, 3, 3])
+    np.testing.assert_array_equal(nearest_frames(times[:1], np.array([0.5, 1])), [0, 0])
+
+
+def test_downscaled_size():
+    assert downscaled_size(1920, 1080) == (1920, 1080)
+    assert downscaled_size(1920, 1080, (1280, 1280)) == (1280, 720)
+    assert downscaled_size(1920, 1080, (4000, 540)) == (960, 540)
+    assert downscaled_size(640, 480, (1920, 1080)) == (640, 480)
+
+
+def test_video_file_asset(tmp_path):
+    path = write_video(tmp_path / "video.mp4", codec="libx264")
+
+    video = VideoFile("video", path, frames=slice(2, None))
+    assert video.is_asset
+    assert video.nb_frames == 18
+    np.testing.assert_almost_equal(video.frame_times, np.arange(2, 20) / 10)
+    assert isinstance(video.to_chunk()["video"], list)
+
+    with pytest.raises(RuntimeError):
+        VideoFile("video", write_video(tmp_path / "video.avi"), mode="asset")
+    with pytest.raises(ValueError, match="mode=stream is not supported"):
+        VideoFile("video", path, mode="stream")
+
+
+def test_video_array_windows(monkeypatch):
+    monkeypatch.setattr(video_module, "VIDEO_WINDOW_BYTES", 3 * 10 * 10 * 3)
+    video = Video("video", np.zeros((7, 10, 10, 3), dtype=np.uint8))
+
+    windows = list(video.to_chunk()["video"])
+    assert [window.frames.tolist() for window in windows] == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_add_video_file(tmp_path):
+    video = VideoFile("video", write_video(tmp_path / "video.avi"))
+    phase_rerun = PhaseRerun(video.frame_times)
+    phase_rerun.add_video("camera", video)
+    assert phase_rerun.xp_data.xp_data[0].name == f"{phase_rerun.name}/camera"
+
+    # a video file is resampled to the time span of the phase
+    phase_rerun = PhaseRerun(np.array([0.0, 0.04, 0.26, 0.3, 1.5]))
+    phase_rerun.add_video("camera", str(tmp_path / "video.avi"), max_resolution=(16, 16))
+    video = phase_rerun.xp_data.xp_data[0]
+    np.testing.assert_array_equal(video.frames, [0, 0, 3, 3, 15])
+    assert (video.width, video.height) == (16, 8)
+    assert [window.frames.tolist() for window in video.to_chunk()[video.name]] == [[0, 1, 2, 3, 4]]
+
+
+def test_video_frames_selection():
+    time = np.arange(100) / 50
+    frames, cropped_time = video_frames_selection(time, "from_c3d", first_frame_in_sec=0.5, last_frame_in_sec=1.0)
+    assert frames == slice(25, 51)
+    np.testing.assert_almost_equal(cropped_time, time[25:51] - 0.5)
+
+    frames, cropped_time = video_frames_selection(time, None, first_frame_in_sec=0.5, last_frame_in_sec=1.0)
+    assert frames == slice(None)
+    np.testing.assert_array_equal(cropped_time, time)
+
+
+def test_crop_video_and_deprecated_load_a_video(tmp_path):
+    with pytest.warns(DeprecationWarning, match="VideoFile"):
+        video, time = load_a_video(write_video(tmp_path / "video.avi"))
+    assert video.shape == (20, 16, 32, 3)
+    assert time.shape == (20,)
+
+    cropped_video, cropped_time = crop_video(video, time, "from_c3d", first_frame_in_sec=0.5, last_frame_in_sec=1.0)
+    frames, expected_time = video_frames_selection(time, "from_c3d", first_frame_in_sec=0.5, last_frame_in_sec=1.0)
+    np.testing.assert_array_equal(cropped_video, video[frames])
+    np.testing.assert_array_equal(cropped_time, expected_time)